@@ -26,7 +26,11 @@ zip_safe             = False
 include_package_data = True
 
 command_name = package_name
-entry_points = {}
+entry_points = {
+    'console_scripts': [
+        'tkinter-log-console = {package_name}.log_console.cli:main'.format(package_name=package_name)
+    ]
+}
 #entry_points = {
 #    'console_scripts': [
 #        '{command_name} = {package_name}.cli:main'.format(command_name=command_name, package_name=package_name)
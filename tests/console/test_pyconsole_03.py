@@ -0,0 +1,25 @@
+# -*- coding:utf-8 -*-
+import tkinter as tk
+
+
+# my modules and packages
+from tkinter_console.console.pyconsole import PyConsole
+from tkinter_console.utils.decorator import std_forker
+
+if __name__ == '__main__':
+    root = tk.Tk()
+    root.title("PyConsole Test03 - streaming outputs")
+
+    console = PyConsole(root, locals(), wrap='none', stream_output=True)
+    console.set_std_tag(std_forker.stderr, foreground='red')
+    console.init().pack(fill=tk.BOTH, expand=True)
+
+    console.focus()
+
+    # try below commands, outputs are displayed while they are running
+    #   import sys, time
+    #   for i in range(30): print(i); sys.stderr.write('err {}\n'.format(i)); time.sleep(0.1)
+    #   for i in range(100000): print(i)
+    console.insert(tk.END, "import sys, time")
+
+    root.mainloop()
@@ -0,0 +1,279 @@
+# -*- coding:utf-8 -*-
+""" Headless benchmark of the log console
+
+It drives the console frames with synthetic producer threads,
+and writes the results as JSON, so that releases can be compared.
+
+Usage:
+    xvfb-run -a python -m tests.log_console.bench_log_console --output result.json
+    xvfb-run -a python -m tests.log_console.bench_log_console --frame virtual --rate 0 --threads 4
+"""
+import argparse
+import gc
+import json
+import logging
+import platform
+import random
+import sys
+import threading
+import time
+import tkinter as tk
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+# my modules and packages
+from tkinter_console.log_console import (
+    LogConsoleFrame, LogVirtualConsoleFrame, LogConsoleExFrame
+    , DEBUG, INFO, WARNING, ERROR, CRITICAL
+)
+
+# level mixes, {level: weight}
+LEVEL_MIXES = {
+    'uniform': {DEBUG: 1, INFO: 1, WARNING: 1, ERROR: 1, CRITICAL: 1}
+    , 'info' : {DEBUG: 20, INFO: 70, WARNING: 7, ERROR: 2, CRITICAL: 1}
+    , 'debug': {DEBUG: 90, INFO: 8, WARNING: 1, ERROR: 1}
+}
+
+FRAMES = ('console', 'virtual', 'ex')
+
+
+def _max_rss_kb() -> int:
+    """ return the max resident set size (KB), 0 if it's not available """
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KB on Linux
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def _producer(logger, rate, size, mix, stop, counter, seed):
+    """ log records at 'rate' records/sec (0: as fast as possible) until 'stop' is set """
+    rnd     = random.Random(seed)
+    levels  = list(mix)
+    weights = list(mix.values())
+    payload = 'x' * size
+    burst   = 100
+    n       = 0
+
+    started = time.perf_counter()
+    while not stop.is_set():
+        for level in rnd.choices(levels, weights, k=burst):
+            logger.log(level, '%d %s', n, payload)
+            n += 1
+
+        # pace the bursts
+        if rate:
+            delay = started + n / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    counter.append(n)
+
+
+class _Heartbeat:
+    """ measure mainloop stalls by the lateness of a periodic 'after' callback """
+
+    def __init__(self, root, interval=10):
+        self.root     = root
+        self.interval = interval
+        self.stalls   = []
+        self.__expected = None
+        self.__after_id = None
+
+    def start(self):
+        self.__expected = time.perf_counter() + self.interval / 1000
+        self.__after_id = self.root.after(self.interval, self.__beat)
+        return self
+
+    def stop(self):
+        if self.__after_id is not None:
+            self.root.after_cancel(self.__after_id)
+            self.__after_id = None
+
+    def __beat(self):
+        now = time.perf_counter()
+        self.stalls.append(max(0.0, now - self.__expected) * 1000)
+        self.__expected = now + self.interval / 1000
+        self.__after_id = self.root.after(self.interval, self.__beat)
+
+    def summary(self) -> dict:
+        stalls = sorted(self.stalls) or [0.0]
+        return {'max_ms'   : stalls[-1]
+                , 'p99_ms' : stalls[min(len(stalls) - 1, int(len(stalls) * 0.99))]
+                , 'total_ms': sum(stalls)
+                , 'beats'  : len(self.stalls)}
+
+
+def _create_frame(root, logger, args):
+    """ create the frame under test, return (frame, console) """
+    kwargs = dict(drain_max_records=args.drain_max_records
+                  , drain_max_time=args.drain_max_time
+                  , max_lines=args.max_lines
+                  , wakeup=args.wakeup
+                  , preformat=args.preformat
+                  , queue_maxsize=args.queue_maxsize)
+
+    if args.frame == 'ex':
+        frame = LogConsoleExFrame(root, logger, level=DEBUG, **kwargs)
+        frame.log_formatter = '%(asctime)s\t[%(levelname)-8s]\t%(message)s'
+        frame.init()
+        return frame, frame.console_inner_frame
+
+    console_class = LogVirtualConsoleFrame if args.frame == 'virtual' else LogConsoleFrame
+    console = console_class(root, logger, **kwargs)
+    console.log_formatter = '%(asctime)s\t[%(levelname)-8s]\t%(message)s'
+    console.init()
+    return console, console
+
+
+def _toggle_latency(root, frame, console, levels) -> dict:
+    """ measure the latency of hiding and showing each level, including the redraw """
+    # inner function
+    def _timed(func):
+        started = time.perf_counter()
+        func()
+        root.update_idletasks()
+        return (time.perf_counter() - started) * 1000
+
+    latencies = {}
+    if isinstance(frame, LogConsoleExFrame):
+        # through the checkbuttons of 'LogSelectorFrame'
+        for level, cb in frame.selector_inner_frame.checkbuttons.items():
+            latencies[logging.getLevelName(level)] = [_timed(cb.invoke), _timed(cb.invoke)]
+    else:
+        for level in levels:
+            latencies[logging.getLevelName(level)] = [
+                _timed(lambda: console.set_level_visible(level, False))
+                , _timed(lambda: console.set_level_visible(level, True))]
+
+    return latencies
+
+
+def run_case(args) -> dict:
+    """ run a benchmark case
+
+    Returns:
+        dict: results
+    """
+    root = tk.Tk()
+    root.geometry('1024x600')
+
+    logger = logging.getLogger('bench.{}'.format(args.frame))
+    logger.setLevel(DEBUG)
+    logger.propagate = False
+
+    frame, console = _create_frame(root, logger, args)
+    root.update()
+
+    gc.collect()
+    rss_before = _max_rss_kb()
+
+    # start producers
+    stop     = threading.Event()
+    counter  = []
+    threads  = [threading.Thread(target=_producer
+                                 , args=(logger, args.rate, args.size, LEVEL_MIXES[args.mix]
+                                         , stop, counter, i)
+                                 , daemon=True)
+                for i in range(args.threads)]
+
+    heartbeat = _Heartbeat(root).start()
+    started   = time.perf_counter()
+    for t in threads:
+        t.start()
+
+    root.after(int(args.duration * 1000), root.quit)
+    root.mainloop()
+
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed  = time.perf_counter() - started
+    rendered = console.stats.snapshot().rendered
+
+    # drain the rest
+    deadline = time.perf_counter() + args.drain_timeout
+    while console.backlog and time.perf_counter() < deadline:
+        root.update()
+    heartbeat.stop()
+    root.update()
+
+    snapshot = console.stats.snapshot()
+    toggle   = _toggle_latency(root, frame, console, LEVEL_MIXES[args.mix])
+
+    result = {'case'        : vars(args)
+              , 'emitted'   : sum(counter)
+              , 'rendered'  : snapshot.rendered
+              , 'dropped'   : snapshot.dropped
+              , 'elapsed_s' : elapsed
+              , 'emit_rate' : sum(counter) / elapsed
+              , 'render_rate': rendered / elapsed
+              , 'backlog'   : console.backlog
+              , 'queue_high_water': snapshot.queue_high_water
+              , 'drain_time_max_ms': snapshot.drain_time_max
+              , 'latency_ms': {'p50': snapshot.latency_p50
+                               , 'p90': snapshot.latency_p90
+                               , 'p99': snapshot.latency_p99}
+              , 'stall'     : heartbeat.summary()
+              , 'max_rss_growth_kb': _max_rss_kb() - rss_before
+              , 'toggle_latency_ms': toggle}
+
+    logger.removeHandler(console.queue_handler)
+    root.destroy()
+
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='benchmark of the log console')
+    parser.add_argument('--frame', choices=FRAMES + ('all',), default='all')
+    parser.add_argument('--threads', type=int, default=2, help='producer threads')
+    parser.add_argument('--rate', type=float, default=5000
+                        , help='records/sec per thread (0: as fast as possible)')
+    parser.add_argument('--size', type=int, default=80, help='payload size of a message')
+    parser.add_argument('--mix', choices=sorted(LEVEL_MIXES), default='info', help='level mix')
+    parser.add_argument('--duration', type=float, default=5.0, help='duration (sec) of producing')
+    parser.add_argument('--drain-timeout', type=float, default=10.0
+                        , help='max time (sec) to drain the rest after producing')
+    parser.add_argument('--drain-max-records', type=int, default=1000)
+    parser.add_argument('--drain-max-time', type=int, default=8)
+    parser.add_argument('--max-lines', type=int, default=100000)
+    parser.add_argument('--queue-maxsize', type=int, default=0)
+    parser.add_argument('--wakeup', action='store_true')
+    parser.add_argument('--preformat', action='store_true')
+    parser.add_argument('--output', help='JSON file, stdout if not set')
+    args = parser.parse_args(argv)
+
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as e:
+        print("[!!] no display, run it under Xvfb (xvfb-run -a ...) - {}".format(e), file=sys.stderr)
+        return 1
+
+    frames  = FRAMES if args.frame == 'all' else (args.frame,)
+    results = []
+    for frame in frames:
+        args.frame = frame
+        results.append(run_case(argparse.Namespace(**vars(args))))
+
+    report = {'python'   : platform.python_version()
+              , 'platform': platform.platform()
+              , 'tk'     : tk.TkVersion
+              , 'time'   : time.strftime('%Y-%m-%dT%H:%M:%S')
+              , 'results': results}
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, mode='wt', encoding='utf-8') as fd:
+            fd.write(text)
+    else:
+        print(text)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+# -*- coding:utf-8 -*-
+import os
+import sys
+import tempfile
+import threading
+import time
+import tkinter as tk
+from logging import DEBUG
+
+# my modules and packages
+from tkinter_console.log_console import LogConsoleExFrame
+
+
+if __name__ == '__main__':
+    # follow the given file, or a temporary file written by a writer thread
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        path = os.path.join(tempfile.mkdtemp(), 'app.log')
+
+        def writer():
+            levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+            n = 0
+            while True:
+                with open(path, mode='at', encoding='utf-8') as fd:
+                    for _ in range(100):
+                        fd.write('{} [{}] line {}\n'.format(time.strftime('%H:%M:%S'), levels[n % 5], n))
+                        n += 1
+
+                # rotate the file sometimes
+                if n % 10000 == 0:
+                    os.replace(path, path + '.1')
+                time.sleep(0.05)
+
+        threading.Thread(target=writer, daemon=True).start()
+
+    # create root object
+    root = tk.Tk()
+    root.title('LogConsoleExFrame Test - follow {}'.format(path))
+    root.geometry('800x480')
+
+    # create console frame without a logger, and follow the file
+    console_frame = LogConsoleExFrame(root, None, level=DEBUG, max_lines=10000)
+    console_frame.init().pack()
+    console_frame.console_inner_frame.follow_file(path, from_end=False)
+
+    # mainloop
+    root.mainloop()
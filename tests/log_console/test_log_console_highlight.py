@@ -0,0 +1,50 @@
+# -*- coding:utf-8 -*-
+import random
+import tkinter as tk
+from tkinter import ttk
+from logging import getLogger, DEBUG
+
+# my modules and packages
+from tkinter_console import LogConsoleFrame
+from tkinter_console.utils import Highlight
+
+
+if __name__ == '__main__':
+    # create a logger object and set logger level
+    logger = getLogger(__name__)
+    logger.setLevel(level=DEBUG)
+
+    # create root object
+    root = tk.Tk()
+    root.title('LogConsoleFrame Test - highlight')
+    root.geometry('640x480')
+
+    # create console frame
+    console_frame = ttk.Label(root, text='Log console')
+    console_frame.pack(expand=True, fill=tk.BOTH)
+
+    # crate consoler inner frame
+    console_inner_frame = LogConsoleFrame(console_frame, logger, max_lines=10000)
+    console_inner_frame.init().pack()
+
+    # highlight request ids, ip addresses and durations of new lines
+    highlighter = Highlight()
+    console_inner_frame.attach_highlighter(highlighter)
+    highlighter.register_regex_tags({
+        'request_id': {'pattern': r'req-[0-9a-f]{8}', 'foreground': 'orchid'}
+        , 'ip'      : {'pattern': r'\b\d{1,3}(\.\d{1,3}){3}\b', 'foreground': 'cyan'}
+        , 'duration': {'pattern': r'\b\d+(\.\d+)?m?s\b', 'foreground': 'yellow'}
+    })
+
+    # log some messages periodically
+    def log_messages():
+        for _ in range(100):
+            logger.info('req-%08x from 10.0.%d.%d took %dms'
+                        , random.getrandbits(32), random.randrange(256), random.randrange(256)
+                        , random.randrange(1000))
+        root.after(100, log_messages)
+
+    log_messages()
+
+    # main loop
+    root.mainloop()
@@ -0,0 +1,40 @@
+# -*- coding:utf-8 -*-
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+from logging import DEBUG
+
+# my modules and packages
+from tkinter_console.log_console import LogConsoleExFrame
+from tkinter_console.log_console.store import MappedLogStore
+
+
+if __name__ == '__main__':
+    # open the given file, or a temporary file of 1,000,000 lines
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        path   = os.path.join(tempfile.mkdtemp(), 'history.log')
+        levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+        with open(path, mode='wt', encoding='utf-8') as fd:
+            for n in range(1000000):
+                fd.write('2024-01-01 00:00:00 [{}] line {}\n'.format(levels[n % 5], n))
+
+    start = time.perf_counter()
+    store = MappedLogStore(path)
+    print('[*] opened {} lines in {:.3f} sec'.format(len(store), time.perf_counter() - start))
+
+    # create root object
+    root = tk.Tk()
+    root.title('LogConsoleExFrame Test - open {}'.format(path))
+    root.geometry('800x480')
+
+    # create console frame without a logger, the records are read from the store
+    console_frame = LogConsoleExFrame(root, None, level=DEBUG, store=store, search_bar=True)
+    console_frame.init().pack()
+
+    # mainloop
+    root.mainloop()
+    store.close()
@@ -0,0 +1,59 @@
+# -*- coding:utf-8 -*-
+import multiprocessing
+import threading
+import time
+import tkinter as tk
+from logging import getLogger, Formatter, DEBUG
+
+# my modules and packages
+from tkinter_console.log_console import LogConsoleExFrame
+from tkinter_console.log_console.handler.process_handler import ProcessQueueHandler
+
+
+def initializer(mp_queue):
+    # add the handler in the child process
+    handler = ProcessQueueHandler(mp_queue)
+    handler.setFormatter(Formatter('%(asctime)s\t[%(levelname)-8s]\t%(processName)s\t%(message)s'))
+
+    logger = getLogger()
+    logger.setLevel(DEBUG)
+    logger.addHandler(handler)
+
+
+def work(i):
+    logger = getLogger()
+    for j in range(20):
+        logger.info('task %d: step %d', i, j)
+        time.sleep(0.1)
+    logger.warning('task %d: done', i)
+    return i
+
+
+if __name__ == '__main__':
+    # create a logger object and set logger level
+    logger = getLogger(__name__)
+    logger.setLevel(DEBUG)
+
+    mp_queue = multiprocessing.Queue()
+
+    # create root object
+    root = tk.Tk()
+    root.title('LogConsoleExFrame Test - processes')
+
+    # create console frame
+    console_frame = LogConsoleExFrame(root, logger, level=DEBUG)
+    console_frame.init().pack()
+
+    # display records from the child processes
+    console_frame.console_inner_frame.listen_process_queue(mp_queue)
+
+    # run tasks in a pool
+    def run_pool():
+        with multiprocessing.Pool(4, initializer=initializer, initargs=(mp_queue,)) as pool:
+            pool.map(work, range(16))
+        logger.info('all tasks are done')
+
+    threading.Thread(target=run_pool, daemon=True).start()
+
+    # mainloop
+    root.mainloop()
@@ -0,0 +1,59 @@
+# -*- coding:utf-8 -*-
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from logging import getLogger, DEBUG
+
+# my modules and packages
+from tkinter_console.log_console import LogConsoleFrame, DrainScheduler
+
+
+if __name__ == '__main__':
+    root = tk.Tk()
+    root.title('LogConsoleFrame Test - shared scheduler')
+    root.geometry('1200x800')
+
+    # one scheduler drains all consoles
+    scheduler = DrainScheduler(root, max_records=2000, max_time=16)
+
+    # 12 panes, each pane has a logger of its own
+    loggers  = []
+    consoles = []
+    for i in range(12):
+        logger = getLogger('pane{}'.format(i))
+        logger.setLevel(DEBUG)
+        loggers.append(logger)
+
+        frame = ttk.LabelFrame(root, text=logger.name)
+        frame.grid(row=i // 4, column=i % 4, sticky=tk.NSEW)
+        consoles.append(LogConsoleFrame(frame, logger, scheduler=scheduler, max_lines=1000).init())
+
+    for i in range(4):
+        root.columnconfigure(i, weight=1)
+    for i in range(3):
+        root.rowconfigure(i, weight=1)
+
+    # the first pane also shows records of other loggers with the per-logger tags
+    app_logger = getLogger('app')
+    app_logger.setLevel(DEBUG)
+    consoles[0].add_logger(app_logger, 'app', background='gray20')
+    consoles[0].add_logger(getLogger('app.db'), 'db', background='navy')
+
+    # log messages from a producer thread, the first pane is much busier than others
+    def producer():
+        n = 0
+        while True:
+            for _ in range(100):
+                loggers[0].info('busy %d', n)
+                n += 1
+            for logger in loggers[1:]:
+                logger.info('quiet %d', n)
+            getLogger('app.web').warning('app %d', n)
+            getLogger('app.db.pool').error('db %d', n)
+            time.sleep(0.01)
+
+    threading.Thread(target=producer, daemon=True).start()
+
+    # mainloop
+    root.mainloop()
@@ -0,0 +1,36 @@
+# -*- coding:utf-8 -*-
+import threading
+import tkinter as tk
+from logging import getLogger, DEBUG
+
+# my modules and packages
+from tkinter_console.log_console import LogConsoleExFrame
+
+
+if __name__ == '__main__':
+    # create a logger object and set logger level
+    logger = getLogger(__name__)
+    logger.setLevel(DEBUG)
+
+    # log a million messages from a producer thread
+    def producer():
+        words = ['connect', 'timeout', 'retry', 'request', 'response']
+        for i in range(1000000):
+            logger.log((i % 5 + 1) * 10, 'message %d %s', i, words[i % 7 % 5])
+
+    # create root object
+    root = tk.Tk()
+    root.title('LogConsoleExFrame Test - search')
+    root.geometry('800x520')
+
+    # create console frame
+    #   records are indexed, and can be searched from the search bar
+    console_frame = LogConsoleExFrame(root, logger, level=DEBUG
+                                      , search_bar=True, preformat=True)
+    console_frame.log_formatter = '%(asctime)s\t[%(levelname)-8s]\t%(message)s'
+    console_frame.init().pack()
+
+    threading.Thread(target=producer, daemon=True).start()
+
+    # mainloop
+    root.mainloop()
@@ -0,0 +1,43 @@
+# -*- coding:utf-8 -*-
+import logging
+import logging.handlers
+import multiprocessing
+import time
+import tkinter as tk
+from logging import DEBUG
+
+# my modules and packages
+from tkinter_console.log_console import LogConsoleExFrame
+
+
+def sender(port):
+    """ send records by 'SocketHandler', like other applications """
+    logger = logging.getLogger('sender')
+    logger.setLevel(DEBUG)
+    logger.addHandler(logging.handlers.SocketHandler('localhost', port))
+
+    levels = [logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL]
+    n = 0
+    while True:
+        for _ in range(100):
+            logger.log(levels[n % 5], 'record %d', n)
+            n += 1
+        time.sleep(0.05)
+
+
+if __name__ == '__main__':
+    # create root object
+    root = tk.Tk()
+    root.title('LogConsoleExFrame Test - socket')
+    root.geometry('800x480')
+
+    # create console frame without a logger, and listen on a free port
+    console_frame = LogConsoleExFrame(root, None, level=DEBUG, max_lines=10000, status_bar=True
+                                      , log_formatter=logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s'))
+    console_frame.init().pack()
+    listener = console_frame.console_inner_frame.listen_socket(port=0)
+
+    multiprocessing.Process(target=sender, args=(listener.port,), daemon=True).start()
+
+    # mainloop
+    root.mainloop()
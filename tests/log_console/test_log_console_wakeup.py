@@ -0,0 +1,39 @@
+# -*- coding:utf-8 -*-
+import threading
+import time
+import tkinter as tk
+from logging import getLogger, DEBUG
+
+# my modules and packages
+from tkinter_console.log_console import LogConsoleExFrame
+
+
+if __name__ == '__main__':
+    # create a logger object and set logger level
+    logger = getLogger(__name__)
+    logger.setLevel(DEBUG)
+
+    # log messages from a producer thread
+    def producer():
+        i = 0
+        while True:
+            logger.info('info message %d', i)
+            if i % 10 == 0:
+                logger.warning('warn message %d', i)
+            i += 1
+            time.sleep(0.05)
+
+    # create root object
+    root = tk.Tk()
+    root.title('LogConsoleExFrame Test - wakeup')
+
+    # create console frame
+    #   the mainloop is woken up by the handler instead of polling (Unix-like only)
+    console_frame = LogConsoleExFrame(root, logger, level=DEBUG, wakeup=True)
+    console_frame.log_formatter = '%(asctime)s\t[%(levelname)-8s]\t%(thread)+5s\t%(message)s'
+    console_frame.init().pack()
+
+    threading.Thread(target=producer, daemon=True).start()
+
+    # mainloop
+    root.mainloop()
@@ -6,7 +6,10 @@ from tkinter_console.console import (
 
 from tkinter_console.log_console import (
     LogConsoleFrame
+    , LogVirtualConsoleFrame
     , LogSelectorFrame
+    , LogSearchFrame
+    , LogStatusFrame
     , LogConsoleExFrame
 )
 
@@ -2,6 +2,7 @@
 import code
 import ctypes
 import threading
+import time
 import tkinter as tk
 from typing import Optional, Callable
 
@@ -9,6 +10,7 @@ from typing import Optional, Callable
 # my modules and packages
 from tkinter_console.utils.scrolledtext import ScrolledTextEx
 from tkinter_console.utils.decorator import std_forker
+from tkinter_console.utils.stream_buffer import StreamBuffer
 from tkinter_console.utils.history import History
 from tkinter_console.utils.highlight import Highlight
 
@@ -17,15 +19,40 @@ __all__ = ['PyConsole']
 
 
 class PyConsole(ScrolledTextEx):
-    """ Python interactive console. """
+    """ Python interactive console.
 
-    def __init__(self, master, _locals, **kwargs):
+    The end of the prompt is tracked by a mark with left gravity,
+    and the prompt is protected by key and '<<Modified>>' event handlers,
+    so nothing runs while the console is idle.
+
+    Outputs of the executing command can be streamed ('stream_output'),
+    they are written into a thread-safe buffer in written order,
+    and the buffer is drained in time-budgeted batches while the command is running.
+    """
+
+    # mark of the end of the prompt, the command is inputted after it
+    PROMPT_MARK = 'prompt_end'
+
+    # mark of the end of the streamed outputs, they are inserted before it
+    OUTPUT_MARK = 'output_end'
+
+    def __init__(self, master, _locals
+                 , stream_output=False
+                 , drain_max_chars=1 << 16
+                 , drain_max_time=8
+                 , drain_interval=20
+                 , **kwargs):
         """ initializer
 
         Args:
-            master  : instance of TK widget
-            _locals : locals()
-            **kwargs: kwargs of tk.Text
+            master          : instance of TK widget
+            _locals         : locals()
+            stream_output   : if True, outputs are inserted while the command is running,
+                              else they are inserted after the command is finished
+            drain_max_chars : max characters inserted at once
+            drain_max_time  : max time (ms) spent per drain tick
+            drain_interval  : interval (ms) of drain ticks
+            **kwargs        : kwargs of tk.Text
         """
         super(PyConsole, self).__init__(master=master, **kwargs)
 
@@ -35,9 +62,19 @@ class PyConsole(ScrolledTextEx):
         self._shell = code.InteractiveConsole(_locals)
         self.__result: Optional[dict] = None
 
-        # watchdogs settings
-        self.__watchdogs_rotate    = 10  # ms
-        self.__watchdogs_wait_flag = False
+        # executing flag, highlighting is suspended while executing a command
+        self.__executing = False
+
+        # highlighting is scheduled once per idle
+        self.__highlight_scheduled = False
+
+        # streaming outputs
+        self.__stream_output   = stream_output
+        self.__stream          = StreamBuffer()
+        self.__drain_max_chars = drain_max_chars
+        self.__drain_max_time  = drain_max_time
+        self.__drain_interval  = drain_interval
+        self.__drain_id        = None
 
         # prompt settings
         self._prompt_normal_tag = 'normal'
@@ -94,24 +131,29 @@ class PyConsole(ScrolledTextEx):
         self.__bind_checking_action()
         self.__bind_ctr_c()
         self.bind('<Return>', self.__do_pressed_enter_key)
+        self.bind('<<Modified>>', self.__on_modified)
 
-        # run watchdogs
-        self.__run_watchdogs()
+        # highlight the prompt line at first
+        self.__schedule_highlighting()
 
         # setting pack configure
         self.pack_configure(fill=tk.BOTH, expand=True)
 
         return self
 
+    def destroy(self):
+        """ destroy the widget, and stop draining outputs """
+        self.__cancel_draining()
+        super(PyConsole, self).destroy()
+
     def set_watchdogs_rotation_time(self, ms) -> None:
-        """ set watchdogs rotation time
+        """ deprecated, it does nothing
 
-        If you feel the process is too slow, use this method before initialize.
+        The prompt is protected by event handlers, and there is no periodic watchdog.
 
         Args:
             ms: ms
         """
-        self.__watchdogs_rotate = ms
 
     @property
     def prompt_string(self) -> dict:
@@ -128,6 +170,15 @@ class PyConsole(ScrolledTextEx):
         self.delete('0.0', tk.END)
         self.__init_prompt()
 
+    @property
+    def stream_output(self) -> bool:
+        """ bool: outputs are inserted while the command is running, it's applied from the next command """
+        return self.__stream_output
+
+    @stream_output.setter
+    def stream_output(self, flag: bool) -> None:
+        self.__stream_output = bool(flag)
+
     @property
     def highlighter(self) -> Highlight | None:
         """ Highlight: highlight instance """
@@ -171,9 +222,7 @@ class PyConsole(ScrolledTextEx):
     def __add_prompt_tags(self):
         """ add prompt tags, it's used in '__prompt' method """
         for tag in self.__prompt_tags:
-            start_index = self.__concat_row_pos(self.__get_current_row(), '0')
-            end_index = self.__get_prompt_end_index()
-            self.tag_add(tag, start_index, end_index)
+            self.tag_add(tag, '{} linestart'.format(self.PROMPT_MARK), self.PROMPT_MARK)
 
 
     def __init_prompt(self):
@@ -184,7 +233,8 @@ class PyConsole(ScrolledTextEx):
         # set wait flag as False
         self.__wait_flag = False
 
-        # delete strings on the line except prompt
+        # delete strings on the last line
+        self.mark_set(self.PROMPT_MARK, 'end-1c')
         self.__delete_line()
 
         # clear committed strings
@@ -207,6 +257,9 @@ class PyConsole(ScrolledTextEx):
 
         self.insert(tk.END, self.__used_prompt_string)
 
+        # the mark stays before the inputted command
+        self.mark_set(self.PROMPT_MARK, 'end-1c')
+        self.mark_gravity(self.PROMPT_MARK, tk.LEFT)
 
         # add prompt tags for highlighting
         self.__add_prompt_tags()
@@ -223,10 +276,6 @@ class PyConsole(ScrolledTextEx):
         """ concat row and pos """
         return '.'.join((str(row), str(pos)))
 
-    def __get_prompt_length(self) -> int:
-        """ get prompt length """
-        return len(self.__used_prompt_string)
-
     def __get_current_split_index(self) -> list:
         """ return (row,pos) """
         return self.index(tk.INSERT).split('.')
@@ -235,15 +284,18 @@ class PyConsole(ScrolledTextEx):
         """ return current row """
         return int(self.__get_current_split_index()[0])
 
-    def __get_current_pos(self) -> int:
-        """ return current insert pos """
-        return int(self.__get_current_split_index()[1])
-
     def __get_prompt_end_index(self) -> str:
-        """ get prompt end line """
-        row           = self.__get_current_row()
-        prompt_length = self.__get_prompt_length()
-        return self.__concat_row_pos(row, prompt_length)
+        """ get prompt end index """
+        return self.index(self.PROMPT_MARK)
+
+    def __is_before_prompt(self, index=tk.INSERT, or_equal=False) -> bool:
+        """ check the index is before the end of the prompt """
+        return self.compare(index, '<=' if or_equal else '<', self.PROMPT_MARK)
+
+    def __selection_over_prompt(self) -> bool:
+        """ check the selection starts before the end of the prompt """
+        ranges = self.tag_ranges(tk.SEL)
+        return bool(ranges) and self.__is_before_prompt(ranges[0])
 
     def __delete_line(self) -> None:
         """ delete command line """
@@ -262,7 +314,7 @@ class PyConsole(ScrolledTextEx):
     def __clear_and_write_newline(self) -> None:
         """ clear and write a new line """
         self.__delete_line()
-        self.insert(self.__get_prompt_end_index(), self.__NEWLINE)
+        self.insert('end-1c', self.__NEWLINE)
         self.__init_prompt()
         self.yview(tk.END)
 
@@ -300,32 +352,40 @@ class PyConsole(ScrolledTextEx):
         return 'break'
 
 
-    def __run_watchdogs(self) -> None:
-        """ run watchdogs """
+    def __on_modified(self, event=None) -> None:
+        """ for '<<Modified>>' event
+
+        It's called after any modification, including paste and programmatic inserts.
+        Keep the input position after the prompt, and schedule highlighting.
+        """
+        # resetting the flag generates the event again
+        if not self.edit_modified():
+            return
+        self.edit_modified(False)
 
-        # set rotate time
-        rotate_time = self.__watchdogs_rotate
+        if not self.__executing and self.__is_before_prompt():
+            self.mark_set(tk.INSERT, 'end-1c')
 
-        # inner function
-        def checker():
-            if not self.__watchdogs_wait_flag:
-                # for prevent the input position from going before the prompt
-                #   input keys are checked in '__bind_checking_action'
-                #   but bellow patterns can't be checked
-                #     'fn' + 'home' key and so on...
-                #   so in the function check these patterns
-                if self.__get_current_pos() < self.__get_prompt_length():
-                    self.mark_set(tk.INSERT, self.__get_prompt_end_index())
+        if self.__highlighter:
+            self.__highlighter.mark_dirty()
+        self.__schedule_highlighting()
 
-                # highlighting
-                if self.__highlighter:
-                    self.__highlighter.do_normal_highlighting()
-                    self.__highlighter.do_regex_highlighting()
+    def __schedule_highlighting(self) -> None:
+        """ highlight once at the next idle time """
+        if self.__highlighter and not self.__highlight_scheduled:
+            self.__highlight_scheduled = True
+            self.after_idle(self.__do_highlighting)
 
-            self.after(rotate_time, checker)
+    def __do_highlighting(self) -> None:
+        """ highlighting, it's suspended while executing a command """
+        self.__highlight_scheduled = False
 
-        self.after(rotate_time, checker)
+        if self.__executing or not self.__highlighter:
+            return
 
+        self.__highlighter.do_normal_highlighting()
+        self.__highlighter.do_regex_highlighting()
+        self.__highlighter.do_lexer_highlighting()
 
 
     def __bind_checking_action(self) -> None:
@@ -333,9 +393,13 @@ class PyConsole(ScrolledTextEx):
 
         - press key
             - prevent the input position from going before the prompt.
+            - home : move the input position to the end of the prompt.
             - up   : insert a prev string from history.
             - down : insert a next string from history.
 
+        - paste and cut
+            prevent the prompt from being modified.
+
         - click
             prevent the input position moves to the cursor.
 
@@ -345,23 +409,45 @@ class PyConsole(ScrolledTextEx):
         def _do_pressed_key(event):
             state : int = event.state if hasattr(event, 'state') else 0
             keysym: str = event.keysym.lower()
-            # other patterns are checked in '__run_watchdogs'
-            if (keysym in ('backspace', 'left', 'home')
+
+            # the selected prompt must not be replaced or deleted
+            modifying = ((event.char and (state != 4 or keysym == 'h'))
+                         or keysym in ('backspace', 'delete'))
+            if modifying and self.__selection_over_prompt():
+                self.tag_remove(tk.SEL, '1.0', tk.END)
+
+            if (keysym in ('backspace', 'left')
                     # for ctl+h
                     or state == 4):
 
                 # check position
                 #   '>>>|ABC' : allowed
                 #   '>>|>ABC' : not allowed
-                if self.__get_current_pos() <= self.__get_prompt_length():
+                if self.__is_before_prompt(or_equal=True):
                     return self.__do_not_do_anything()
 
-            elif self.__get_current_pos() < self.__get_prompt_length():
-                # check position
-                #   1. '>>>ABCDEFG': press 'fn'+'home'+'delete'
-                #   2. ''          : prompt string is deleted, so this check is necessary
-                self.__delete_line()
-                self.__prompt()
+            elif self.__is_before_prompt():
+                # the input position is before the prompt, e.g. by the mouse
+                #   move it to the end at first
+                self.mark_set(tk.INSERT, 'end-1c')
+
+        # inner function
+        def _do_pressed_home(event):
+            self.mark_set(tk.INSERT, self.PROMPT_MARK)
+            self.see(tk.INSERT)
+            return self.__do_not_do_anything()
+
+        # inner function
+        def _do_paste(event):
+            if self.__selection_over_prompt():
+                self.tag_remove(tk.SEL, '1.0', tk.END)
+            if self.__is_before_prompt():
+                self.mark_set(tk.INSERT, 'end-1c')
+
+        # inner function
+        def _do_cut(event):
+            if self.__selection_over_prompt():
+                return self.__do_not_do_anything()
 
         # inner function
         def _write_history_command(press):
@@ -385,6 +471,9 @@ class PyConsole(ScrolledTextEx):
 
         # bind
         self.bind('<KeyPress>', _do_pressed_key)
+        self.bind('<Home>'    , _do_pressed_home)
+        self.bind('<<Paste>>' , _do_paste)
+        self.bind('<<Cut>>'   , _do_cut)
         self.bind('<Up>'      , lambda e: _write_history_command(press='up'))
         self.bind('<Down>'    , lambda e: _write_history_command(press='down'))
 
@@ -408,10 +497,15 @@ class PyConsole(ScrolledTextEx):
                     self.__kill_thread(thread_id)
                     # pop thread id from threading pool
                     self.__threading_pool.pop(thread_id)
+                    # discard outputs which are not inserted yet,
+                    #   and keep inserted ones
+                    self.__cancel_draining()
+                    self.mark_set(self.PROMPT_MARK, 'end-1c')
                     # clear and write new line
                     self.__clear_and_write_newline()
-                    # set watchdogs flag
-                    self.__watchdogs_wait_flag = False
+                    # resume highlighting
+                    self.__executing = False
+                    self.__schedule_highlighting()
 
             try:
                 # bind kill thread to ctr+c
@@ -444,6 +538,7 @@ class PyConsole(ScrolledTextEx):
         2. add the committed string into the history
         3. compile the committed string, and execute it, if is not state 'wait'.
         4. insert a result into the text widget.
+            (while the command is running, if outputs are streamed)
         5. auto scroll.
         6. prompt.
 
@@ -459,6 +554,10 @@ class PyConsole(ScrolledTextEx):
             # insert a new line
             self.insert(tk.INSERT, self.__NEWLINE)
 
+            # outputs are inserted after the new line
+            self.mark_set(self.OUTPUT_MARK, tk.INSERT)
+            self.mark_gravity(self.OUTPUT_MARK, tk.RIGHT)
+
             return command
 
         # inner function
@@ -467,7 +566,8 @@ class PyConsole(ScrolledTextEx):
             self.__result = result
 
         # inner function
-        @std_forker(callback=_callback)
+        @std_forker(callback=_callback
+                    , stream=self.__stream if self.__stream_output else None)
         def _execute():
             # commit string
             committed_string: str = _commit()
@@ -487,8 +587,8 @@ class PyConsole(ScrolledTextEx):
             # execute the command
             elif (self.__wait_flag is False) or (striped == ''):
 
-                # wait watchdogs for infinite loop handling
-                self.__watchdogs_wait_flag = True
+                # suspend highlighting while executing
+                self.__executing = True
 
                 try:
 
@@ -511,6 +611,18 @@ class PyConsole(ScrolledTextEx):
                     history._index = (len(history.get_history()) - 1)
 
 
+        if self.__stream_output:
+            # drain outputs in the Tk thread while executing,
+            #   and prompt after all of them are inserted
+            self.__stream.open()
+            self.__drain_id = self.after(0, self.__drain_stream)
+
+            # execute run function
+            _execute()
+
+            self.__stream.close()
+            return
+
         # execute run function
         _execute()
 
@@ -529,6 +641,57 @@ class PyConsole(ScrolledTextEx):
                 end_index   = self.__concat_row_pos(self.__get_current_row(), tk.END)
                 self.tag_add(std, start_index, end_index)
 
+        self.__finish_command()
+
+
+    def __drain_stream(self) -> None:
+        """ insert streamed outputs in order, in time-budgeted batches
+
+        Consecutive outputs of the same std are merged, and one batch is inserted
+        by one 'insert' with the std tags, so a flood of outputs doesn't freeze the UI.
+        """
+        self.__drain_id = None
+        stream = self.__stream
+
+        # outputs popped after the command is finished are the last ones
+        closed   = stream.closed
+        deadline = time.perf_counter() + self.__drain_max_time / 1000
+        inserted = False
+
+        while True:
+            chunks = stream.pop(self.__drain_max_chars)
+            if not chunks:
+                break
+
+            args = []
+            for std, text in chunks:
+                args.extend((text, std))
+            self.insert(self.OUTPUT_MARK, *args)
+            inserted = True
+
+            if time.perf_counter() >= deadline:
+                break
+
+        # auto scroll
+        if inserted:
+            self.yview(tk.END)
+
+        if closed and len(stream) == 0:
+            self.__finish_command()
+        else:
+            # outputs left by the time budget are drained as soon as possible
+            self.__drain_id = self.after(1 if len(stream) else self.__drain_interval
+                                         , self.__drain_stream)
+
+    def __cancel_draining(self) -> None:
+        """ stop draining, and discard outputs which are not inserted yet """
+        if self.__drain_id is not None:
+            self.after_cancel(self.__drain_id)
+            self.__drain_id = None
+        self.__stream.clear()
+
+    def __finish_command(self) -> None:
+        """ prompt after the result is inserted """
 
         # auto scroll
         self.yview(tk.END)
@@ -541,10 +704,11 @@ class PyConsole(ScrolledTextEx):
             self.highlighter.start_index = self.__get_prompt_end_index()
 
 
-        # set watchdogs wait flag
+        # resume highlighting
         #   reason, why the code is written here, is
-        #   the dumped result may be highlighted by the watchdogs
-        self.__watchdogs_wait_flag = False
+        #   the dumped result must not be highlighted
+        self.__executing = False
+        self.__schedule_highlighting()
 
 
     @staticmethod
@@ -1,13 +1,11 @@
 # -*- coding:utf-8 -*-
 import os
-import keyword
-import builtins
 import json
 import shutil
 from typing import Optional
 
 # my modules and packages
-from tkinter_console.utils import std_forker, Highlight
+from tkinter_console.utils import std_forker, Highlight, PythonLexer, KEYWORD, BUILTIN
 from tkinter_console.console.pyconsole import PyConsole
 
 __all__ = ['PyConsoleEx']
@@ -98,6 +96,10 @@ class PyConsoleEx(PyConsole):
 
         self.configure(**console['kwargs'])
 
+        # streaming outputs is enabled by the kwarg or the config
+        if console.get('stream_output', False):
+            self.stream_output = True
+
         self.set_prompt_string(normal=prompt['normal']
                                , wait=prompt['wait']
                                , add_last_space=False)
@@ -119,7 +121,15 @@ class PyConsoleEx(PyConsole):
 
 
     def __setup_syntax_highlighting(self) -> None:
-        """ setup syntax highlighting """
+        """ setup syntax highlighting
+
+        The input is tokenized by 'PythonLexer' in a single pass,
+        and tokens are mapped to a handful of token class tags.
+          - builtins: 'keyword' and 'builtin' tags
+          - normal  : tags of the names, e.g. 'def' and 'class'
+          - lexer   : 'string', 'comment' and 'definition' tags
+          - regex   : tags matched by the patterns
+        """
 
         # attach highlighter at first
         self.attach_highlighter(self.__highlighter)
@@ -127,36 +137,20 @@ class PyConsoleEx(PyConsole):
         syntax          : dict = self.config['syntax']
         syntax_builtins : dict = syntax['builtins']
         syntax_normal   : dict = syntax['normal']
+        syntax_lexer    : dict = syntax.get('lexer', {})
         syntax_regex    : dict = syntax['regex']
 
-        py_keyword_dict: dict = {}
-
         # inner function
-        def _set_builtin_keywords(l):
-            py_keyword_dict.update({str(k): {**syntax_builtins['kwargs']} for k in l})
+        def _kwargs(values):
+            return {str(k).lower(): v for k, v in values['kwargs'].items()}
 
-        # set builtin keywords
-        _set_builtin_keywords(keyword.kwlist)
-        _set_builtin_keywords(dir(builtins))
-
-        # inner function
-        def _register_tags(default_kwargs, obj, func):
-            if len(obj) == 0:
-                func(default_kwargs)
-            else:
-                for tag, values in obj.items():
-                    kwargs = {str(k).lower(): v for k, v in values['kwargs'].items()}
-                    default_kwargs.update({tag: kwargs})
-                    func(default_kwargs)
+        # names of the 'normal' are mapped to their own tags
+        lexer = PythonLexer(word_tags={str(name): str(name) for name in syntax_normal})
+        self.highlighter.attach_lexer(lexer)
 
         # register tags
-        _register_tags(default_kwargs=py_keyword_dict
-                       , obj=syntax_normal
-                       , func=self.highlighter.register_normal_tags)
-        _register_tags(default_kwargs={}
-                       , obj=syntax_regex
-                       , func=self.highlighter.register_regex_tags)
-
-
-
-
+        self.highlighter.register_lexer_tags({KEYWORD: _kwargs(syntax_builtins)
+                                              , BUILTIN: _kwargs(syntax_builtins)})
+        self.highlighter.register_lexer_tags({tag: _kwargs(values) for tag, values in syntax_normal.items()})
+        self.highlighter.register_lexer_tags({tag: _kwargs(values) for tag, values in syntax_lexer.items()})
+        self.highlighter.register_regex_tags({tag: _kwargs(values) for tag, values in syntax_regex.items()})
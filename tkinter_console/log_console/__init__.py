@@ -1,5 +1,8 @@
 # -*- coding:utf-8 -*-
 from tkinter_console.log_console.frames.console import *
+from tkinter_console.log_console.frames.virtual_console import *
 from tkinter_console.log_console.frames.selector import *
+from tkinter_console.log_console.frames.search import *
+from tkinter_console.log_console.frames.status import *
 from tkinter_console.log_console.frames.console_ex import *
-
+from tkinter_console.log_console.handler.scheduler import *
@@ -0,0 +1,9 @@
+# -*- coding:utf-8 -*-
+import sys
+
+# my modules and packages
+from tkinter_console.log_console.cli import main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# -*- coding:utf-8 -*-
+import argparse
+import logging
+import logging.handlers
+import sys
+from typing import Optional
+
+import tkinter as tk
+
+# my modules and packages
+from tkinter_console.log_console.frames.console_ex import LogConsoleExFrame
+from tkinter_console.log_console.handler.queue_handler import DROP_NEWEST, DROP_OLDEST, BLOCK, SAMPLE
+from tkinter_console.log_console.store.mapped_store import MappedLogStore
+
+__all__ = ['main']
+
+
+LEVELS = {'DEBUG'     : logging.DEBUG
+          , 'INFO'    : logging.INFO
+          , 'WARNING' : logging.WARNING
+          , 'ERROR'   : logging.ERROR
+          , 'CRITICAL': logging.CRITICAL}
+
+
+def _level(value: str) -> int:
+    """ for argparse, a level name or number """
+    if value.upper() in LEVELS:
+        return LEVELS[value.upper()]
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("unknown level - {}".format(value))
+
+
+def _address(value: str) -> tuple:
+    """ for argparse, '[HOST:]PORT' """
+    host, _, port = value.rpartition(':')
+    try:
+        return host or 'localhost', int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid address - {}".format(value))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """ build the argument parser """
+    parser = argparse.ArgumentParser(prog='python -m tkinter_console.log_console'
+                                     , description='Standalone log viewer built on LogConsoleExFrame.')
+
+    # sources
+    group = parser.add_argument_group('sources')
+    group.add_argument('-f', '--follow', metavar='PATH', action='append', default=[]
+                       , help='follow a log file like "tail -F" (repeatable)')
+    group.add_argument('--from-start', action='store_true'
+                       , help='read followed files from the head, not from the end')
+    group.add_argument('-l', '--listen', metavar='[HOST:]PORT', type=_address, nargs='?'
+                       , const=('localhost', logging.handlers.DEFAULT_TCP_LOGGING_PORT)
+                       , help='receive records from logging.handlers.SocketHandler (default: %(const)s)')
+    group.add_argument('-s', '--stdin', action='store_true'
+                       , help='read lines from stdin')
+    group.add_argument('-o', '--open', metavar='PATH'
+                       , help='open a historical log file (memory-mapped, read-only)')
+
+    # display
+    group = parser.add_argument_group('display')
+    group.add_argument('--level', type=_level, default=None
+                       , help='levels checked by default, e.g. DEBUG'
+                              ' (default: INFO, all levels for --open)')
+    group.add_argument('--min-level', type=_level, default=logging.NOTSET
+                       , help='records under the level are not received from the socket')
+    group.add_argument('--virtual', action='store_true'
+                       , help='render only the visible window of a record store')
+    group.add_argument('--search', action='store_true'
+                       , help='show the search bar (implies --virtual)')
+    group.add_argument('--status', action='store_true'
+                       , help='show the status bar of throughput and latency')
+    group.add_argument('--coalesce', action='store_true'
+                       , help='collapse repeated records into one line')
+    group.add_argument('--collapse-tracebacks', action='store_true'
+                       , help='show tracebacks as one-line summaries')
+    group.add_argument('--format', default='%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+                       , help='format of records from the socket')
+    group.add_argument('--title', default=None
+                       , help='title of the window')
+    group.add_argument('--geometry', default='1000x600'
+                       , help='geometry of the window (default: %(default)s)')
+
+    # limits and batching
+    group = parser.add_argument_group('limits and batching')
+    group.add_argument('--max-lines', type=int, default=100000
+                       , help='max lines kept in the console, 0 for unlimited (default: %(default)s)')
+    group.add_argument('--max-bytes', type=int, default=0
+                       , help='max bytes kept in the console, 0 for unlimited (default: %(default)s)')
+    group.add_argument('--drain-max-records', type=int, default=1000
+                       , help='max records displayed per tick (default: %(default)s)')
+    group.add_argument('--drain-max-time', type=int, default=8
+                       , help='max time (ms) spent per tick (default: %(default)s)')
+    group.add_argument('--poll-interval-min', type=int, default=10
+                       , help='min polling interval (ms) (default: %(default)s)')
+    group.add_argument('--poll-interval-max', type=int, default=1000
+                       , help='max polling interval (ms) (default: %(default)s)')
+    group.add_argument('--wakeup', action='store_true'
+                       , help='wake up the mainloop by the handler instead of polling')
+    group.add_argument('--queue-maxsize', type=int, default=0
+                       , help='max size of the queue, 0 for unbounded (default: %(default)s)')
+    group.add_argument('--overload-policy', default=DROP_NEWEST
+                       , choices=[DROP_NEWEST, DROP_OLDEST, BLOCK, SAMPLE]
+                       , help='policy of a full queue (default: %(default)s)')
+    group.add_argument('--sample-rate', type=int, default=10
+                       , help='N of 1-in-N for "sample" (default: %(default)s)')
+
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    """ run the log viewer
+
+    Args:
+        argv: command-line arguments, if None, 'sys.argv[1:]' is used
+
+    Returns:
+        int: exit status
+    """
+    parser = build_parser()
+    args   = parser.parse_args(argv)
+
+    live = args.follow or args.listen or args.stdin
+    if args.open and live:
+        parser.error('--open can not be used with --follow, --listen or --stdin')
+    if not (args.open or live):
+        parser.error('one of --follow, --listen, --stdin or --open is required')
+
+    store = None
+    if args.open:
+        try:
+            store = MappedLogStore(args.open)
+        except OSError as e:
+            parser.exit(1, '[!!] can not open {} - {}\n'.format(args.open, e))
+
+    # all levels are shown for --open by default, hiding levels needs the level index of the whole file
+    if args.level is None:
+        args.level = logging.NOTSET if args.open else logging.INFO
+
+    # create root object
+    root = tk.Tk()
+    root.title(args.title or 'Log console - {}'.format(args.open or ', '.join(
+        args.follow
+        + (['{}:{}'.format(*args.listen)] if args.listen else [])
+        + (['stdin'] if args.stdin else []))))
+    root.geometry(args.geometry)
+
+    # create console frame without a logger, records come from the sources
+    console_frame = LogConsoleExFrame(root, None
+                                      , level=args.level
+                                      , log_formatter=logging.Formatter(args.format)
+                                      , max_lines=args.max_lines or None
+                                      , max_bytes=args.max_bytes or None
+                                      , drain_max_records=args.drain_max_records
+                                      , drain_max_time=args.drain_max_time
+                                      , poll_interval_min=args.poll_interval_min
+                                      , poll_interval_max=args.poll_interval_max
+                                      , wakeup=args.wakeup
+                                      , queue_maxsize=args.queue_maxsize
+                                      , overload_policy=args.overload_policy
+                                      , sample_rate=args.sample_rate
+                                      , coalesce=args.coalesce
+                                      , collapse_tracebacks=args.collapse_tracebacks
+                                      , virtual=args.virtual
+                                      , search_bar=args.search
+                                      , status_bar=args.status
+                                      , store=store)
+    console_frame.init().pack()
+
+    console = console_frame.console_inner_frame
+    for path in args.follow:
+        console.follow_file(path, from_end=not args.from_start)
+
+    if args.listen:
+        try:
+            console.listen_socket(*args.listen, level=args.min_level)
+        except OSError as e:
+            root.destroy()
+            parser.exit(1, '[!!] can not listen on {}:{} - {}\n'.format(*args.listen, e))
+
+    if args.stdin:
+        console.read_stream(sys.stdin)
+
+    # mainloop
+    try:
+        root.mainloop()
+    finally:
+        if store is not None:
+            store.close()
+
+    return 0
@@ -1,5 +1,9 @@
 # -*- coding:utf-8 -*-
 import queue
+import time
+from collections import deque
+from typing import Optional
+from logging.handlers import DEFAULT_TCP_LOGGING_PORT
 from logging import (
     Logger, Formatter, LogRecord
     , NOTSET, DEBUG, INFO, WARNING, ERROR, CRITICAL
@@ -10,24 +14,124 @@ from tkinter import ttk
 
 # my modules and packages
 from tkinter_console.utils.scrolledtext import ScrolledTextEx
-from tkinter_console.log_console.handler.queue_handler import QueueHandler
+from tkinter_console.utils.highlight import Highlight
+from tkinter_console.log_console.handler.queue_handler import (
+    LogEntry, QueueHandler
+    , DROP_NEWEST, DROP_OLDEST, BLOCK, SAMPLE
+)
+from tkinter_console.log_console.handler.wakeup import PipeWaker
+from tkinter_console.log_console.handler.process_handler import ProcessQueueListener
+from tkinter_console.log_console.handler.file_follower import FileFollower
+from tkinter_console.log_console.handler.socket_listener import SocketListener
+from tkinter_console.log_console.handler.stream_reader import StreamReader
+from tkinter_console.log_console.handler.scheduler import DrainScheduler
+from tkinter_console.log_console.stats.console_stats import LogConsoleStats
+from tkinter_console.log_console.store.traceback_store import TracebackStore
 
 
 __all__ = ['LogConsoleFrame'
-           , 'NOTSET', 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+           , 'NOTSET', 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'
+           , 'DROP_NEWEST', 'DROP_OLDEST', 'BLOCK', 'SAMPLE']
 
 class LogConsoleFrame(ttk.Frame):
-    
+
+    # summary line of a collapsed traceback, e.g. "... [+] ValueError: x <tb:0123abcd>"
+    #   the line has the tag of the fingerprint, and the marker ('+' or '-') has the marker tag,
+    #   so they are never parsed from the message
+    TRACEBACK_TAG_PREFIX = 'tb:'
+
+    # records of the first batch, which measures the display cost per record
+    PROBE_RECORDS = 64
+
     def __init__(self, master
-                 , logger: Logger, log_format='%(message)s'
+                 , logger: Optional[Logger], log_format='%(message)s'
                  , background='black'
-                 , auto_scroll=True):
+                 , auto_scroll=True
+                 , drain_max_records=1000, drain_max_time=8
+                 , max_lines=None, max_bytes=None
+                 , poll_interval_min=10, poll_interval_max=1000
+                 , wakeup=False, preformat=False
+                 , queue_maxsize=0, overload_policy=DROP_NEWEST
+                 , block_timeout=0.1, sample_rate=10
+                 , coalesce=False, collapse_tracebacks=False
+                 , scheduler: Optional[DrainScheduler] = None):
+        """ initializer
+
+        Notes:
+            The queue is drained in batches.
+            Each tick displays at most 'drain_max_records' records
+            and spends at most 'drain_max_time' ms, including the display cost,
+            the rest of the records are carried over to the next tick.
+            The batch is sized from the measured display cost per record.
+
+            If 'max_lines' or 'max_bytes' is set, the oldest records are trimmed
+            in chunks (10% of the limit) when the limit is exceeded.
+
+            The polling interval is adapted to the traffic.
+            While records are flowing, the queue is polled every 'poll_interval_min' ms,
+            and while the queue is empty, the interval is doubled up to 'poll_interval_max' ms.
+
+            If 'wakeup=True', the polling loop is not used.
+            The handler wakes up the mainloop through a self-pipe,
+            and the queue is drained only when records are put.
+            It's available only on Unix-like platforms, otherwise falls back to the polling.
+
+            If 'preformat=True', records are formatted on the emitting thread,
+            and the mainloop only inserts the formatted texts.
+
+            If 'queue_maxsize' is set, the queue is bounded and 'overload_policy' is used,
+            see 'QueueHandler'. Dropped records are shown as a "N records dropped" line.
+
+            If 'coalesce=True', consecutive records of the same level and message
+            are collapsed into one line with a "(repeated ×N)" suffix, updated in place.
+
+            If 'auto_scroll=True', the view sticks to the bottom only while it's at the bottom,
+            and it's scrolled once per batch. While the view is scrolled away,
+            a "N new lines ↓" indicator is shown, and autoscroll is resumed
+            when the view is scrolled back to the end (or the indicator is clicked).
+
+            Throughput, queue depth, drain time and latency are counted in 'stats',
+            see 'LogConsoleStats'.
+
+            If 'collapse_tracebacks=True', a record with a traceback is displayed
+            as a one-line summary, and the traceback is kept in a side store
+            deduplicated by fingerprint. Clicking the line expands (or collapses) the traceback.
+
+            If 'scheduler' is set, the console is drained by the shared 'DrainScheduler'
+            instead of its own polling loop, and 'wakeup' is ignored.
+            Other loggers can be attached by 'add_logger', records of them are
+            displayed with the per-logger tag.
+
+        Args:
+            master           : master (tk or ttk objects)
+            logger           : logger object, None if records come from other sources only
+                                 (e.g. 'follow_file')
+            log_format       : log format
+            background       : console background color
+            auto_scroll      : do auto scroll or not
+            drain_max_records: max records displayed per tick
+            drain_max_time   : max time (ms) spent per tick
+            max_lines        : max lines kept in the console (None: unlimited)
+            max_bytes        : max bytes kept in the console (None: unlimited)
+            poll_interval_min: min polling interval (ms)
+            poll_interval_max: max polling interval (ms)
+            wakeup           : wake up the mainloop by the handler instead of polling
+            preformat        : format records on the emitting thread
+            queue_maxsize    : max size of the queue (0: unbounded)
+            overload_policy  : DROP_NEWEST, DROP_OLDEST, BLOCK or SAMPLE
+            block_timeout    : timeout (sec) for BLOCK
+            sample_rate      : N of 1-in-N for SAMPLE
+            coalesce         : collapse repeated records into one line
+            collapse_tracebacks: show tracebacks as one-line summaries, expanded on click
+            scheduler        : shared drain scheduler
+        """
         super(LogConsoleFrame, self).__init__(master)
 
         # set scrolled text
         self._scrolled_text_widget = ScrolledTextEx(self, state='disabled'
                                                     , padx=5, wrap='none')
-        self._scrolled_text_widget.configure(font='TkFixedFont', background=background)
+        self._scrolled_text_widget.configure(font='TkFixedFont', background=background
+                                             , yscrollcommand=self.__on_yscroll)
 
         # logging settings
         self.logger          = logger
@@ -42,18 +146,356 @@ class LogConsoleFrame(ttk.Frame):
             , CRITICAL: {'foreground': 'red', 'underline': True}
         }
 
+        # levels hidden by 'set_levels_visible'
+        #   if 'discard_hidden' is True, records of the levels are not retained
+        self._hidden_levels   = set()
+        self.__discard_hidden = False
+
+        # display format for the synthetic "N records dropped" line
+        self._dropped_tag            = 'dropped'
+        self._dropped_display_format = {'foreground': 'magenta'}
+
+        # display format for the "(repeated ×N)" suffix
+        self._repeated_tag            = 'repeated'
+        self._repeated_display_format = {'foreground': 'white'}
+
+        # display format for the traceback summary and the expanded traceback
+        self._traceback_tag            = 'traceback'
+        self._traceback_display_format = {'underline': True}
+        self._traceback_body_tag            = 'traceback_body'
+        self._traceback_body_display_format = {'lmargin1': 20, 'lmargin2': 20}
+        self._traceback_marker_tag          = 'traceback_marker'
+
+        # traceback settings
+        self.__collapse_tracebacks = collapse_tracebacks
+        self.__traceback_store     = TracebackStore()
+
+        # for highlighting, only new lines are highlighted before inserting
+        self.__highlighter: Optional[Highlight] = None
+
         # queue handler settings
-        self.__poling_time = 100    # 100ms
-        self.__auto_scroll = auto_scroll
+        self.__poll_interval_min = poll_interval_min     # ms
+        self.__poll_interval_max = poll_interval_max     # ms
+        self.__poll_interval     = poll_interval_min     # ms
+        self.__auto_scroll       = auto_scroll
+
+        # sticky bottom settings
+        #   the view is at the bottom or not, it's updated by the scroll command
+        self.__at_bottom  = True
+        self.__new_lines  = 0       # lines displayed while the view is scrolled away
+        self.__w_new_lines_button: ttk.Button | None = None
+
+        # drain settings
+        self.__drain_max_records = drain_max_records
+        self.__drain_max_time    = drain_max_time     # ms
+        #   moving average of the display cost (sec) per record, measured after each batch
+        self.__display_cost      = 0.0
+
+        # coalescing settings
+        #   the suffix of the last line starts at the 'repeat_start' mark
+        self.__coalesce     = coalesce
+        self.__repeat_mark  = 'repeat_start'
+        self.__last_key     = None      # (level, message) of the last line
+        self.__last_tag     = None      # tag of the last line
+        self.__repeat       = 0         # repeated count of the last line
+        self.__repeat_shown = 0         # repeated count shown in the widget
+
+        # scrollback settings
+        #   (lines, bytes) of each displayed record, the oldest is at the left
+        self.__max_lines       = max_lines
+        self.__max_bytes       = max_bytes
+        self.__scrollback      = deque()
+        self.__scrollback_size = [0, 0]     # [lines, bytes]
+        self.__discarded_lines = 0
 
-        self.__queue         = queue.Queue()
-        self.__queue_handler = QueueHandler(self.__queue)
+        # wakeup settings
+        self.__wakeup           = wakeup
+        self.__waker            : PipeWaker | None = None
+        self.__drain_scheduled  = False
+
+        # listeners for other processes
+        self.__listeners: list = []
+
+        # shared drain scheduler
+        self.__scheduler = scheduler
+
+        # other loggers, {logger name: tag}
+        #   a record name is resolved to the tag of the longest prefix, and cached
+        self.__logger_tags: dict = {}
+        self.__name_tags  : dict = {}
+
+        # throughput and latency counters
+        self.__stats = LogConsoleStats()
+
+        self.__queue         = queue.Queue(maxsize=queue_maxsize)
+        self.__queue_handler = QueueHandler(self.__queue, preformat=preformat
+                                            , policy=overload_policy
+                                            , block_timeout=block_timeout
+                                            , sample_rate=sample_rate)
 
     @property
     def queue_handler(self) -> QueueHandler:
         """ QueueHandler: handler """
         return self.__queue_handler
 
+    @property
+    def auto_scroll(self) -> bool:
+        """ bool: do auto scroll or not """
+        return self.__auto_scroll
+
+    @auto_scroll.setter
+    def auto_scroll(self, flag: bool):
+        self.__auto_scroll = flag
+
+    @property
+    def new_lines(self) -> int:
+        """ int: number of lines displayed while the view is scrolled away from the bottom """
+        return self.__new_lines
+
+    def scroll_to_end(self) -> None:
+        """ scroll to the bottom, and resume autoscroll """
+        self._scrolled_text_widget.yview(tk.END)
+        self._set_at_bottom(True)
+
+    def _set_at_bottom(self, flag: bool) -> None:
+        """ set the view is at the bottom or not, the indicator is hidden at the bottom """
+        self.__at_bottom = flag
+        if flag:
+            self._update_new_lines_indicator(0)
+
+    def _update_new_lines_indicator(self, new_lines: int) -> None:
+        """ show the "N new lines ↓" indicator, it's hidden if 'new_lines' is 0 """
+        self.__new_lines = new_lines
+        button = self.__w_new_lines_button
+        if button is None:
+            return
+
+        if new_lines:
+            button.configure(text=u"{n} new lines \u2193".format(n=new_lines))
+            if not button.winfo_manager():
+                button.place(in_=self._scrolled_text_widget
+                             , relx=1.0, rely=1.0, x=-4, y=-4, anchor=tk.SE)
+        elif button.winfo_manager():
+            button.place_forget()
+
+    def __on_yscroll(self, first, last) -> None:
+        """ for the scroll command, track the view is at the bottom or not """
+        self._scrolled_text_widget.vbar_y.set(first, last)
+
+        at_bottom = float(last) >= 1.0
+        if at_bottom != self.__at_bottom:
+            self._set_at_bottom(at_bottom)
+
+    @property
+    def coalesce(self) -> bool:
+        """ bool: collapse repeated records into one line, or not """
+        return self.__coalesce
+
+    @property
+    def poll_interval(self) -> int:
+        """ int: current polling interval (ms) """
+        return self.__poll_interval
+
+    @property
+    def backlog(self) -> int:
+        """ int: number of records waiting in the queue """
+        return self.__queue.qsize()
+
+    @property
+    def discarded_lines(self) -> int:
+        """ int: number of lines trimmed by 'max_lines' or 'max_bytes' """
+        return self.__discarded_lines
+
+    @property
+    def collapse_tracebacks(self) -> bool:
+        """ bool: show tracebacks as one-line summaries, or not """
+        return self.__collapse_tracebacks
+
+    @property
+    def traceback_store(self) -> TracebackStore:
+        """ TracebackStore: side store of collapsed tracebacks """
+        return self.__traceback_store
+
+    @property
+    def highlighter(self) -> Highlight | None:
+        """ Highlight: highlight instance """
+        return self.__highlighter
+
+    def attach_highlighter(self, highlighter: Highlight) -> None:
+        """ attach highlighter instance, e.g. for request ids, ip addresses and durations
+
+        Texts of new records are matched by the compiled patterns of the highlighter before inserting,
+        and the tags are inserted with the text in the same batch,
+        so the cost depends on the ingest rate, not on the size of the widget.
+
+        Examples:
+            >> highlighter = Highlight()
+            >> console.attach_highlighter(highlighter)
+            >> highlighter.register_regex_tag('ip', pattern=r'\d+(\.\d+){3}', foreground='cyan')
+        """
+        self.__highlighter = highlighter
+        highlighter.attach(master=self._scrolled_text_widget)
+        self.__raise_highlight_tags()
+
+    def __raise_highlight_tags(self) -> None:
+        """ highlight tags take priority over level tags """
+        if self.__highlighter:
+            self.__highlighter.restore_tags()
+            for tag in self.__highlighter.tags:
+                self._scrolled_text_widget.tag_raise(tag)
+
+    def _highlight(self, text: str) -> list | None:
+        """ split the text by the highlighter
+
+        Returns:
+            list | None: [(segment, tags), ...], None if nothing is highlighted
+        """
+        if self.__highlighter is None:
+            return None
+
+        segments = self.__highlighter.split(text)
+        if len(segments) == 1 and not segments[0][1]:
+            return None
+        return segments
+
+    @property
+    def scheduler(self) -> DrainScheduler | None:
+        """ DrainScheduler | None: shared drain scheduler """
+        return self.__scheduler
+
+    @property
+    def logger_tags(self) -> dict:
+        """ dict: {logger name: tag} of loggers attached by 'add_logger' """
+        return dict(self.__logger_tags)
+
+    def add_logger(self, logger: Logger, tag: Optional[str] = None, **kwargs) -> None:
+        """ attach another logger to the console, the handler and the queue are shared
+
+        Records whose name is the logger's name or under it (e.g. 'app.db' for 'app')
+        are displayed with the tag in addition to the level tag.
+
+        Args:
+            logger  : logger object
+            tag     : tag name, if None, the logger name is used
+            **kwargs: display format of the tag, e.g. background='gray20'
+        """
+        tag = tag if tag is not None else logger.name
+
+        self.__logger_tags[logger.name] = tag
+        self.__name_tags.clear()
+
+        if kwargs:
+            self.set_logger_tag_format(tag, **kwargs)
+
+        logger.addHandler(self.__queue_handler)
+
+    def remove_logger(self, logger: Logger) -> None:
+        """ detach a logger attached by 'add_logger' """
+        logger.removeHandler(self.__queue_handler)
+
+        self.__logger_tags.pop(logger.name, None)
+        self.__name_tags.clear()
+
+    def set_logger_tag_format(self, tag: str, **kwargs) -> None:
+        """ set display format of the per-logger tag """
+        kwargs = {key.lower(): value for key, value in kwargs.items()}
+        self._scrolled_text_widget.tag_config(tag, **kwargs)
+        self.__raise_highlight_tags()
+
+    def _logger_tag(self, name: str) -> Optional[str]:
+        """ return the tag of the record name, None if no logger is matched """
+        try:
+            return self.__name_tags[name]
+        except KeyError:
+            pass
+
+        tag    = None
+        length = -1
+        for prefix, prefix_tag in self.__logger_tags.items():
+            # the root logger is the prefix of all names
+            if ((prefix == 'root' or name == prefix or name.startswith(prefix + '.'))
+                    and len(prefix) > length):
+                tag, length = prefix_tag, len(prefix)
+
+        self.__name_tags[name] = tag
+        return tag
+
+    @property
+    def stats(self) -> LogConsoleStats:
+        """ LogConsoleStats: throughput and latency counters, updated after each drain """
+        return self.__stats
+
+    def listen_process_queue(self, mp_queue) -> ProcessQueueListener:
+        """ display records from other processes
+
+        Records are sent by 'ProcessQueueHandler' in child processes,
+        and displayed in the same way as records of the logger.
+
+        Args:
+            mp_queue: multiprocessing queue, shared with 'ProcessQueueHandler'
+
+        Returns:
+            ProcessQueueListener: started listener, it's stopped when the frame is destroyed
+        """
+        listener = ProcessQueueListener(mp_queue, self.__queue_handler).start()
+        self.__listeners.append(listener)
+        return listener
+
+    def follow_file(self, path: str, **kwargs) -> FileFollower:
+        """ display lines appended to a log file, like 'tail -F'
+
+        Lines are read on a background thread, mapped to levels by the parser,
+        and displayed in the same way as records of the logger.
+
+        Args:
+            path    : path of the log file
+            **kwargs: kwargs of 'FileFollower', e.g. 'parser' and 'from_end'
+
+        Returns:
+            FileFollower: started follower, it's stopped when the frame is destroyed
+        """
+        follower = FileFollower(path, self.__queue_handler, **kwargs).start()
+        self.__listeners.append(follower)
+        return follower
+
+    def listen_socket(self, host='localhost', port=DEFAULT_TCP_LOGGING_PORT, **kwargs) -> SocketListener:
+        """ display records sent by 'logging.handlers.SocketHandler' of other processes
+
+        Records are received on a background thread,
+        and displayed in the same way as records of the logger.
+
+        Args:
+            host    : host of the server
+            port    : port of the server, if 0, a free port is used
+            **kwargs: kwargs of 'SocketListener', e.g. 'level'
+
+        Returns:
+            SocketListener: started listener, it's stopped when the frame is destroyed
+
+        Raises:
+            OSError: if the address can't be bound
+        """
+        listener = SocketListener(self.__queue_handler, host, port, **kwargs).start()
+        self.__listeners.append(listener)
+        return listener
+
+    def read_stream(self, stream, **kwargs) -> StreamReader:
+        """ display lines of a stream, e.g. 'sys.stdin'
+
+        Lines are read on a background thread, mapped to levels by the parser,
+        and displayed in the same way as records of the logger.
+
+        Args:
+            stream  : binary or text stream
+            **kwargs: kwargs of 'StreamReader', e.g. 'parser' and 'name'
+
+        Returns:
+            StreamReader: started reader, it's stopped when the frame is destroyed
+        """
+        reader = StreamReader(stream, self.__queue_handler, **kwargs).start()
+        self.__listeners.append(reader)
+        return reader
+
     @property
     def scrolled_text_widget(self) -> ScrolledTextEx:
         """ ScrolledTextEx: widget """
@@ -107,6 +549,32 @@ class LogConsoleFrame(ttk.Frame):
         """ set display format for critical """
         self.__set_display_format(level=CRITICAL, **kwargs)
 
+    @property
+    def discard_hidden(self) -> bool:
+        """ bool: records of hidden levels are not retained, or not """
+        return self.__discard_hidden
+
+    @discard_hidden.setter
+    def discard_hidden(self, flag: bool):
+        self.__discard_hidden = flag
+
+    def set_level_visible(self, level, flag: bool) -> None:
+        """ show or hide lines of the level """
+        self.set_levels_visible({level: flag})
+
+    def set_levels_visible(self, flags: dict) -> None:
+        """ show or hide lines of the levels at once, it's used by 'LogSelectorFrame'
+
+        Args:
+            flags: {level: flag}
+        """
+        for level, flag in flags.items():
+            if flag:
+                self._hidden_levels.discard(level)
+            else:
+                self._hidden_levels.add(level)
+            self._scrolled_text_widget.tag_config(str(level), elide=not flag)
+
 
     def init(self):
         """ initialization method
@@ -118,16 +586,38 @@ class LogConsoleFrame(ttk.Frame):
         self._scrolled_text_widget.pack(expand=True, fill=tk.BOTH)
         for key, value in self._log_display_format.items():
             self._scrolled_text_widget.tag_config(str(key), value)
+        self._scrolled_text_widget.tag_config(self._dropped_tag, self._dropped_display_format)
+        self._scrolled_text_widget.tag_config(self._repeated_tag, self._repeated_display_format)
+        self._scrolled_text_widget.tag_config(self._traceback_tag, self._traceback_display_format)
+        self._scrolled_text_widget.tag_config(self._traceback_body_tag, self._traceback_body_display_format)
+        self.__raise_highlight_tags()
+
+        # expand or collapse a traceback by clicking the summary
+        widget = self._scrolled_text_widget
+        widget.tag_bind(self._traceback_tag, '<Button-1>', self.__on_traceback_click)
+        widget.tag_bind(self._traceback_tag, '<Enter>', lambda e: widget.configure(cursor='hand2'))
+        widget.tag_bind(self._traceback_tag, '<Leave>', lambda e: widget.configure(cursor=''))
 
+        # "N new lines" indicator, it's placed while the view is scrolled away
+        self.__w_new_lines_button = ttk.Button(self, command=self.scroll_to_end)
 
         # set a format and add the handler
         self.__queue_handler.setFormatter(self._log_formatter)
         self.__queue_handler.setLevel(DEBUG)
-        self.logger.addHandler(self.__queue_handler)
+        if self.logger is not None:
+            self.logger.addHandler(self.__queue_handler)
 
 
-        # start polling message from the queue
-        self.after(self.__poling_time, self.__poll_log_queue)
+        # drained by the shared scheduler, wake up by the handler,
+        # or start polling message from the queue
+        if self.__scheduler is not None:
+            self.__scheduler.register(self)
+        elif self.__wakeup and PipeWaker.is_available(self):
+            self.__waker = PipeWaker().attach(self, self.__on_wakeup)
+            self.__queue_handler.waker = self.__waker
+            self.__on_wakeup()
+        else:
+            self.after(self.__poll_interval, self.__poll_log_queue)
 
         # setting pack configure
         self.pack_configure(fill=tk.BOTH, expand=True)
@@ -135,26 +625,421 @@ class LogConsoleFrame(ttk.Frame):
         return self
 
 
-    def __display(self, record: LogRecord):
-        """ for displaying method """
-        msg: QueueHandler.format = self.__queue_handler.format(record=record)
-        self._scrolled_text_widget.configure(state='normal')
-        self._scrolled_text_widget.insert(tk.END
-                                          , "{msg}\n".format(msg=msg)
-                                          , str(record.levelno))
+    def drain(self, max_records: Optional[int] = None, deadline: Optional[float] = None) -> int:
+        """ get records in the queue within the budget, and display them as a batch
+
+        Args:
+            max_records: max records, if None, 'drain_max_records' is used
+            deadline   : deadline ('time.perf_counter'), if None, 'drain_max_time' from now is used
+
+        Returns:
+            int: number of displayed records
+        """
+        started  = time.perf_counter()
+        if max_records is None:
+            max_records = self.__drain_max_records
+        if deadline is None:
+            deadline = started + self.__drain_max_time / 1000
+        entries  = []
+        cost     = self.__display_cost
+
+        # the displaying must also end by the deadline
+        #   the cost is unknown at first, so the first batch is small for measuring it
+        if cost > 0:
+            max_records = min(max_records, max(1, int((deadline - started) / cost)))
+        else:
+            max_records = min(max_records, self.PROBE_RECORDS)
+
+        while len(entries) < max_records:
+            try:
+                entry: LogEntry | LogRecord = self.__queue.get(block=False)
+            except queue.Empty:
+                break
+
+            # the record is not formatted yet
+            if isinstance(entry, LogRecord):
+                entry = self.__queue_handler.make_entry(entry)
+
+            entries.append(entry)
+
+            if time.perf_counter() + len(entries) * cost >= deadline:
+                break
+
+        dropped = self.__queue_handler.pop_dropped()
+        if entries or dropped:
+            displayed = time.perf_counter()
+            self._display_entries(entries, dropped)
+
+            # update the display cost per record
+            if entries:
+                measured = (time.perf_counter() - displayed) / len(entries)
+                self.__display_cost = (measured if cost == 0
+                                       else cost + (measured - cost) / 4)
+
+        self.__stats.record_drain(entries, self.__queue.qsize()
+                                  , time.perf_counter() - started
+                                  , self.__queue_handler.dropped if dropped else None)
+
+        return len(entries)
+
+    def _display_entries(self, entries: list, dropped: int) -> None:
+        """ display entries as a batch
+
+        Consecutive records of the same level are merged into one chunk,
+        and all chunks are inserted by one 'insert' call.
+
+        Args:
+            entries: list of 'LogEntry'
+            dropped: number of records dropped since the last batch
+        """
+        chunks   = []   # 'insert' args: text, tags, text, tags, ...
+        texts    = []   # texts of the current chunk
+        tag      = None
+
+        # for coalescing
+        #   the repeated count of the last line in the widget, updated before inserting
+        repeat_before = None
+        new_lines     = False
+
+        # inner function
+        def _append(text, line_tag, key=None, marker=None):
+            nonlocal texts, tag, repeat_before, new_lines
+
+            # settle the repeated count of the previous line
+            if new_lines:
+                if self.__repeat:
+                    # the suffix is inserted with the repeated tag, like '__update_repeat_suffix'
+                    texts[-1] = texts[-1][:-1]
+                    if texts[-1] or len(texts) > 1:
+                        chunks.extend(("".join(texts), tag))
+                    chunks.extend((self._repeat_suffix(self.__repeat)
+                                   , (tag if isinstance(tag, tuple) else (tag,)) + (self._repeated_tag,)))
+                    texts = ['\n']
+            elif self.__repeat != self.__repeat_shown:
+                repeat_before = self.__repeat
+
+            self.__last_key     = key
+            self.__last_tag     = line_tag
+            self.__repeat       = 0
+            self.__repeat_shown = 0
+            new_lines           = True
+
+            if self.__max_lines or self.__max_bytes:
+                self.__add_scrollback(text)
+
+            # highlighted segments are inserted with their tags,
+            # and the rest of the line is kept in 'texts' for the repeated count
+            segments = self._highlight(text[:-1])
+            if marker is not None:
+                segments = self._tag_char(segments or [(text[:-1], ())], marker, self._traceback_marker_tag)
+            if segments:
+                if texts:
+                    chunks.extend(("".join(texts), tag))
+                    texts = []
+
+                line_tags = line_tag if isinstance(line_tag, tuple) else (line_tag,)
+                rest      = segments.pop()[0] if not segments[-1][1] else ''
+                for segment, segment_tags in segments:
+                    chunks.extend((segment, line_tags + segment_tags))
+                text = rest + '\n'
+
+            if line_tag != tag and texts:
+                chunks.extend(("".join(texts), tag))
+                texts = []
+
+            tag = line_tag
+            texts.append(text)
+
+        # let operators know the view is lossy
+        if dropped:
+            _append(self._dropped_text(dropped), self._dropped_tag)
+
+        for entry in entries:
+            if self.__discard_hidden and entry.levelno in self._hidden_levels:
+                continue
+
+            key = (entry.levelno, entry.message) if self.__coalesce else None
+            if key is not None and key == self.__last_key:
+                self.__repeat += 1
+                continue
+
+            line_tag   = str(entry.levelno)
+            logger_tag = self._logger_tag(entry.name) if self.__logger_tags else None
+            if logger_tag is not None:
+                line_tag = (line_tag, logger_tag)
+
+            # the summary of a collapsed traceback is clickable
+            if entry.exc_text and self.__collapse_tracebacks:
+                text, marker, fingerprint = self._traceback_summary(entry)
+                line_tag = ((line_tag if isinstance(line_tag, tuple) else (line_tag,))
+                            + (self._traceback_tag, self.TRACEBACK_TAG_PREFIX + fingerprint))
+                _append(text + '\n', line_tag, key, marker)
+                continue
+
+            _append("{msg}\n".format(msg=entry.full_text), line_tag, key)
+
+        if texts:
+            chunks.extend(("".join(texts), tag))
+
+        # the repeated count of the last line
+        repeat_after = None
+        if new_lines:
+            repeat_after = self.__repeat
+        elif self.__repeat != self.__repeat_shown:
+            repeat_before = self.__repeat
+        self.__repeat_shown = self.__repeat
+
+        if chunks or repeat_before is not None:
+            self.__display(chunks, repeat_before, repeat_after)
+
+    def _traceback_summary(self, entry: LogEntry) -> tuple:
+        """ collapse the traceback of an entry into the summary
+
+        Returns:
+            tuple: (text, position of the marker, fingerprint of the traceback)
+        """
+        fingerprint = self.__traceback_store.add(entry.exc_text)
+        head        = "{text}  [".format(text=entry.text)
+        text        = head + "+] {summary} <tb:{fp}>".format(summary=TracebackStore.summary(entry.exc_text)
+                                                           , fp=fingerprint)
+        return text, len(head), fingerprint
+
+    @staticmethod
+    def _tag_char(segments: list, index: int, tag: str) -> list:
+        """ add the tag to the character of the index in the segments of 'Highlight.split' """
+        result = []
+        pos    = 0
+        for segment, tags in segments:
+            i = index - pos
+            if 0 <= i < len(segment):
+                for text, text_tags in ((segment[:i], tags)
+                                        , (segment[i], tags + (tag,))
+                                        , (segment[i + 1:], tags)):
+                    if text:
+                        result.append((text, text_tags))
+            else:
+                result.append((segment, tags))
+            pos += len(segment)
+        return result
+
+    def toggle_traceback(self, line: int) -> bool:
+        """ expand or collapse the traceback of the summary line
+
+        Args:
+            line: line number of the summary in the widget
+
+        Returns:
+            bool: True if the line is a summary
+        """
+        widget = self._scrolled_text_widget
+        prefix = self.TRACEBACK_TAG_PREFIX
+
+        # the fingerprint is the tag of the line, and the marker is found by its tag
+        fingerprint = next((t[len(prefix):] for t in widget.tag_names('{}.0'.format(line))
+                            if t.startswith(prefix)), None)
+        ranges      = widget.tag_nextrange(self._traceback_marker_tag
+                                           , '{}.0'.format(line), '{}.end'.format(line))
+        if fingerprint is None or not ranges:
+            return False
+
+        marker = str(ranges[0])
+        tags   = tuple(t for t in widget.tag_names(marker)
+                       if t not in (self._traceback_tag, self._traceback_marker_tag) and not t.startswith(prefix))
+        body   = '{}.0'.format(line + 1)
+
+        widget.configure(state='normal')
+
+        if widget.get(marker) == '+':
+            exc_text = self.__traceback_store.get(fingerprint) or '[traceback is evicted]'
+            exc_text = exc_text.rstrip('\n') + '\n'
+
+            widget.insert(body, exc_text, tags + (self._traceback_body_tag,))
+            lines, nbytes = exc_text.count('\n'), len(exc_text.encode('utf-8'))
+            new_marker = '-'
+        else:
+            ranges = widget.tag_nextrange(self._traceback_body_tag, body)
+            if not ranges or widget.compare(ranges[0], '!=', body):
+                widget.configure(state='disabled')
+                return True
+
+            exc_text = widget.get(*ranges)
+            widget.delete(*ranges)
+            lines, nbytes = -exc_text.count('\n'), -len(exc_text.encode('utf-8'))
+            new_marker = '+'
+
+        # replace the marker, keeping the tags
+        summary_tags = widget.tag_names(marker)
+        widget.delete(marker)
+        widget.insert(marker, new_marker, summary_tags)
+
+        widget.configure(state='disabled')
+
+        # the last line is not the coalesced line any more
+        self.__last_key     = None
+        self.__repeat       = 0
+        self.__repeat_shown = 0
+
+        if self.__max_lines or self.__max_bytes:
+            self.__resize_scrollback(line, lines, nbytes if self.__max_bytes else 0)
+
+        return True
+
+    def __on_traceback_click(self, event):
+        """ for the click event on a traceback summary """
+        index = self._scrolled_text_widget.index('@{},{}'.format(event.x, event.y))
+        self.toggle_traceback(int(index.split('.')[0]))
+        return 'break'
+
+    @staticmethod
+    def _dropped_text(dropped: int) -> str:
+        """ return the synthetic line for dropped records """
+        return "[{n} records dropped]\n".format(n=dropped)
+
+    @staticmethod
+    def _repeat_suffix(repeat: int) -> str:
+        """ return the suffix of the repeated line """
+        return "  (repeated \u00d7{n})".format(n=repeat + 1)
+
+    def __update_repeat_suffix(self, repeat: int) -> None:
+        """ replace the suffix of the last line in the widget """
+        widget = self._scrolled_text_widget
+        widget.delete(self.__repeat_mark, 'end-2c')
+
+        if repeat:
+            tags = self.__last_tag if isinstance(self.__last_tag, tuple) else (self.__last_tag,)
+            widget.insert('end-2c', self._repeat_suffix(repeat)
+                          , tags + (self._repeated_tag,))
+
+    def __add_scrollback(self, text: str) -> None:
+        """ account a displayed record for trimming """
+        lines  = text.count('\n')
+        nbytes = len(text.encode('utf-8')) if self.__max_bytes else 0
+
+        self.__scrollback.append((lines, nbytes))
+        self.__scrollback_size[0] += lines
+        self.__scrollback_size[1] += nbytes
+
+    def __resize_scrollback(self, line: int, lines: int, nbytes: int) -> None:
+        """ account lines added to (or removed from) the record at the line of the widget """
+        scrollback = self.__scrollback
+
+        # find the record, it's rare, so walk the scrollback from the top
+        end = 0
+        for i, (n, b) in enumerate(scrollback):
+            end += n
+            if end >= line:
+                scrollback[i] = (n + lines, b + nbytes)
+                break
+        else:
+            return
+
+        self.__scrollback_size[0] += lines
+        self.__scrollback_size[1] += nbytes
+
+    def __over_limit(self, slack: float) -> bool:
+        """ check the scrollback exceeds the limits multiplied by 'slack' """
+        lines, nbytes = self.__scrollback_size
+        return ((self.__max_lines is not None and lines > self.__max_lines * slack)
+                or (self.__max_bytes is not None and nbytes > self.__max_bytes * slack))
+
+    def __trim_scrollback(self) -> None:
+        """ trim the oldest records in a chunk
+
+        The records are trimmed until the scrollback is 90% of the limits,
+        so that 'delete' is not called for every record.
+        """
+        if not self.__over_limit(slack=1.0):
+            return
+
+        lines = 0
+        while self.__scrollback and self.__over_limit(slack=0.9):
+            n, nbytes = self.__scrollback.popleft()
+            self.__scrollback_size[0] -= n
+            self.__scrollback_size[1] -= nbytes
+            lines += n
+
+        # the level tags are attached to the text, so the remained lines keep them
+        self._scrolled_text_widget.delete('1.0', '{}.0'.format(lines + 1))
+        self.__discarded_lines += lines
+
+    def __display(self, chunks: list, repeat_before=None, repeat_after=None):
+        """ for displaying method
+
+        Args:
+            chunks       : 'insert' args
+            repeat_before: repeated count of the last line in the widget, updated before inserting
+            repeat_after : repeated count of the last inserted line
+        """
+        widget = self._scrolled_text_widget
+        widget.configure(state='normal')
+
+        if repeat_before is not None:
+            self.__update_repeat_suffix(repeat_before)
+
+        if chunks:
+            widget.insert(tk.END, *chunks)
+
+        if self.__coalesce and repeat_after is not None:
+            # the suffix of the last line starts here, before its newline
+            widget.mark_set(self.__repeat_mark, 'end-2c')
+            widget.mark_gravity(self.__repeat_mark, tk.LEFT)
+            if repeat_after:
+                self.__update_repeat_suffix(repeat_after)
+
+        self.__trim_scrollback()
         self._scrolled_text_widget.configure(state='disabled')
 
-        # autoscroll to the bottom
-        if self.__auto_scroll:
+        if not self.__auto_scroll:
+            return
+
+        # autoscroll to the bottom once per batch, only while the view is at the bottom
+        if self.__at_bottom:
             self._scrolled_text_widget.yview(tk.END)
+        else:
+            lines = sum(text.count('\n') for text in chunks[::2])
+            if lines:
+                self._update_new_lines_indicator(self.__new_lines + lines)
 
-    def __poll_log_queue(self):
-        """ for polling log method """
-        # check every 100ms if there is anew message in the queue to display
-        while not self.__queue.empty():
-            msg: QueueHandler.format = self.__queue.get(block=False)
-            self.__display(msg)
-        self.after(self.__poling_time, self.__poll_log_queue)
+    def __on_wakeup(self):
+        """ for wakeup method, called when records are put into the queue """
+        # a carried over drain is already scheduled
+        if self.__drain_scheduled:
+            return
+        self.__drain_wakeup()
+
+    def __drain_wakeup(self):
+        """ drain the queue, and carry over the backlog to the next tick """
+        self.__drain_scheduled = False
+        self.drain()
 
+        if not self.__queue.empty():
+            self.__drain_scheduled = True
+            self.after(1, self.__drain_wakeup)
 
+    def destroy(self):
+        """ destroy the widget, stop listeners, and unregister the scheduler and the wakeup pipe """
+        for listener in self.__listeners:
+            listener.stop()
+        self.__listeners.clear()
+
+        if self.__scheduler is not None:
+            self.__scheduler.unregister(self)
+
+        if self.__waker:
+            self.__queue_handler.waker = None
+            self.__waker.detach()
+            self.__waker = None
+        super(LogConsoleFrame, self).destroy()
+
+    def __poll_log_queue(self):
+        """ for polling log method """
+        if self.drain() > 0:
+            # records are flowing, snap down to the fast cadence
+            self.__poll_interval = self.__poll_interval_min
+        else:
+            # the queue is empty, back off exponentially
+            self.__poll_interval = min(self.__poll_interval * 2, self.__poll_interval_max)
 
+        # if records are left, come back as soon as possible
+        delay = 1 if not self.__queue.empty() else self.__poll_interval
+        self.after(delay, self.__poll_log_queue)
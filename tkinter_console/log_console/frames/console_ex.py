@@ -5,8 +5,8 @@ from typing import Optional
 from logging import Logger, Formatter
 
 # my modules and packages
-from tkinter_console.log_console import LogConsoleFrame, INFO
-from tkinter_console.log_console import LogSelectorFrame
+from tkinter_console.log_console import LogConsoleFrame, LogVirtualConsoleFrame, INFO, DROP_NEWEST
+from tkinter_console.log_console import LogSelectorFrame, LogSearchFrame, LogStatusFrame
 
 
 __all__ = ['LogConsoleExFrame']
@@ -14,11 +14,21 @@ __all__ = ['LogConsoleExFrame']
 
 class LogConsoleExFrame(ttk.Frame):
 
-    def __init__(self, master, logger: Logger
+    def __init__(self, master, logger: Optional[Logger]
                  , level=INFO
                  , console_bg='black', auto_scroll=True
                  , log_formatter=Formatter('%(message)s')
-                 , expand_btn=False):
+                 , expand_btn=False
+                 , drain_max_records=1000, drain_max_time=8
+                 , max_lines=None, max_bytes=None
+                 , poll_interval_min=10, poll_interval_max=1000
+                 , wakeup=False, preformat=False
+                 , queue_maxsize=0, overload_policy=DROP_NEWEST
+                 , block_timeout=0.1, sample_rate=10
+                 , coalesce=False, collapse_tracebacks=False, virtual=False
+                 , discard_unchecked=False
+                 , search_bar=False, status_bar=False
+                 , scheduler=None, store=None):
 
         """ initializer
 
@@ -31,7 +41,7 @@ class LogConsoleExFrame(ttk.Frame):
 
         Args:
             master       : master (tk or ttk objects)
-            logger       : logger object
+            logger       : logger object, None if records come from other sources only
             level        : default checkbutton flags
                              If set 'level=INFO', checkbuttons are checked except "DEBUG".
                              If set 'None', all unchecked.
@@ -39,6 +49,29 @@ class LogConsoleExFrame(ttk.Frame):
             auto_scroll  : do auto scroll or not
             log_formatter: formatter
             expand_btn   : show expand button
+            drain_max_records: max records displayed per tick
+            drain_max_time   : max time (ms) spent per tick
+            max_lines        : max lines kept in the console (None: unlimited)
+            max_bytes        : max bytes kept in the console (None: unlimited)
+            poll_interval_min: min polling interval (ms)
+            poll_interval_max: max polling interval (ms)
+            wakeup           : wake up the mainloop by the handler instead of polling
+            preformat        : format records on the emitting thread
+            queue_maxsize    : max size of the queue (0: unbounded)
+            overload_policy  : DROP_NEWEST, DROP_OLDEST, BLOCK or SAMPLE
+            block_timeout    : timeout (sec) for BLOCK
+            sample_rate      : N of 1-in-N for SAMPLE
+            coalesce         : collapse repeated records into one line
+            collapse_tracebacks: show tracebacks as one-line summaries, expanded on click
+            virtual          : use 'LogVirtualConsoleFrame' as the console,
+                                 records are kept in a store and only the visible window is rendered
+            discard_unchecked: records of unchecked levels are not retained
+            search_bar       : show the search bar,
+                                 'virtual' is forced, and records are indexed for searching
+            status_bar       : show the status bar of throughput and latency under the console
+            scheduler        : shared 'DrainScheduler', the console is drained by it
+            store            : record store of the console, e.g. 'MappedLogStore' of a historical log file,
+                                 'virtual' is forced
         """
 
         super(LogConsoleExFrame, self).__init__(master=master)
@@ -56,16 +89,52 @@ class LogConsoleExFrame(ttk.Frame):
         self.__auto_scroll = auto_scroll
         self.__console_bg  = console_bg
 
+        # drain settings
+        self.__drain_max_records = drain_max_records
+        self.__drain_max_time    = drain_max_time
+
+        # scrollback settings
+        self.__max_lines = max_lines
+        self.__max_bytes = max_bytes
+
+        # polling settings
+        self.__poll_interval_min = poll_interval_min
+        self.__poll_interval_max = poll_interval_max
+        self.__wakeup            = wakeup
+        self.__preformat         = preformat
+
+        # queue settings
+        self.__queue_maxsize   = queue_maxsize
+        self.__overload_policy = overload_policy
+        self.__block_timeout   = block_timeout
+        self.__sample_rate     = sample_rate
+
+        # coalescing settings
+        self.__coalesce            = coalesce
+        self.__collapse_tracebacks = collapse_tracebacks
+
+        # console backend
+        self.__virtual           = virtual or search_bar or store is not None
+        self.__discard_unchecked = discard_unchecked
+        self.__search_bar        = search_bar
+        self.__status_bar        = status_bar
+        self.__scheduler         = scheduler
+        self.__store             = store
+
         # widgets
         self.__w_selector_labelframe: Optional[ttk.LabelFrame] = None
         self.__w_console_labelframe : Optional[ttk.LabelFrame] = None
+        self.__w_search_labelframe  : Optional[ttk.LabelFrame] = None
 
         self.w_selector_labelframe_config = {'text': 'Log text selector'}
         self.w_console_labelframe_config  = {'text': 'Log console'}
+        self.w_search_labelframe_config   = {'text': 'Log search'}
 
         # inner frames
         self.__w_console_inner_frame : Optional[LogConsoleFrame]  = None
         self.__w_selector_inner_frame: Optional[LogSelectorFrame] = None
+        self.__w_search_inner_frame  : Optional[LogSearchFrame]   = None
+        self.__w_status_inner_frame  : Optional[LogStatusFrame]   = None
 
 
         # show expand button or not
@@ -104,6 +173,21 @@ class LogConsoleExFrame(ttk.Frame):
         """ LogSelectorFrame: selector frame """
         return self.__w_selector_inner_frame
 
+    @property
+    def search_labelframe(self) -> ttk.LabelFrame | None:
+        """ ttk.LabelFrame | None: search label frame """
+        return self.__w_search_labelframe
+
+    @property
+    def search_inner_frame(self) -> LogSearchFrame | None:
+        """ LogSearchFrame | None: search frame """
+        return self.__w_search_inner_frame
+
+    @property
+    def status_inner_frame(self) -> LogStatusFrame | None:
+        """ LogStatusFrame | None: status frame """
+        return self.__w_status_inner_frame
+
     @property
     def console_inner_frame(self) -> LogConsoleFrame:
         """ LogConsoleFrame: console frame """
@@ -139,6 +223,12 @@ class LogConsoleExFrame(ttk.Frame):
         self.__w_selector_labelframe.pack_configure(pady=5)
         self.__w_selector_labelframe.pack(fill=tk.BOTH)
 
+        # pack the search labelframe
+        if self.__w_search_labelframe:
+            self.__w_search_labelframe.configure(**self.w_search_labelframe_config)
+            self.__w_search_labelframe.pack(fill=tk.BOTH)
+            self.__w_search_inner_frame.init().pack(side=tk.LEFT)
+
         # pack the console labelframe
         #   the reason, why the method is defined as a new method, is
         #   because of the method is used in the '__expand' method.
@@ -151,6 +241,11 @@ class LogConsoleExFrame(ttk.Frame):
         if self.__w_expand_button:
             self.__w_expand_button.pack(side=tk.RIGHT)
 
+        # pack the inner status frame under the console
+        #   it's packed before the console, so that it's not clipped by the console
+        if self.__w_status_inner_frame:
+            self.__w_status_inner_frame.init().pack(side=tk.BOTTOM)
+
         # pack the inner console frame
         self.__w_console_inner_frame.init().pack()
 
@@ -172,6 +267,8 @@ class LogConsoleExFrame(ttk.Frame):
         - selector inner frame from LogSelectorFrame
         - console labelframe
         - console inner frame from LogConsoleFrame class
+        - search labelframe and inner frame from LogSearchFrame (if 'search_bar')
+        - status inner frame from LogStatusFrame (if 'status_bar')
         """
 
         # create label frames
@@ -185,11 +282,44 @@ class LogConsoleExFrame(ttk.Frame):
 
         # inner frames
         # initialize console at first
-        self.__w_console_inner_frame = LogConsoleFrame(master=self.__w_console_labelframe
+        console_kwargs = ({'indexed': self.__search_bar, 'store': self.__store}
+                          if self.__virtual
+                          else {})
+        console_class  = LogVirtualConsoleFrame if self.__virtual else LogConsoleFrame
+        self.__w_console_inner_frame = console_class(master=self.__w_console_labelframe
                                                        , logger=self.__logger
-                                                       , auto_scroll=self.__auto_scroll)
+                                                       , auto_scroll=self.__auto_scroll
+                                                       , drain_max_records=self.__drain_max_records
+                                                       , drain_max_time=self.__drain_max_time
+                                                       , max_lines=self.__max_lines
+                                                       , max_bytes=self.__max_bytes
+                                                       , poll_interval_min=self.__poll_interval_min
+                                                       , poll_interval_max=self.__poll_interval_max
+                                                       , wakeup=self.__wakeup
+                                                       , preformat=self.__preformat
+                                                       , queue_maxsize=self.__queue_maxsize
+                                                       , overload_policy=self.__overload_policy
+                                                       , block_timeout=self.__block_timeout
+                                                       , sample_rate=self.__sample_rate
+                                                       , coalesce=self.__coalesce
+                                                       , collapse_tracebacks=self.__collapse_tracebacks
+                                                       , scheduler=self.__scheduler
+                                                       , **console_kwargs)
         # initialize selector
         self.__w_selector_inner_frame = LogSelectorFrame(master=self.__w_selector_labelframe
+                                                         , console=self.__w_console_inner_frame
+                                                         , discard_unchecked=self.__discard_unchecked)
+
+        # initialize search bar
+        if self.__search_bar:
+            self.__w_search_labelframe = ttk.LabelFrame(self)
+            self.__w_search_labelframe.configure(padding=2)
+            self.__w_search_inner_frame = LogSearchFrame(master=self.__w_search_labelframe
+                                                         , console=self.__w_console_inner_frame)
+
+        # initialize status bar
+        if self.__status_bar:
+            self.__w_status_inner_frame = LogStatusFrame(master=self.__w_console_labelframe
                                                          , console=self.__w_console_inner_frame)
 
         # set checkbutton default check flag
@@ -0,0 +1,137 @@
+# -*- coding:utf-8 -*-
+import re
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional
+
+# my modules and packages
+from tkinter_console.log_console.frames.virtual_console import LogVirtualConsoleFrame
+from tkinter_console.utils.checkbuttonex import CheckButtonEx
+
+
+__all__ = ['LogSearchFrame']
+
+class LogSearchFrame(ttk.Frame):
+
+    def __init__(self, master, console: LogVirtualConsoleFrame, delay=200):
+        """ initializer
+
+        Notes:
+            The search runs 'delay' ms after the last key stroke,
+            and 'Return' / 'Shift-Return' jump to the next / previous match.
+            While the search is verified, the count is updated every 'delay' ms.
+
+        Args:
+            master : master (tk or ttk objects)
+            console: console frame
+            delay  : delay (ms) of the search after typing
+        """
+        super(LogSearchFrame, self).__init__(master=master)
+        self._console: LogVirtualConsoleFrame = console
+
+        self.__delay    = delay
+        self.__after_id = None
+        self.__count_id = None
+
+        self.__query_var = tk.StringVar()
+        self.__count_var = tk.StringVar()
+
+        # widgets
+        self.__w_entry       : Optional[ttk.Entry]     = None
+        self.__w_regex       : Optional[CheckButtonEx] = None
+        self.__w_ignore_case : Optional[CheckButtonEx] = None
+        self.__w_match_only  : Optional[CheckButtonEx] = None
+
+    @property
+    def entry(self) -> ttk.Entry:
+        """ ttk.Entry: query entry widget """
+        return self.__w_entry
+
+    def init(self):
+        """ initialization method
+
+        Returns:
+            LogSearchFrame: instance
+        """
+        self.__create_widgets()
+
+        # setting pack configure
+        self.pack_configure(fill=tk.X, expand=True)
+
+        return self
+
+    def search(self) -> None:
+        """ search with the current query and options """
+        self.__after_id = None
+        if self.__count_id is not None:
+            self.after_cancel(self.__count_id)
+            self.__count_id = None
+
+        try:
+            count = self._console.search(self.__query_var.get()
+                                         , regex=self.__w_regex.get()
+                                         , ignore_case=self.__w_ignore_case.get()
+                                         , match_only=self.__w_match_only.get())
+        except re.error:
+            self.__count_var.set('invalid')
+            return
+
+        self.__show_count(count)
+
+    def __show_count(self, count: Optional[int] = None) -> None:
+        """ show the count of matches, and update it while the search is verified """
+        self.__count_id = None
+        if count is None:
+            count = self._console.match_count
+
+        if not self.__query_var.get():
+            self.__count_var.set('')
+        elif self._console.search_pending:
+            self.__count_var.set('{} matches...'.format(count))
+            self.__count_id = self.after(self.__delay, self.__show_count)
+        else:
+            self.__count_var.set('{} matches'.format(count))
+
+    def __create_widgets(self) -> None:
+        """ create widgets """
+        self.__w_entry = ttk.Entry(self, textvariable=self.__query_var, width=40)
+        self.__w_entry.pack(side=tk.LEFT, padx=4, pady=2)
+
+        self.__w_entry.bind('<Return>'      , lambda e: self._console.next_match())
+        self.__w_entry.bind('<Shift-Return>', lambda e: self._console.prev_match())
+        self.__query_var.trace_add('write', self.__on_query_changed)
+
+        ttk.Button(self, text=u"▲", width=3
+                   , command=self._console.prev_match).pack(side=tk.LEFT)
+        ttk.Button(self, text=u"▼", width=3
+                   , command=self._console.next_match).pack(side=tk.LEFT)
+
+        self.__w_regex = CheckButtonEx(self, text='Regex', flag=False
+                                       , command=self.search)
+        self.__w_ignore_case = CheckButtonEx(self, text='Ignore case', flag=True
+                                             , command=self.search)
+        self.__w_match_only = CheckButtonEx(self, text='Only matching', flag=False
+                                            , command=self.__on_match_only)
+
+        for cb in (self.__w_regex, self.__w_ignore_case, self.__w_match_only):
+            cb.pack(side=tk.LEFT, padx=4, pady=2)
+
+        ttk.Label(self, textvariable=self.__count_var).pack(side=tk.LEFT, padx=4)
+
+    def __on_query_changed(self, *args) -> None:
+        """ search after the delay, it's reset by every key stroke """
+        if self.__after_id is not None:
+            self.after_cancel(self.__after_id)
+        self.__after_id = self.after(self.__delay, self.search)
+
+    def __on_match_only(self) -> None:
+        """ switch showing only matching records """
+        self._console.set_show_only_matching(self.__w_match_only.get())
+
+    def destroy(self):
+        for after_id in (self.__after_id, self.__count_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self.__after_id = None
+        self.__count_id = None
+        super(LogSearchFrame, self).destroy()
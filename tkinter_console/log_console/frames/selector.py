@@ -4,7 +4,7 @@ import tkinter as tk
 
 from tkinter import ttk
 from logging import (
-    Logger, getLevelName
+    Logger, getLevelName, NOTSET
 )
 
 # my modules and packages
@@ -16,9 +16,18 @@ __all__ = ['LogSelectorFrame']
 
 class LogSelectorFrame(ttk.Frame):
 
-    def __init__(self, master, console: LogConsoleFrame):
+    def __init__(self, master, console: LogConsoleFrame, discard_unchecked=False):
+        """ initializer
+
+        Args:
+            master           : master (tk or ttk objects)
+            console          : console frame
+            discard_unchecked: if True, records of unchecked levels are not retained,
+                                 so they can't be shown even if checked later
+        """
         super(LogSelectorFrame, self).__init__(master=master)
         self._console         : LogConsoleFrame = console
+        self._console.discard_hidden = discard_unchecked
 
         # add 'flag' key
         self._log_display_fmt : dict = {level: {'flag': True, **value}
@@ -27,6 +36,11 @@ class LogSelectorFrame(ttk.Frame):
 
         self.__checkbuttons = {}
 
+    @property
+    def checkbuttons(self) -> dict:
+        """ dict: {level: checkbutton} """
+        return dict(self.__checkbuttons)
+
     def init(self):
         """ initialization method
 
@@ -74,9 +88,10 @@ class LogSelectorFrame(ttk.Frame):
     def __create_button_widgets(self) -> None:
         """ create button widgets """
         logger       : Logger = self._console.logger
+        logger_level : int    = logger.level if logger is not None else NOTSET
         log_disp_fmt : dict   = {level: value
                                  for level, value in copy.deepcopy(self._log_display_fmt).items()
-                                 if level >= logger.level
+                                 if level >= logger_level
                                  }
 
         # create check buttons
@@ -94,20 +109,21 @@ class LogSelectorFrame(ttk.Frame):
 
     def __switch_callback(self):
         """ switch display a message, or not """
+        flags = {}
         for key, value in self._log_display_fmt.items():
 
             cb = self.__checkbuttons.get(key)
 
             # is True
             if cb and cb.get():
-                self.__switcher(key, False)
+                flags[key] = True
 
             # is False
             else:
-                self.__switcher(key, True)
+                flags[key] = False
 
-    def __switcher(self, tag, flag: bool):
-        self._console.scrolled_text_widget.tag_config(tag, elide=flag)
+        # switch all levels at once
+        self._console.set_levels_visible(flags)
 
 
 
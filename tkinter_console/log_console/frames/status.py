@@ -0,0 +1,54 @@
+# -*- coding:utf-8 -*-
+import tkinter as tk
+from tkinter import ttk
+
+# my modules and packages
+from tkinter_console.log_console.frames.console import LogConsoleFrame
+
+
+__all__ = ['LogStatusFrame']
+
+class LogStatusFrame(ttk.Frame):
+
+    def __init__(self, master, console: LogConsoleFrame, interval=1000):
+        """ initializer
+
+        Args:
+            master  : master (tk or ttk objects)
+            console : console frame
+            interval: update interval (ms)
+        """
+        super(LogStatusFrame, self).__init__(master=master)
+        self._console: LogConsoleFrame = console
+
+        self.__interval = interval
+        self.__after_id = None
+
+        self.__status_var = tk.StringVar()
+
+    def init(self):
+        """ initialization method
+
+        Returns:
+            LogStatusFrame: instance
+        """
+        ttk.Label(self, textvariable=self.__status_var
+                  , font='TkFixedFont').pack(side=tk.LEFT, padx=4)
+
+        self.update_status()
+
+        # setting pack configure
+        self.pack_configure(fill=tk.X)
+
+        return self
+
+    def update_status(self) -> None:
+        """ show the current stats of the console, and schedule the next update """
+        self.__status_var.set(str(self._console.stats.snapshot()))
+        self.__after_id = self.after(self.__interval, self.update_status)
+
+    def destroy(self):
+        if self.__after_id is not None:
+            self.after_cancel(self.__after_id)
+            self.__after_id = None
+        super(LogStatusFrame, self).destroy()
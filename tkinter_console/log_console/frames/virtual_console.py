@@ -0,0 +1,481 @@
+# -*- coding:utf-8 -*-
+import re
+import time
+import tkinter as tk
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from tkinter import font as tkfont
+from logging import Logger, NOTSET
+from typing import Optional
+
+# my modules and packages
+from tkinter_console.log_console.frames.console import LogConsoleFrame
+from tkinter_console.log_console.store.record_store import LogRecordStore
+
+
+__all__ = ['LogVirtualConsoleFrame']
+
+class LogVirtualConsoleFrame(LogConsoleFrame):
+    """ LogConsoleFrame backed by a compact record store
+
+    Records are kept in 'LogRecordStore' instead of the text widget,
+    and only the visible window (plus a small margin) is rendered into the widget.
+    The window is re-rendered on scroll, resize and new records,
+    so the view cost doesn't depend on the history size.
+
+    Records can be searched through the search index of the store,
+    without scanning the widget text. The candidates are verified
+    in time-budgeted ticks, so a large search doesn't block the mainloop.
+    """
+
+    # level of the synthetic "N records dropped" line in the store
+    DROPPED_LEVEL = NOTSET
+
+    # tag of the current match
+    SEARCH_TAG = 'search_current'
+
+    # max time (ms) spent per tick of verifying search candidates
+    SEARCH_MAX_TIME = 8
+
+    # max time (ms) spent per tick of building the level index of the store
+    INDEX_MAX_TIME = 8
+
+    def __init__(self, master, logger: Optional[Logger]
+                 , margin=10, store: Optional[LogRecordStore] = None
+                 , indexed=False
+                 , **kwargs):
+        """ initializer
+
+        Args:
+            master  : master (tk or ttk objects)
+            logger  : logger object, or None
+            margin  : number of records rendered below the visible window
+            store   : record store, if None, created from 'max_lines' and 'max_bytes'
+            indexed : index records of the created store for searching
+            **kwargs: kwargs of LogConsoleFrame
+                        'max_lines' is applied as the max records of the store
+        """
+        super(LogVirtualConsoleFrame, self).__init__(master, logger, **kwargs)
+
+        self._store = (store
+                       if store is not None
+                       else LogRecordStore(max_records=kwargs.get('max_lines')
+                                           , max_bytes=kwargs.get('max_bytes')
+                                           , indexed=indexed))
+
+        # window settings
+        self.__margin  = margin
+        self.__rows    = 1      # number of visible rows
+        self.__top_id  = 0      # id of the first rendered record
+        self.__follow  = True   # the window is at the bottom
+
+        # for coalescing
+        self.__last_key = None
+
+        # for tracebacks
+        #   {record id: (position of the marker, fingerprint)} of collapsed tracebacks in id order,
+        #   ids of records whose traceback is expanded, and the record id of each rendered line
+        self.__tracebacks: OrderedDict = OrderedDict()
+        self.__expanded  : set         = set()
+        self.__line_ids  : list        = []
+
+        # search settings
+        self.__current_match: Optional[int] = None      # id of the current match
+        self.__verify_id = None                          # after id of verifying
+        self.__index_id  = None                          # after id of building the level index
+        self._search_display_format = {'background': 'gray30'}
+
+    @property
+    def store(self) -> LogRecordStore:
+        """ LogRecordStore: record store """
+        return self._store
+
+    @property
+    def discarded_lines(self) -> int:
+        """ int: number of lines trimmed by 'max_lines' or 'max_bytes' """
+        return self._store.discarded_lines
+
+    @property
+    def match_count(self) -> int:
+        """ int: number of records matched by the search """
+        return len(self._store.matches)
+
+    @property
+    def search_pending(self) -> bool:
+        """ bool: the search is still verified, 'match_count' is partial """
+        return self._store.pending
+
+    @property
+    def current_match(self) -> Optional[int]:
+        """ int | None: id of the current match """
+        return self.__current_match
+
+    def init(self):
+        """ initialization method
+
+        Returns:
+            LogVirtualConsoleFrame: instance
+        """
+        super(LogVirtualConsoleFrame, self).init()
+
+        widget = self._scrolled_text_widget
+
+        # the scrollbar is driven by the store, not by the widget
+        widget.configure(yscrollcommand='')
+        widget.vbar_y.configure(command=self.__on_scrollbar)
+
+        # bind scroll and resize
+        widget.bind('<MouseWheel>', self.__on_mousewheel)
+        widget.bind('<Button-4>'  , lambda e: self.__scroll(-3))
+        widget.bind('<Button-5>'  , lambda e: self.__scroll(3))
+        widget.bind('<Configure>' , self.__on_configure)
+
+        widget.tag_config(self.SEARCH_TAG, **self._search_display_format)
+
+        self.render()
+
+        return self
+
+    def set_levels_visible(self, flags: dict) -> None:
+        """ show or hide records of the levels at once, it's used by 'LogSelectorFrame'
+
+        The view is rebuilt from the per-level index of the store,
+        and only the visible window is rendered.
+        If the level index of the store is not built yet (e.g. 'MappedLogStore'),
+        it's built in time-budgeted ticks, and the filter is applied after that.
+
+        Args:
+            flags: {level: flag}
+        """
+        for level, flag in flags.items():
+            if flag:
+                self._hidden_levels.discard(level)
+            else:
+                self._hidden_levels.add(level)
+
+        self._store.set_hidden_levels(self._hidden_levels)
+        self.render()
+
+        if self._store.levels_pending and self.__index_id is None:
+            self.__index_id = self.after(1, self.__index_levels)
+
+    def __index_levels(self) -> None:
+        """ build the level index of the store within the budget, and carry over the rest """
+        self.__index_id = None
+        if self._store.index_levels(deadline=time.perf_counter() + self.INDEX_MAX_TIME / 1000):
+            self.__index_id = self.after(1, self.__index_levels)
+        else:
+            self.render()
+
+    def search(self, query: str, regex=False, ignore_case=True, match_only=False) -> int:
+        """ search records, the matches are kept up to date while records are appended
+
+        Args:
+            query      : text or regular expression, if empty, the search is cleared
+            regex      : treat 'query' as a regular expression
+            ignore_case: ignore case
+            match_only : show only matching records
+
+        Returns:
+            int: number of matched records, partial while 'search_pending'
+
+        Raises:
+            re.error: if 'query' is an invalid regular expression
+        """
+        if not query:
+            self.clear_search()
+            return 0
+
+        pattern = re.compile(query if regex else re.escape(query)
+                             , re.IGNORECASE if ignore_case else 0)
+
+        self.__cancel_verifying()
+        self.__current_match = None
+        self._store.set_match(pattern, match_only=match_only, incremental=True)
+        self.__verify_matches()
+
+        return self.match_count
+
+    def clear_search(self) -> None:
+        """ clear the search, and show all records """
+        self.__cancel_verifying()
+        self.__current_match = None
+        self._store.set_match(None)
+        self.render()
+
+    def __verify_matches(self) -> None:
+        """ verify candidates of the search within the budget, and carry over the rest """
+        self.__verify_id = None
+        self._store.verify(max_records=None
+                          , deadline=time.perf_counter() + self.SEARCH_MAX_TIME / 1000)
+        self.render()
+
+        if self._store.pending:
+            self.__verify_id = self.after(1, self.__verify_matches)
+
+    def __cancel_verifying(self) -> None:
+        """ cancel verifying of the previous search """
+        if self.__verify_id is not None:
+            self.after_cancel(self.__verify_id)
+            self.__verify_id = None
+
+    def destroy(self):
+        """ destroy the widget, and cancel verifying and building the level index """
+        self.__cancel_verifying()
+        if self.__index_id is not None:
+            self.after_cancel(self.__index_id)
+            self.__index_id = None
+        super(LogVirtualConsoleFrame, self).destroy()
+
+    def set_show_only_matching(self, flag: bool) -> None:
+        """ show only matching records, or all records """
+        self._store.set_match_only(flag)
+        self.render()
+
+    def next_match(self) -> Optional[int]:
+        """ jump to the next match
+
+        Returns:
+            int | None: id of the match, None if no match
+        """
+        return self.__jump_to_match(forward=True)
+
+    def prev_match(self) -> Optional[int]:
+        """ jump to the previous match
+
+        Returns:
+            int | None: id of the match, None if no match
+        """
+        return self.__jump_to_match(forward=False)
+
+    def __jump_to_match(self, forward: bool) -> Optional[int]:
+        """ jump to the next or previous match of visible levels, it wraps around """
+        store   = self._store
+        matches = store.matches
+        if not matches:
+            return None
+
+        n = len(matches)
+        current = self.__current_match
+        if current is None:
+            # start from the top of the window
+            current = self.__top_id - 1 if forward else self.__top_id
+
+        i = bisect_right(matches, current) if forward else bisect_left(matches, current) - 1
+
+        for k in range(n):
+            record_id = matches[(i + k) % n if forward else (i - k) % n]
+            if store.level(record_id) not in self._hidden_levels:
+                break
+        else:
+            return None
+
+        self.__current_match = record_id
+        self.__scroll_to(store.view_index(record_id) - self.__rows // 2)
+
+        return record_id
+
+    def toggle_traceback(self, line: int) -> bool:
+        """ expand or collapse the traceback of the record at the line
+
+        The expanded records are remembered, and the traceback is rendered after the summary.
+
+        Args:
+            line: line number in the widget
+
+        Returns:
+            bool: True if the record is a summary
+        """
+        if not 0 < line <= len(self.__line_ids):
+            return False
+
+        record_id = self.__line_ids[line - 1]
+        if record_id not in self.__tracebacks:
+            return False
+
+        if record_id in self.__expanded:
+            self.__expanded.discard(record_id)
+        else:
+            self.__expanded.add(record_id)
+
+        self.render()
+        return True
+
+    def _display_entries(self, entries: list, dropped: int) -> None:
+        """ append entries into the store, and render the window """
+        store = self._store
+
+        if dropped:
+            store.append(self.DROPPED_LEVEL, self._dropped_text(dropped).rstrip('\n'))
+            self.__last_key = None
+
+        appended = 0
+        for entry in entries:
+            if self.discard_hidden and entry.levelno in self._hidden_levels:
+                continue
+
+            key = (entry.levelno, entry.message) if self.coalesce else None
+            if key is not None and key == self.__last_key:
+                store.repeat_last()
+            elif entry.exc_text and self.collapse_tracebacks:
+                text, marker, fingerprint = self._traceback_summary(entry)
+                record_id = store.append(entry.levelno, text, entry.created)
+                self.__tracebacks[record_id] = (marker, fingerprint)
+                self.__last_key = key
+                appended += 1
+            else:
+                store.append(entry.levelno, entry.full_text, entry.created)
+                self.__last_key = key
+                appended += 1
+
+        # the window is scrolled away, let the user know new records
+        if self.auto_scroll and not self.__follow and appended:
+            self._update_new_lines_indicator(self.new_lines + appended)
+
+        self.render()
+
+    def render(self) -> None:
+        """ render the visible window of the store into the widget """
+        store  = self._store
+        widget = self._scrolled_text_widget
+        total  = store.view_len()
+        bottom = max(0, total - self.__rows)
+
+        if self.auto_scroll and self.__follow:
+            start = bottom
+        else:
+            start = min(store.view_index(self.__top_id), bottom)
+
+        ids = store.view_ids(start, start + self.__rows + self.__margin)
+        self.__top_id = ids[0] if len(ids) else store.next_id
+
+        # drop tracebacks of trimmed records, they are trimmed from the oldest
+        tracebacks = self.__tracebacks
+        while tracebacks and next(iter(tracebacks)) not in store:
+            tracebacks.popitem(last=False)
+        if self.__expanded:
+            self.__expanded = {i for i in self.__expanded if i in store}
+
+        # build 'insert' args, consecutive records of the same level are merged
+        chunks   = []
+        texts    = []
+        tag      = None
+        line_ids = []
+        for record_id in ids:
+            level = store.level(record_id)
+            line_tag = (self._dropped_tag if level == self.DROPPED_LEVEL else str(level),)
+
+            record_text = store.text(record_id)
+            summary     = tracebacks.get(record_id)
+            body        = None
+
+            # the summary of a collapsed traceback is clickable
+            if summary is not None:
+                line_tag += (self._traceback_tag,)
+                if record_id in self.__expanded:
+                    i, fingerprint = summary
+                    record_text = record_text[:i] + '-' + record_text[i + 1:]
+                    body = (self.traceback_store.get(fingerprint) or '[traceback is evicted]')
+                    body = body.rstrip('\n') + '\n'
+
+            if line_tag != tag and texts:
+                chunks.extend(("".join(texts), tag))
+                texts = []
+            tag = line_tag
+
+            repeats = store.repeats(record_id)
+            suffix  = (self._repeat_suffix(repeats) if repeats else '') + '\n'
+            text    = record_text + suffix
+            line_ids.extend([record_id] * text.count('\n'))
+
+            # the current match is inserted with the search tag,
+            # and highlighted segments are inserted with their tags
+            segments = self._highlight(record_text)
+            if record_id == self.__current_match or segments:
+                if texts:
+                    chunks.extend(("".join(texts), tag))
+                    texts = []
+
+                line_tags = tag + (self.SEARCH_TAG,) if record_id == self.__current_match else tag
+                for segment, segment_tags in (segments or ((record_text, ()),)):
+                    chunks.extend((segment, line_tags + segment_tags))
+                chunks.extend((suffix, line_tags))
+            else:
+                texts.append(text)
+
+            # the expanded traceback follows the summary
+            if body is not None:
+                chunks.extend(("".join(texts), tag
+                               , body, line_tag[:1] + (self._traceback_body_tag,)))
+                texts = []
+                line_ids.extend([record_id] * body.count('\n'))
+
+        if texts:
+            chunks.extend(("".join(texts), tag))
+
+        self.__line_ids = line_ids
+
+        widget.configure(state='normal')
+        widget.delete('1.0', tk.END)
+        if chunks:
+            widget.insert(tk.END, *chunks)
+        widget.configure(state='disabled')
+
+        # update the scrollbar
+        if total:
+            widget.vbar_y.set(start / total, min(1.0, (start + self.__rows) / total))
+        else:
+            widget.vbar_y.set(0.0, 1.0)
+
+    def __scroll_to(self, start: int) -> None:
+        """ scroll the window to the position in the view """
+        store  = self._store
+        total  = store.view_len()
+        bottom = max(0, total - self.__rows)
+        start  = max(0, min(start, bottom))
+
+        ids = store.view_ids(start, start + 1)
+        self.__top_id = ids[0] if len(ids) else store.next_id
+        self.__follow = start >= bottom
+
+        if self.__follow:
+            self._set_at_bottom(True)
+
+        self.render()
+
+    def scroll_to_end(self) -> None:
+        """ scroll to the bottom, and resume autoscroll """
+        self.__scroll_to(self._store.view_len())
+
+    def __scroll(self, n: int):
+        """ scroll 'n' rows """
+        self.__scroll_to(self._store.view_index(self.__top_id) + n)
+        return 'break'
+
+    def __on_scrollbar(self, *args):
+        """ for the scrollbar command """
+        if args[0] == tk.MOVETO:
+            self.__scroll_to(int(float(args[1]) * self._store.view_len()))
+
+        elif args[0] == tk.SCROLL:
+            n = int(args[1])
+            if args[2] == tk.PAGES:
+                n *= self.__rows
+            self.__scroll(n)
+
+    def __on_mousewheel(self, event):
+        """ for the mousewheel event (Windows and macOS) """
+        # Windows sends multiples of 120, macOS sends small deltas
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.__scroll(-3 * delta)
+
+    def __on_configure(self, event):
+        """ recompute the visible rows on resize """
+        widget    = self._scrolled_text_widget
+        linespace = tkfont.Font(font=widget.cget('font')).metrics('linespace')
+        rows      = max(1, event.height // max(1, linespace))
+
+        if rows != self.__rows:
+            self.__rows = rows
+            self.render()
+
@@ -0,0 +1,244 @@
+# -*- coding:utf-8 -*-
+import logging
+import os
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+# my modules and packages
+from tkinter_console.log_console.handler.queue_handler import LogEntry, QueueHandler
+
+__all__ = ['LevelParser', 'LineFeeder', 'FileFollower']
+
+
+class LevelParser:
+    """ Map a line of a log file to a level
+
+    The first level name found in the head of the line is used,
+    e.g. "2024-01-01 12:00:00 [ERROR] failed" is ERROR.
+    Lines without a level name (e.g. lines of a traceback) are continuation lines,
+    and 'None' is returned, so that the level of the previous line is used.
+    """
+
+    DEFAULT_LEVELS = {
+        'DEBUG'     : logging.DEBUG
+        , 'INFO'    : logging.INFO
+        , 'WARN'    : logging.WARNING
+        , 'WARNING' : logging.WARNING
+        , 'ERROR'   : logging.ERROR
+        , 'CRITICAL': logging.CRITICAL
+        , 'FATAL'   : logging.CRITICAL
+    }
+
+    def __init__(self, levels: Optional[dict] = None, head=200):
+        """ initializer
+
+        Args:
+            levels: {level name: level}, if None, 'DEFAULT_LEVELS' is used
+            head  : number of characters searched from the head of the line
+        """
+        self.levels = dict(levels or self.DEFAULT_LEVELS)
+        self.head   = head
+
+        names = sorted(self.levels, key=len, reverse=True)
+        self.__pattern = re.compile(r'\b({})\b'.format('|'.join(map(re.escape, names)))
+                                    , re.IGNORECASE)
+        self.__upper   = {name.upper(): level for name, level in self.levels.items()}
+
+    def __call__(self, line: str) -> Optional[int]:
+        match = self.__pattern.search(line, 0, self.head)
+        return self.__upper[match.group(1).upper()] if match else None
+
+
+class LineFeeder:
+    """ Split data into lines, map them to levels, and put them into the queue
+
+    Complete lines are put through 'QueueHandler.enqueue' as a batch,
+    and the incomplete last line is kept until the rest is fed.
+    Continuation lines (the parser returns None) inherit the level of the previous line.
+    """
+
+    def __init__(self, handler: QueueHandler
+                 , parser: Optional[Callable[[str], Optional[int]]] = None
+                 , default_level=logging.INFO, name=''
+                 , encoding='utf-8', errors='replace'):
+        """ initializer
+
+        Args:
+            handler      : queue handler of the console
+            parser       : callable which returns a level of a line, or None for continuation lines,
+                             if None, 'LevelParser' is used
+            default_level: level of lines before the first line with a level
+            name         : logger name of the entries
+            encoding     : encoding of the data
+            errors       : error handler of decoding
+        """
+        self.handler  = handler
+        self.parser   = parser if parser is not None else LevelParser()
+        self.name     = name
+        self.encoding = encoding
+        self.errors   = errors
+
+        self.__level   = default_level
+        self.__pending = b''
+
+    @property
+    def pending(self) -> bytes:
+        """ bytes: the incomplete last line """
+        return self.__pending
+
+    def feed(self, data: bytes, flush=False) -> int:
+        """ put complete lines into the queue
+
+        Args:
+            data : data following the incomplete last line
+            flush: put the incomplete last line too
+
+        Returns:
+            int: number of put lines
+        """
+        lines = (self.__pending + data).split(b'\n')
+        rest  = lines.pop()
+        if flush and rest:
+            lines.append(rest)
+            rest = b''
+        self.__pending = rest
+
+        if not lines:
+            return 0
+
+        now     = time.time()
+        entries = []
+        for raw in lines:
+            line  = raw.decode(self.encoding, self.errors).rstrip('\r')
+            level = self.parser(line)
+            if level is not None:
+                self.__level = level
+
+            entries.append(LogEntry(self.__level, line, now, self.name, line))
+
+        self.handler.enqueue(entries)
+
+        return len(entries)
+
+
+class FileFollower:
+    """ Follow a log file like 'tail -F'
+
+    A background thread reads new data in large chunks,
+    and puts them into the console's queue through 'LineFeeder'.
+
+    Rotation (the path refers to a new file) and truncation (the file gets smaller)
+    are detected, and the file is read again from the head.
+    The file may not exist yet, it's opened when it's created.
+    """
+
+    def __init__(self, path: str, handler: QueueHandler
+                 , parser: Optional[Callable[[str], Optional[int]]] = None
+                 , default_level=logging.INFO
+                 , from_end=True
+                 , chunk_size=1 << 20, poll_interval=0.25
+                 , encoding='utf-8', errors='replace'):
+        """ initializer
+
+        Args:
+            path         : path of the log file
+            handler      : queue handler of the console
+            parser       : callable which returns a level of a line, or None for continuation lines,
+                             if None, 'LevelParser' is used
+            default_level: level of lines before the first line with a level
+            from_end     : start from the end of the file, otherwise from the head
+            chunk_size   : max bytes read at once
+            poll_interval: interval (sec) for checking the file while there is no new data
+            encoding     : encoding of the file
+            errors       : error handler of decoding
+        """
+        self.path          = path
+        self.handler       = handler
+        self.parser        = parser if parser is not None else LevelParser()
+        self.default_level = default_level
+        self.from_end      = from_end
+        self.chunk_size    = chunk_size
+        self.poll_interval = poll_interval
+        self.encoding      = encoding
+        self.errors        = errors
+
+        self.__name   = os.path.basename(path)
+        self.__stop   = threading.Event()
+        self.__thread : Optional[threading.Thread] = None
+
+    def start(self):
+        """ start following
+
+        Returns:
+            FileFollower: instance
+        """
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+        return self
+
+    def stop(self, timeout=1.0) -> None:
+        """ stop following """
+        if self.__thread:
+            self.__stop.set()
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __open(self, from_end: bool):
+        """ open the file, return None if it doesn't exist """
+        try:
+            fd = open(self.path, mode='rb')
+        except OSError:
+            return None
+
+        if from_end:
+            fd.seek(0, os.SEEK_END)
+        return fd
+
+    def __run(self):
+        """ for following thread """
+        fd     = self.__open(self.from_end)
+        feeder = LineFeeder(self.handler, self.parser, self.default_level, self.__name
+                            , self.encoding, self.errors)
+
+        try:
+            while not self.__stop.is_set():
+                if fd is None:
+                    # wait for the file to be created, and read it from the head
+                    if self.__stop.wait(self.poll_interval):
+                        break
+                    fd = self.__open(from_end=False)
+                    continue
+
+                data = fd.read(self.chunk_size)
+                if data:
+                    feeder.feed(data)
+                    continue
+
+                # no new data, check rotation and truncation
+                if self.__stop.wait(self.poll_interval):
+                    break
+
+                try:
+                    st = os.stat(self.path)
+                except OSError:
+                    # removed, keep the current file until a new one is created
+                    continue
+
+                fst = os.fstat(fd.fileno())
+                if (st.st_ino, st.st_dev) != (fst.st_ino, fst.st_dev):
+                    # rotated, read the rest of the old file, and switch to the new one
+                    feeder.feed(fd.read(), flush=True)
+                    fd.close()
+                    fd = self.__open(from_end=False)
+
+                elif st.st_size < fd.tell():
+                    # truncated
+                    feeder.feed(b'', flush=True)
+                    fd.seek(0)
+        finally:
+            if fd is not None:
+                fd.close()
@@ -0,0 +1,137 @@
+# -*- coding:utf-8 -*-
+import logging
+import threading
+from typing import Optional
+
+# my modules and packages
+from tkinter_console.log_console.handler.queue_handler import LogEntry, QueueHandler
+
+__all__ = ['ProcessQueueHandler', 'ProcessQueueListener']
+
+
+class ProcessQueueHandler(logging.Handler):
+    """ Class to send logging records from child processes
+
+    Records are formatted in the child process,
+    and sent as a list of 'LogEntry' to a multiprocessing queue,
+    so that the IPC is done per batch, not per record.
+
+    Notes:
+        The buffer is flushed when 'batch_size' records are buffered,
+        every 'flush_interval' sec, and when the handler is closed.
+        Pool workers may exit without closing handlers,
+        so records in the last 'flush_interval' sec can be lost in that case.
+
+    Examples:
+        >> def initializer(mp_queue):
+        >>   logger = getLogger()
+        >>   logger.addHandler(ProcessQueueHandler(mp_queue))
+        >>
+        >> pool = multiprocessing.Pool(initializer=initializer, initargs=(mp_queue,))
+    """
+
+    def __init__(self, mp_queue, batch_size=100, flush_interval=0.1):
+        """ initializer
+
+        Args:
+            mp_queue      : multiprocessing queue
+            batch_size    : max records sent at once
+            flush_interval: interval (sec) for flushing the buffer
+        """
+        super(ProcessQueueHandler, self).__init__()
+        self.mp_queue       = mp_queue
+        self.batch_size     = batch_size
+        self.flush_interval = flush_interval
+
+        self.__buffer      = []
+        self.__buffer_lock = threading.Lock()
+
+        # flush the buffer periodically
+        self.__closed  = threading.Event()
+        self.__flusher = threading.Thread(target=self.__run_flusher, daemon=True)
+        self.__flusher.start()
+
+    def __run_flusher(self):
+        """ for flushing thread """
+        while not self.__closed.wait(self.flush_interval):
+            self.flush()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            entry = LogEntry.from_record(record, self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self.__buffer_lock:
+            self.__buffer.append(entry)
+            full = len(self.__buffer) >= self.batch_size
+
+        if full:
+            self.flush()
+
+    def flush(self):
+        """ send the buffered records as a batch """
+        with self.__buffer_lock:
+            batch, self.__buffer = self.__buffer, []
+
+        if batch:
+            self.mp_queue.put(batch)
+
+    def close(self):
+        self.__closed.set()
+        self.flush()
+        super(ProcessQueueHandler, self).close()
+
+
+class ProcessQueueListener:
+    """ Class to receive batches from 'ProcessQueueHandler'
+
+    A background thread gets batches from the multiprocessing queue,
+    and puts them into the console's queue through 'QueueHandler.enqueue'.
+    """
+
+    def __init__(self, mp_queue, handler: QueueHandler):
+        """ initializer
+
+        Args:
+            mp_queue: multiprocessing queue, shared with 'ProcessQueueHandler'
+            handler : queue handler of the console
+        """
+        self.mp_queue = mp_queue
+        self.handler  = handler
+
+        self.__thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """ start listening
+
+        Returns:
+            ProcessQueueListener: instance
+        """
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+        return self
+
+    def stop(self, timeout=1.0) -> None:
+        """ stop listening """
+        if self.__thread:
+            # the sentinel
+            self.mp_queue.put(None)
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __run(self):
+        """ for listening thread """
+        while True:
+            try:
+                batch = self.mp_queue.get()
+            except (EOFError, OSError):
+                break
+
+            if batch is None:
+                break
+
+            self.handler.enqueue(batch)
+
@@ -1,8 +1,61 @@
 # -*- coding:utf-8 -*-
 import logging
 import queue
+import threading
+from collections import Counter
+from typing import Optional, NamedTuple
+
+# my modules and packages
+from tkinter_console.log_console.handler.wakeup import PipeWaker
+
+__all__ = ['LogEntry', 'QueueHandler'
+           , 'DROP_NEWEST', 'DROP_OLDEST', 'BLOCK', 'SAMPLE']
+
+# overload policies, used when the queue is bounded
+DROP_NEWEST = 'drop-newest'
+DROP_OLDEST = 'drop-oldest'
+BLOCK       = 'block'
+SAMPLE      = 'sample'
+
+
+class LogEntry(NamedTuple):
+    """ compact render payload of a log record
+
+    It doesn't refer the record's 'args' and 'exc_info',
+    so that large user objects are released right away.
+    The formatted traceback is split out of 'text' into 'exc_text'.
+    """
+    levelno : int
+    text    : str
+    created : float
+    name    : str
+    message : str
+    exc_text: str = ''
+
+    @property
+    def full_text(self) -> str:
+        """ str: text with the traceback """
+        return self.text + '\n' + self.exc_text if self.exc_text else self.text
+
+    @classmethod
+    def from_record(cls, record: logging.LogRecord, text: str):
+        """ make a 'LogEntry' from a record and its formatted text """
+        # 'message' and 'exc_text' are set by 'Formatter.format'
+        message = record.__dict__.get('message')
+        if message is None:
+            message = record.getMessage()
+
+        # split the traceback (and the stack info after it) out of the text
+        exc_text = record.exc_text or ''
+        if exc_text:
+            i = text.find('\n' + exc_text)
+            if i >= 0:
+                text, exc_text = text[:i], text[i + 1:]
+            else:
+                exc_text = ''
+
+        return cls(record.levelno, text, record.created, record.name, message, exc_text)
 
-__all__ = ['QueueHandler']
 
 class QueueHandler(logging.Handler):
     """Class to send logging records to a queue
@@ -14,11 +67,160 @@ class QueueHandler(logging.Handler):
     # (https://stackoverflow.com/questions/13318742/python-logging-to-tkinter-text-widget) is not thread safe!
     # See https://stackoverflow.com/questions/43909849/tkinter-python-crashes-on-new-thread-trying-to-log-on-main-thread
 
-    def __init__(self, log_queue: queue.Queue):
+    def __init__(self, log_queue: queue.Queue
+                 , waker: Optional[PipeWaker] = None
+                 , preformat=False
+                 , policy=DROP_NEWEST, block_timeout=0.1, sample_rate=10):
+        """ initializer
+
+        Notes:
+            If the queue is bounded ('maxsize' > 0), the overload policy is used.
+              - DROP_NEWEST: drop the emitted record
+              - DROP_OLDEST: drop the oldest record in the queue
+              - BLOCK      : wait for a free slot up to 'block_timeout' sec, and drop it
+                             (on the main thread, it's DROP_NEWEST, because the mainloop
+                              which drains the queue can't run while waiting)
+              - SAMPLE     : over the half of the queue, keep 1 in 'sample_rate' records per level,
+                             and drop it if the queue is still full
+            Dropped records are counted per level.
+
+            The handler can be attached to several loggers, e.g. 'app' and 'app.db'.
+            A record propagated through them is put only once,
+            it's marked by the handler when it's put.
+
+        Args:
+            log_queue    : queue
+            waker        : if set, the mainloop is woken up after putting a record
+            preformat    : if True, format a record on the emitting thread
+                             and put a 'LogEntry' instead of the record
+            policy       : overload policy
+            block_timeout: timeout (sec) for BLOCK
+            sample_rate  : N of 1-in-N for SAMPLE
+
+        Raises:
+            ValueError: if the policy is unknown
+        """
         super(QueueHandler, self).__init__()
+
+        if policy not in (DROP_NEWEST, DROP_OLDEST, BLOCK, SAMPLE):
+            raise ValueError("[!!] unknown policy - {}".format(policy))
+
         self.log_queue = log_queue
+        self.waker     = waker
+        self.preformat = preformat
+
+        # overload settings
+        self.policy        = policy
+        self.block_timeout = block_timeout
+        self.sample_rate   = sample_rate
+
+        self.__sampled      = Counter()
+        self.__dropped      = Counter()     # total per level
+        self.__dropped_new  = 0             # since the last 'pop_dropped'
+        self.__dropped_lock = threading.Lock()
+
+        # attribute of records put by this handler
+        self.__marker = '_queued_by_{:x}'.format(id(self))
+
+    @property
+    def dropped(self) -> dict:
+        """ dict: number of dropped records per level """
+        with self.__dropped_lock:
+            return dict(self.__dropped)
+
+    def pop_dropped(self) -> int:
+        """ return the number of records dropped since the last call """
+        with self.__dropped_lock:
+            n, self.__dropped_new = self.__dropped_new, 0
+        return n
+
+    def __drop(self, levelno: int) -> None:
+        """ count a dropped record """
+        with self.__dropped_lock:
+            self.__dropped[levelno] += 1
+            self.__dropped_new      += 1
+
+    def __put(self, item, levelno: int) -> bool:
+        """ put an item with the overload policy
+
+        Returns:
+            bool: True if the item is put
+        """
+        maxsize = self.log_queue.maxsize
+
+        # unbounded
+        if maxsize <= 0:
+            self.log_queue.put(item)
+            return True
+
+        # the mainloop is the consumer, so the main thread must not wait for it
+        if self.policy == BLOCK and threading.current_thread() is not threading.main_thread():
+            try:
+                self.log_queue.put(item, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                self.__drop(levelno)
+                return False
+
+        if self.policy == SAMPLE and self.log_queue.qsize() >= maxsize // 2:
+            self.__sampled[levelno] += 1
+            if self.__sampled[levelno] % self.sample_rate != 0:
+                self.__drop(levelno)
+                return False
+
+        try:
+            self.log_queue.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+
+        # make a room by dropping the oldest, and retry once
+        if self.policy == DROP_OLDEST:
+            try:
+                self.__drop(self.log_queue.get_nowait().levelno)
+            except queue.Empty:
+                pass
+
+            try:
+                self.log_queue.put_nowait(item)
+                return True
+            except queue.Full:
+                pass
+
+        self.__drop(levelno)
+        return False
+
+    def make_entry(self, record: logging.LogRecord) -> LogEntry:
+        """ format a record and make a 'LogEntry' """
+        return LogEntry.from_record(record, self.format(record))
+
+    def enqueue(self, entries: list) -> None:
+        """ put entries made outside of the handler, and wake up the mainloop once
+
+        It's used for records from other processes or sources.
+        """
+        put = False
+        for entry in entries:
+            put = self.__put(entry, entry.levelno) or put
+
+        if put and self.waker:
+            self.waker.notify()
 
     def emit(self, record: logging.LogRecord):
-        self.log_queue.put(record)
+        # already put through a descendant logger
+        if record.__dict__.get(self.__marker):
+            return
+        record.__dict__[self.__marker] = True
+
+        try:
+            put = self.__put(self.make_entry(record) if self.preformat else record
+                             , record.levelno)
+
+        except Exception:
+            self.handleError(record)
+            return
+
+        if put and self.waker:
+            self.waker.notify()
 
 
@@ -0,0 +1,134 @@
+# -*- coding:utf-8 -*-
+import time
+from typing import Optional
+
+__all__ = ['DrainScheduler']
+
+
+class DrainScheduler:
+    """ Shared drain loop for many consoles
+
+    One 'after' loop services all registered consoles,
+    instead of a polling loop per console.
+    Each tick has a global budget of records and time, and it's shared in round-robin.
+    Each console gets a fair share of the budget at first, the rest is passed to consoles
+    which still have a backlog, and the console served first is rotated every tick,
+    so that a busy console can't starve the others.
+
+    The polling interval is adapted to the traffic of all consoles,
+    in the same way as 'LogConsoleFrame'.
+    """
+
+    def __init__(self, master
+                 , max_records=2000, max_time=16
+                 , poll_interval_min=10, poll_interval_max=1000):
+        """ initializer
+
+        Args:
+            master           : master (tk or ttk objects), it runs the 'after' loop
+            max_records      : max records displayed per tick, by all consoles
+            max_time         : max time (ms) spent per tick, by all consoles
+            poll_interval_min: min polling interval (ms)
+            poll_interval_max: max polling interval (ms)
+        """
+        self.master = master
+
+        self.max_records = max_records
+        self.max_time    = max_time
+
+        self.__poll_interval_min = poll_interval_min
+        self.__poll_interval_max = poll_interval_max
+        self.__poll_interval     = poll_interval_min
+
+        self.__consoles: list = []
+        self.__next     = 0         # index of the console served first
+        self.__after_id : Optional[str] = None
+
+    @property
+    def consoles(self) -> list:
+        """ list: registered consoles """
+        return list(self.__consoles)
+
+    @property
+    def poll_interval(self) -> int:
+        """ int: current polling interval (ms) """
+        return self.__poll_interval
+
+    def register(self, console) -> None:
+        """ register a console, the loop is started by the first console """
+        if console in self.__consoles:
+            return
+
+        self.__consoles.append(console)
+        self.__wakeup()
+
+    def unregister(self, console) -> None:
+        """ unregister a console, the loop is stopped by the last console """
+        if console not in self.__consoles:
+            return
+
+        self.__consoles.remove(console)
+        if not self.__consoles and self.__after_id is not None:
+            self.master.after_cancel(self.__after_id)
+            self.__after_id = None
+
+    def __wakeup(self) -> None:
+        """ poll at the fast cadence from now """
+        self.__poll_interval = self.__poll_interval_min
+        if self.__after_id is not None:
+            self.master.after_cancel(self.__after_id)
+        self.__after_id = self.master.after(self.__poll_interval, self.__tick)
+
+    def tick(self) -> int:
+        """ drain the consoles within the global budget
+
+        Returns:
+            int: number of displayed records
+        """
+        consoles = self.__consoles
+        if not consoles:
+            return 0
+
+        deadline = time.perf_counter() + self.max_time / 1000
+        budget   = self.max_records
+        drained  = 0
+
+        # rotate the console served first
+        n     = len(consoles)
+        start = self.__next % n
+        self.__next = (start + 1) % n
+
+        # share the budget fairly, and pass the rest to consoles which still have a backlog
+        order = [consoles[(start + i) % n] for i in range(n)]
+        while order:
+            pending = []
+            for i, console in enumerate(order):
+                if budget <= 0 or time.perf_counter() >= deadline:
+                    return drained
+
+                share    = max(1, budget // (len(order) - i))
+                count    = console.drain(max_records=share, deadline=deadline)
+                budget  -= count
+                drained += count
+
+                # a console may drain less than the share (e.g. the first batch is small for measuring),
+                #   so any console which drained something and still has a backlog gets the rest
+                if count and console.backlog:
+                    pending.append(console)
+            order = pending
+
+        return drained
+
+    def __tick(self) -> None:
+        """ for polling method """
+        if self.tick() > 0:
+            # records are flowing, snap down to the fast cadence
+            self.__poll_interval = self.__poll_interval_min
+        else:
+            # the queues are empty, back off exponentially
+            self.__poll_interval = min(self.__poll_interval * 2, self.__poll_interval_max)
+
+        # if records are left, come back as soon as possible
+        backlog = any(console.backlog for console in self.__consoles)
+        delay   = 1 if backlog else self.__poll_interval
+        self.__after_id = self.master.after(delay, self.__tick)
@@ -0,0 +1,146 @@
+# -*- coding:utf-8 -*-
+import io
+import logging
+import logging.handlers
+import pickle
+import socketserver
+import struct
+import threading
+from typing import Optional
+
+# my modules and packages
+from tkinter_console.log_console.handler.queue_handler import QueueHandler
+
+__all__ = ['SocketListener']
+
+
+class _RecordUnpickler(pickle.Unpickler):
+    """ unpickler of records sent by 'logging.handlers.SocketHandler'
+
+    'SocketHandler' pickles the record's dict of primitive values,
+    so any global (class or function) is refused.
+    """
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError("[!!] global is not allowed - {}.{}".format(module, name))
+
+
+class _RecordStreamHandler(socketserver.BaseRequestHandler):
+    """ handler of a connection, it reads length-prefixed pickled records
+
+    Records received by one 'recv' are put at once.
+    """
+
+    def handle(self):
+        listener: SocketListener = self.server.listener
+        handler  = listener.handler
+        buffer   = bytearray()
+
+        while True:
+            try:
+                data = self.request.recv(listener.chunk_size)
+            except OSError:
+                break
+            if not data:
+                break
+            buffer += data
+
+            # unpickle complete records
+            entries = []
+            pos     = 0
+            while len(buffer) - pos >= 4:
+                size = struct.unpack_from('>L', buffer, pos)[0]
+                if len(buffer) - pos - 4 < size:
+                    break
+
+                try:
+                    state = _RecordUnpickler(io.BytesIO(buffer[pos + 4:pos + 4 + size])).load()
+                    record = logging.makeLogRecord(state)
+                except Exception:
+                    # broken stream, drop the connection
+                    return
+                pos += 4 + size
+
+                if record.levelno >= listener.level:
+                    entries.append(handler.make_entry(record))
+
+            del buffer[:pos]
+
+            if entries:
+                handler.enqueue(entries)
+
+
+class _RecordServer(socketserver.ThreadingTCPServer):
+    daemon_threads      = True
+    allow_reuse_address = True
+
+
+class SocketListener:
+    """ Receive records from 'logging.handlers.SocketHandler' of other processes
+
+    A TCP server is run on a background thread, and each connection is read on its own thread.
+    Records are unpickled (only primitive values are allowed), formatted by the console's handler,
+    and put into the console's queue through 'QueueHandler.enqueue' in batches.
+
+    Notes:
+        The records are pickles, so the server should listen on a trusted interface,
+        it listens on 'localhost' by default.
+
+    Examples:
+        >> # in other processes
+        >> logger.addHandler(logging.handlers.SocketHandler('localhost', DEFAULT_TCP_LOGGING_PORT))
+    """
+
+    def __init__(self, handler: QueueHandler
+                 , host='localhost', port=logging.handlers.DEFAULT_TCP_LOGGING_PORT
+                 , level=logging.NOTSET, chunk_size=1 << 16):
+        """ initializer
+
+        Args:
+            handler   : queue handler of the console
+            host      : host of the server
+            port      : port of the server, if 0, a free port is used
+            level     : records under the level are ignored
+            chunk_size: max bytes received at once
+        """
+        self.handler    = handler
+        self.host       = host
+        self.port       = port
+        self.level      = level
+        self.chunk_size = chunk_size
+
+        self.__server: Optional[_RecordServer] = None
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> tuple:
+        """ tuple: (host, port) of the server, the actual port is set after 'start' """
+        return self.host, self.port
+
+    def start(self):
+        """ start listening
+
+        Returns:
+            SocketListener: instance
+
+        Raises:
+            OSError: if the address can't be bound
+        """
+        self.__server = _RecordServer((self.host, self.port), _RecordStreamHandler)
+        self.__server.listener = self
+        self.port = self.__server.server_address[1]
+
+        self.__thread = threading.Thread(target=self.__server.serve_forever
+                                         , kwargs={'poll_interval': 0.25}, daemon=True)
+        self.__thread.start()
+
+        return self
+
+    def stop(self, timeout=1.0) -> None:
+        """ stop listening """
+        if self.__server:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__thread.join(timeout)
+            self.__server = None
+            self.__thread = None
@@ -0,0 +1,95 @@
+# -*- coding:utf-8 -*-
+import logging
+import threading
+from typing import Callable, Optional
+
+# my modules and packages
+from tkinter_console.log_console.handler.queue_handler import QueueHandler
+from tkinter_console.log_console.handler.file_follower import LevelParser, LineFeeder
+
+__all__ = ['StreamReader']
+
+
+class StreamReader:
+    """ Read lines of a stream, e.g. stdin of 'some_app | python -m tkinter_console.log_console --stdin'
+
+    A background thread reads available data in chunks,
+    and puts them into the console's queue through 'LineFeeder'.
+    """
+
+    def __init__(self, stream, handler: QueueHandler
+                 , parser: Optional[Callable[[str], Optional[int]]] = None
+                 , default_level=logging.INFO, name='stdin'
+                 , chunk_size=1 << 16
+                 , encoding='utf-8', errors='replace'):
+        """ initializer
+
+        Args:
+            stream       : binary or text stream, the binary buffer of a text stream is read,
+                             texts of a stream without the buffer (e.g. io.StringIO) are encoded
+            handler      : queue handler of the console
+            parser       : callable which returns a level of a line, or None for continuation lines,
+                             if None, 'LevelParser' is used
+            default_level: level of lines before the first line with a level
+            name         : logger name of the entries
+            chunk_size   : max bytes read at once
+            encoding     : encoding of the stream
+            errors       : error handler of decoding
+        """
+        self.stream        = getattr(stream, 'buffer', stream)
+        self.handler       = handler
+        self.parser        = parser if parser is not None else LevelParser()
+        self.default_level = default_level
+        self.name          = name
+        self.chunk_size    = chunk_size
+        self.encoding      = encoding
+        self.errors        = errors
+
+        self.__stop   = threading.Event()
+        self.__thread : Optional[threading.Thread] = None
+
+    def start(self):
+        """ start reading
+
+        Returns:
+            StreamReader: instance
+        """
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+        return self
+
+    def stop(self, timeout=0.0) -> None:
+        """ stop reading
+
+        A blocking read can't be interrupted, so the thread stops after the next read.
+        """
+        if self.__thread:
+            self.__stop.set()
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __run(self):
+        """ for reading thread """
+        # 'read1' returns available data without waiting for the whole chunk
+        read   = getattr(self.stream, 'read1', self.stream.read)
+        feeder = LineFeeder(self.handler, self.parser, self.default_level, self.name
+                            , self.encoding, self.errors)
+
+        while not self.__stop.is_set():
+            try:
+                data = read(self.chunk_size)
+            except (OSError, ValueError):
+                break
+
+            if not data:
+                break
+
+            if isinstance(data, str):
+                data = data.encode(self.encoding, self.errors)
+
+            feeder.feed(data)
+
+        if not self.__stop.is_set():
+            feeder.feed(b'', flush=True)
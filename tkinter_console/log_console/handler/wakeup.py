@@ -0,0 +1,92 @@
+# -*- coding:utf-8 -*-
+import os
+import threading
+import tkinter as tk
+from typing import Callable, Optional
+
+__all__ = ['PipeWaker']
+
+class PipeWaker:
+    """ Wake up the Tk mainloop from other threads through a self-pipe
+
+    The read end of the pipe is registered with 'createfilehandler',
+    so the callback is called in the mainloop only when data is written.
+    Signals are coalesced, a flood of 'notify' causes at most one pending wakeup.
+
+    Notes:
+        'createfilehandler' is available only on Unix-like platforms.
+        Check 'is_available' before using it.
+    """
+
+    def __init__(self):
+        self.__read_fd, self.__write_fd = os.pipe()
+        os.set_blocking(self.__read_fd, False)
+        os.set_blocking(self.__write_fd, False)
+
+        self.__lock    = threading.Lock()
+        self.__pending = False
+
+        self.__widget  : Optional[tk.Misc]  = None
+        self.__callback: Optional[Callable] = None
+
+    @staticmethod
+    def is_available(widget: tk.Misc) -> bool:
+        """ check 'createfilehandler' can be used with the widget """
+        return os.name == 'posix' and hasattr(widget.tk, 'createfilehandler')
+
+    def attach(self, widget: tk.Misc, callback: Callable):
+        """ register the pipe to the Tk mainloop
+
+        Args:
+            widget  : any Tk widget
+            callback: called in the mainloop without args, after a wakeup
+
+        Returns:
+            PipeWaker: instance
+        """
+        self.__widget   = widget
+        self.__callback = callback
+        widget.tk.createfilehandler(self.__read_fd, tk.READABLE, self.__on_readable)
+
+        return self
+
+    def detach(self) -> None:
+        """ unregister the pipe and close it """
+        if self.__widget is not None:
+            self.__widget.tk.deletefilehandler(self.__read_fd)
+            self.__widget = None
+
+        for fd in (self.__read_fd, self.__write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def notify(self) -> None:
+        """ signal the mainloop, it can be called from any thread """
+        with self.__lock:
+            if self.__pending:
+                return
+            self.__pending = True
+
+        try:
+            os.write(self.__write_fd, b'\0')
+        except (BlockingIOError, OSError):
+            # the pipe is full or closed, a wakeup is already pending
+            pass
+
+    def __on_readable(self, fd, mask):
+        """ called in the mainloop when the pipe is readable """
+        try:
+            os.read(self.__read_fd, 4096)
+        except (BlockingIOError, OSError):
+            pass
+
+        # clear the flag before the callback,
+        #   records put after this point are signaled again
+        with self.__lock:
+            self.__pending = False
+
+        if self.__callback:
+            self.__callback()
+
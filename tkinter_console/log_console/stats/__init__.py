@@ -0,0 +1,2 @@
+# -*- coding:utf-8 -*-
+from tkinter_console.log_console.stats.console_stats import *
@@ -0,0 +1,166 @@
+# -*- coding:utf-8 -*-
+import time
+from collections import deque
+from typing import Callable, NamedTuple, Optional
+
+__all__ = ['LogStatsSnapshot', 'LogConsoleStats']
+
+
+class LogStatsSnapshot(NamedTuple):
+    """ throughput and latency of a console at a point of time
+
+    Rates are records/sec over the window, times are ms.
+    """
+    ingest_rate      : float
+    render_rate      : float
+    ingested         : int
+    rendered         : int
+    queue_depth      : int
+    queue_high_water : int
+    drain_time       : float
+    drain_time_max   : float
+    latency_p50      : float
+    latency_p90      : float
+    latency_p99      : float
+    dropped          : int
+    dropped_per_level: dict
+
+    def __str__(self):
+        return ("in {:.0f}/s  out {:.0f}/s  queue {} (max {})  drain {:.1f} ms (max {:.1f})"
+                "  latency p50 {:.0f} ms p99 {:.0f} ms  dropped {}"
+                .format(self.ingest_rate, self.render_rate
+                        , self.queue_depth, self.queue_high_water
+                        , self.drain_time, self.drain_time_max
+                        , self.latency_p50, self.latency_p99
+                        , self.dropped))
+
+
+class LogConsoleStats:
+    """ Live throughput and latency counters of a console
+
+    It's updated by the console after each drain on the mainloop,
+    so the emitting threads don't pay for it.
+
+    Ingested records are derived from the drained records and the change of the queue depth,
+    and the latency is measured from 'LogRecord.created' to the time the batch is displayed.
+    """
+
+    def __init__(self, window=1.0, latency_samples=1024, report_interval=1.0):
+        """ initializer
+
+        Args:
+            window         : window (sec) of the rates
+            latency_samples: number of the latest latencies kept for the percentiles
+            report_interval: min interval (sec) between callbacks
+        """
+        self.window          = window
+        self.report_interval = report_interval
+
+        # totals
+        self.__ingested = 0
+        self.__rendered = 0
+        self.__dropped  : dict = {}
+
+        # queue
+        self.__queue_depth      = 0
+        self.__queue_high_water = 0
+
+        # drain time (ms)
+        self.__drain_time     = 0.0
+        self.__drain_time_max = 0.0
+
+        # latencies (ms), and (time, ingested, rendered) for the rates
+        self.__latencies = deque(maxlen=latency_samples)
+        self.__samples   = deque()
+
+        # callbacks
+        self.__callbacks: list = []
+        self.__reported = time.perf_counter()
+
+    def add_callback(self, callback: Callable[[LogStatsSnapshot], None]) -> None:
+        """ add a callback, it's called with a snapshot at most once per 'report_interval' """
+        self.__callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[LogStatsSnapshot], None]) -> None:
+        """ remove a callback """
+        self.__callbacks.remove(callback)
+
+    def reset_high_water(self) -> None:
+        """ reset the high-water marks """
+        self.__queue_high_water = self.__queue_depth
+        self.__drain_time_max   = 0.0
+
+    def record_drain(self, entries: list, queue_depth: int, drain_time: float
+                     , dropped: Optional[dict] = None) -> None:
+        """ record a drain
+
+        Args:
+            entries    : drained entries, they have 'created'
+            queue_depth: queue depth after the drain
+            drain_time : wall time (sec) of the drain
+            dropped    : number of dropped records per level in total, None if unchanged
+        """
+        now = time.time()
+        n   = len(entries)
+
+        # the queue depth before the drain is the peak seen by the drain
+        self.__ingested        += n + queue_depth - self.__queue_depth
+        self.__rendered        += n
+        self.__queue_high_water = max(self.__queue_high_water, queue_depth + n)
+        self.__queue_depth      = queue_depth
+        if dropped is not None:
+            self.__dropped = dropped
+
+        self.__drain_time     = drain_time * 1000
+        self.__drain_time_max = max(self.__drain_time_max, self.__drain_time)
+
+        self.__latencies.extend((now - entry.created) * 1000 for entry in entries)
+
+        # sample the totals, at most 10 times per window
+        t = time.perf_counter()
+        if not self.__samples or t - self.__samples[-1][0] >= self.window / 10:
+            self.__samples.append((t, self.__ingested, self.__rendered))
+
+        if self.__callbacks and t - self.__reported >= self.report_interval:
+            self.__reported = t
+            snapshot = self.snapshot()
+            for callback in self.__callbacks:
+                callback(snapshot)
+
+    def snapshot(self) -> LogStatsSnapshot:
+        """ return the current stats """
+        t = time.perf_counter()
+
+        # drop samples out of the window
+        samples = self.__samples
+        while samples and t - samples[0][0] > self.window:
+            samples.popleft()
+
+        if samples and t > samples[0][0]:
+            elapsed     = t - samples[0][0]
+            ingest_rate = (self.__ingested - samples[0][1]) / elapsed
+            render_rate = (self.__rendered - samples[0][2]) / elapsed
+        else:
+            ingest_rate = render_rate = 0.0
+
+        latencies = sorted(self.__latencies)
+
+        # inner function
+        def _percentile(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+        return LogStatsSnapshot(ingest_rate=ingest_rate
+                                , render_rate=render_rate
+                                , ingested=self.__ingested
+                                , rendered=self.__rendered
+                                , queue_depth=self.__queue_depth
+                                , queue_high_water=self.__queue_high_water
+                                , drain_time=self.__drain_time
+                                , drain_time_max=self.__drain_time_max
+                                , latency_p50=_percentile(0.50)
+                                , latency_p90=_percentile(0.90)
+                                , latency_p99=_percentile(0.99)
+                                , dropped=sum(self.__dropped.values())
+                                , dropped_per_level=dict(self.__dropped))
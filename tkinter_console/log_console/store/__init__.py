@@ -0,0 +1,5 @@
+# -*- coding:utf-8 -*-
+from tkinter_console.log_console.store.record_store import *
+from tkinter_console.log_console.store.search_index import *
+from tkinter_console.log_console.store.traceback_store import *
+from tkinter_console.log_console.store.mapped_store import *
@@ -0,0 +1,481 @@
+# -*- coding:utf-8 -*-
+import logging
+import mmap
+import os
+import re
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:     # optional, the pure Python fallback is used
+    np = None
+
+# my modules and packages
+from tkinter_console.log_console.handler.file_follower import LevelParser
+
+__all__ = ['MappedLogStore']
+
+
+class MappedLogStore:
+    """ Read-only store of a log file, memory-mapped
+
+    Each line of the file is a record, and the id is the line number (0-based).
+    Only the line-offset index is built when the file is opened,
+    and texts are read from the memory-mapped file on demand,
+    so huge files are opened quickly with little memory.
+
+    The level index is built after the first use of the level filter,
+    by a regex pass over the file in ranges of lines through 'index_levels',
+    so the caller can spread it over ticks. Until it's built, the filter is not applied.
+    Lines without a level name inherit the level of the previous line.
+
+    It has the same view interface as 'LogRecordStore',
+    so it can be used as the store of 'LogVirtualConsoleFrame'.
+
+    If numpy is installed, the indexes are built by vectorized passes,
+    otherwise by the pure Python fallback.
+
+    A search can be verified incrementally by 'verify', in ranges of lines.
+    """
+
+    # lines searched at once while verifying
+    VERIFY_LINES = 1 << 14
+
+    # lines indexed at once while building the level index
+    INDEX_LINES = 1 << 11
+
+    def __init__(self, path: str
+                 , parser: Optional[LevelParser] = None
+                 , default_level=logging.INFO
+                 , encoding='utf-8', errors='replace'
+                 , chunk_size=64 << 20):
+        """ initializer
+
+        Args:
+            path         : path of the log file
+            parser       : level parser, its level names are used for the level index
+            default_level: level of lines before the first line with a level
+            encoding     : encoding of the file
+            errors       : error handler of decoding
+            chunk_size   : bytes scanned at once while indexing
+        """
+        self.path          = path
+        self.parser        = parser if parser is not None else LevelParser()
+        self.default_level = default_level
+        self.encoding      = encoding
+        self.errors        = errors
+        self.chunk_size    = chunk_size
+
+        self.__fd   = open(path, mode='rb')
+        self.__size = os.fstat(self.__fd.fileno()).st_size
+        self.__mm   = (mmap.mmap(self.__fd.fileno(), 0, access=mmap.ACCESS_READ)
+                       if self.__size else b'')
+
+        # line-offset index, start offsets of lines
+        self.__starts = self.__index_lines()
+
+        # level index, built after the first use of the level filter
+        #   (levels, next line, level of the previous line) while building
+        self.__levels      : Optional[array] = None
+        self.__level_build : Optional[list]  = None
+
+        # level filter
+        #   the visible ids are None if no level is hidden
+        self.__hidden_levels = set()
+        self.__visible       = None
+
+        # search settings
+        #   the match view is None if the view is not limited to the matched records
+        self.__match_pattern = None
+        self.__matches       = array('Q')
+        self.__match_view    = None
+
+        # incremental verifying, bytes pattern and the next line to be verified
+        self.__pending     : Optional[re.Pattern] = None
+        self.__pending_pos = 0
+
+    def close(self) -> None:
+        """ close the memory-mapped file """
+        if isinstance(self.__mm, mmap.mmap):
+            self.__mm.close()
+        self.__fd.close()
+
+    def __len__(self):
+        return len(self.__starts)
+
+    @property
+    def size(self) -> int:
+        """ int: file size """
+        return self.__size
+
+    @property
+    def first_id(self) -> int:
+        """ int: id of the first record """
+        return 0
+
+    @property
+    def next_id(self) -> int:
+        """ int: id after the last record """
+        return len(self.__starts)
+
+    @property
+    def discarded_records(self) -> int:
+        """ int: number of trimmed records, always 0 """
+        return 0
+
+    @property
+    def discarded_lines(self) -> int:
+        """ int: number of trimmed lines, always 0 """
+        return 0
+
+    @property
+    def hidden_levels(self) -> set:
+        """ set: levels hidden by the filter """
+        return set(self.__hidden_levels)
+
+    def __contains__(self, record_id: int) -> bool:
+        return 0 <= record_id < len(self.__starts)
+
+    def append(self, levelno: int, text: str, created: float = 0.0) -> int:
+        """ the store is read-only
+
+        Raises:
+            RuntimeError: always
+        """
+        raise RuntimeError("[!!] the mapped store is read-only - {}".format(self.path))
+
+    def repeat_last(self) -> int:
+        """ the store is read-only
+
+        Raises:
+            RuntimeError: always
+        """
+        raise RuntimeError("[!!] the mapped store is read-only - {}".format(self.path))
+
+    def __index_lines(self):
+        """ build the start offsets of lines """
+        mm, size = self.__mm, self.__size
+        if not size:
+            return array('Q')
+
+        if np is not None:
+            parts = [np.zeros(1, dtype=np.int64)]
+            for pos in range(0, size, self.chunk_size):
+                buf = np.frombuffer(mm, dtype=np.uint8, count=min(self.chunk_size, size - pos), offset=pos)
+                parts.append(np.flatnonzero(buf == 0x0a) + (pos + 1))
+                del buf
+            starts = np.concatenate(parts)
+        else:
+            starts = array('Q', [0])
+            for pos in range(0, size, self.chunk_size):
+                data = mm[pos:pos + self.chunk_size]
+                i = data.find(b'\n')
+                while i >= 0:
+                    starts.append(pos + i + 1)
+                    i = data.find(b'\n', i + 1)
+
+        # the trailing newline doesn't start a line
+        if starts[-1] == size:
+            starts = starts[:-1]
+
+        return starts
+
+    def __line_range(self, record_id: int) -> tuple:
+        """ return (start, end) offsets of the line, without the newline """
+        start = int(self.__starts[record_id])
+        end   = (int(self.__starts[record_id + 1]) - 1
+                 if record_id + 1 < len(self.__starts)
+                 else self.__size)
+        return start, end
+
+    def text(self, record_id: int) -> str:
+        """ return the text of the record """
+        start, end = self.__line_range(record_id)
+        return self.__mm[start:end].rstrip(b'\r\n').decode(self.encoding, self.errors)
+
+    def created(self, record_id: int) -> float:
+        """ return the created time of the record, it's unknown """
+        return 0.0
+
+    def repeats(self, record_id: int) -> int:
+        """ return the repeated count of the record, always 0 """
+        return 0
+
+    def level(self, record_id: int) -> int:
+        """ return the level of the record
+
+        If the level index is not built yet, the line (and previous lines) is parsed.
+        """
+        if self.__levels is not None:
+            return int(self.__levels[record_id])
+
+        # a few lines are enough for continuation lines, e.g. tracebacks
+        for i in range(record_id, max(-1, record_id - 100), -1):
+            level = self.parser(self.text(i))
+            if level is not None:
+                return level
+
+        return self.default_level
+
+    @property
+    def levels_pending(self) -> bool:
+        """ bool: the level index is still built, the filter is not applied yet """
+        return self.__level_build is not None
+
+    def __level_regex(self) -> re.Pattern:
+        """ bytes pattern of the level names of the parser """
+        names = sorted(self.parser.levels, key=len, reverse=True)
+        return re.compile(rb'\b(' + b'|'.join(re.escape(name.encode('ascii')) for name in names) + rb')\b'
+                          , re.IGNORECASE)
+
+    def index_levels(self, max_records: Optional[int] = None, deadline: Optional[float] = None) -> bool:
+        """ build the level index within the budget, the filter is applied when it's built
+
+        Args:
+            max_records: max lines indexed, if None, all of them
+            deadline   : deadline ('time.perf_counter'), if None, no deadline
+
+        Returns:
+            bool: True if lines are still left
+        """
+        build = self.__level_build
+        if build is None:
+            return False
+
+        levels, line, level = build
+        starts = self.__starts
+        n      = len(starts)
+        stop   = n if max_records is None else min(n, line + max_records)
+        head   = self.parser.head
+        regex  = self.__level_regex()
+        upper  = {name.upper().encode('ascii'): value for name, value in self.parser.levels.items()}
+
+        while line < stop:
+            end    = min(stop, line + self.INDEX_LINES)
+            endpos = int(starts[end]) if end < n else self.__size
+            pos    = int(starts[line])
+
+            # the first level name in the head of each line, continuation lines inherit the level
+            while pos < endpos:
+                match = regex.search(self.__mm, pos, endpos)
+                if match is None:
+                    break
+
+                i = bisect_right(starts, match.start()) - 1
+                if match.start() - int(starts[i]) < head:
+                    levels.extend(array('H', [level]) * (i - line))
+                    level = upper[match.group(1).upper()]
+                    line  = i
+
+                # skip to the next line
+                pos = int(starts[i + 1]) if i + 1 < n else self.__size
+
+            levels.extend(array('H', [level]) * (end - line))
+            line = end
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        build[1:] = [line, level]
+
+        # all lines are indexed, apply the filter
+        if line >= n:
+            self.__levels      = levels
+            self.__level_build = None
+            self.__update_visible()
+            if self.__match_view is not None:
+                self.__update_match_view()
+
+        return self.__level_build is not None
+
+    def set_hidden_levels(self, levels) -> None:
+        """ set levels hidden by the filter
+
+        The level index is not built here, it's built by 'index_levels'.
+        """
+        self.__hidden_levels = set(levels)
+
+        if self.__hidden_levels and self.__levels is None and self.__level_build is None:
+            self.__level_build = [array('H'), 0, self.default_level]
+
+        self.__update_visible()
+        if self.__match_view is not None:
+            self.__update_match_view()
+
+    def __update_visible(self) -> None:
+        """ update the visible ids, all ids are visible until the level index is built """
+        hidden = self.__hidden_levels
+        if not hidden or self.__levels is None:
+            self.__visible = None
+        elif np is not None:
+            levels = np.frombuffer(self.__levels, dtype=np.uint16)
+            self.__visible = np.flatnonzero(~np.isin(levels, list(hidden)))
+        else:
+            self.__visible = array('Q', (i for i, level in enumerate(self.__levels)
+                                         if level not in hidden))
+
+    @property
+    def matches(self) -> array:
+        """ array: ids matched by the pattern of 'set_match', partial while verifying """
+        return self.__matches
+
+    @property
+    def pending(self) -> bool:
+        """ bool: lines are still verified for 'set_match' """
+        return self.__pending is not None
+
+    def __bytes_pattern(self, pattern: re.Pattern) -> re.Pattern:
+        """ convert a str pattern to a bytes pattern for the memory-mapped file """
+        if isinstance(pattern.pattern, bytes):
+            return pattern
+        flags = pattern.flags & (re.IGNORECASE | re.DOTALL | re.VERBOSE)
+        return re.compile(pattern.pattern.encode(self.encoding), flags | re.MULTILINE)
+
+    def search(self, pattern: re.Pattern) -> array:
+        """ search records by a regex pass over the memory-mapped file
+
+        Returns:
+            array: matched ids
+        """
+        ids = array('Q')
+        if len(self.__starts):
+            self.__search_lines(self.__bytes_pattern(pattern), 0, self.__size, ids)
+        return ids
+
+    def __search_lines(self, regex: re.Pattern, pos: int, endpos: int, ids: array) -> None:
+        """ append ids of lines matched in the range of bytes, 'endpos' is a start of a line """
+        starts = self.__starts
+        n      = len(starts)
+
+        while pos < endpos:
+            match = regex.search(self.__mm, pos, endpos)
+            if match is None:
+                break
+
+            line = bisect_right(starts, match.start()) - 1
+            ids.append(line)
+
+            # skip to the next line
+            if line + 1 >= n:
+                break
+            pos = int(starts[line + 1])
+
+    def set_match(self, pattern: Optional[re.Pattern], match_only=False, incremental=False) -> array:
+        """ search records, and keep the matched ids
+
+        Args:
+            pattern    : pattern, if None, the match is cleared
+            match_only : limit the view to the matched records
+            incremental: if True, lines are verified by 'verify' later,
+                           else they are verified at once
+
+        Returns:
+            array: matched ids, partial if 'incremental'
+        """
+        self.__match_pattern = pattern
+        self.__matches       = array('Q')
+        self.__pending       = (self.__bytes_pattern(pattern)
+                                if pattern is not None and len(self.__starts)
+                                else None)
+        self.__pending_pos   = 0
+        self.set_match_only(match_only)
+
+        if not incremental:
+            self.verify(max_records=None)
+
+        return self.__matches
+
+    def verify(self, max_records: Optional[int] = 4096, deadline: Optional[float] = None) -> bool:
+        """ verify lines for 'set_match' within the budget
+
+        Args:
+            max_records: max lines verified, if None, all of them
+            deadline   : deadline ('time.perf_counter'), if None, no deadline
+
+        Returns:
+            bool: True if lines are still left
+        """
+        regex = self.__pending
+        if regex is None:
+            return False
+
+        starts = self.__starts
+        n      = len(starts)
+        line   = self.__pending_pos
+        stop   = n if max_records is None else min(n, line + max_records)
+
+        while line < stop:
+            end = min(stop, line + self.VERIFY_LINES)
+            ids = array('Q')
+            self.__search_lines(regex, int(starts[line])
+                                , int(starts[end]) if end < n else self.__size, ids)
+            self.__matches.extend(ids)
+
+            # the match view is a copy if levels are hidden
+            view = self.__match_view
+            if view is not None and view is not self.__matches:
+                hidden = self.__hidden_levels
+                view.extend(i for i in ids if self.level(i) not in hidden)
+            line = end
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        self.__pending_pos = line
+        if line >= n:
+            self.__pending = None
+
+        return self.__pending is not None
+
+    def set_match_only(self, flag: bool) -> None:
+        """ limit the view to the matched records, or not
+
+        It's ignored if no pattern is set.
+        """
+        if flag and self.__match_pattern is not None:
+            self.__update_match_view()
+        else:
+            self.__match_view = None
+
+    def __update_match_view(self) -> None:
+        """ update the view of the matched records """
+        if not self.__hidden_levels or self.__levels is None:
+            self.__match_view = self.__matches
+            return
+
+        hidden = self.__hidden_levels
+        levels = self.__levels
+        self.__match_view = array('Q', (i for i in self.__matches if levels[i] not in hidden))
+
+    def view_len(self) -> int:
+        """ return number of records in the view """
+        if self.__match_view is not None:
+            return len(self.__match_view)
+        if self.__visible is None:
+            return len(self.__starts)
+        return len(self.__visible)
+
+    def view_index(self, record_id: int) -> int:
+        """ return the position of the record (or the next one) in the view """
+        if self.__match_view is not None:
+            return bisect_left(self.__match_view, record_id)
+        if self.__visible is None:
+            return max(0, min(record_id, len(self.__starts)))
+        if np is not None:
+            return int(np.searchsorted(self.__visible, record_id))
+        return bisect_left(self.__visible, record_id)
+
+    def view_ids(self, start: int, stop: int) -> list:
+        """ return ids in the view[start:stop] """
+        start, stop = max(0, start), max(0, stop)
+        if self.__match_view is not None:
+            return list(self.__match_view[start:stop])
+        if self.__visible is None:
+            start, stop, _ = slice(start, stop).indices(len(self.__starts))
+            return list(range(start, max(start, stop)))
+        if np is not None:
+            return self.__visible[start:stop].tolist()
+        return list(self.__visible[start:stop])
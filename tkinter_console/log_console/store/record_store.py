@@ -0,0 +1,430 @@
+# -*- coding:utf-8 -*-
+import re
+import time
+from array import array
+from bisect import bisect_left
+from itertools import chain
+from typing import Iterable, Optional
+
+# my modules and packages
+from tkinter_console.log_console.store.search_index import LogSearchIndex
+
+__all__ = ['LogRecordStore']
+
+
+class LogRecordStore:
+    """ Compact array-backed store of log records
+
+    Records are identified by ids, which are increased monotonically
+    and never reused, even after the oldest records are trimmed.
+    The view is the ids of records which are not hidden by the level filter.
+
+    Ids are also indexed per level, and the view is not materialized.
+    Positions in the view are resolved by binary searches over the index
+    of the visible levels, so switching the filter costs nothing
+    and a window of the view costs O(levels * log(records)).
+
+    If the store is indexed, records are also indexed by 'LogSearchIndex'
+    for searching. The matched ids are kept up to date while records are appended,
+    and the view can be limited to the matched records.
+    The candidates of a search can be verified incrementally by 'verify',
+    so a large search doesn't block the caller.
+    """
+
+    def __init__(self, max_records: Optional[int] = None, max_bytes: Optional[int] = None
+                 , indexed=False):
+        """ initializer
+
+        Notes:
+            If 'max_records' or 'max_bytes' is exceeded,
+            the oldest records are trimmed in chunks (10% of the limit).
+
+        Args:
+            max_records: max records kept in the store (None: unlimited)
+            max_bytes  : max bytes of texts (UTF-8) kept in the store (None: unlimited)
+            indexed    : index records for searching
+        """
+        self.max_records = max_records
+        self.max_bytes   = max_bytes
+
+        # columns
+        self.__levels  = array('H')
+        self.__created = array('d')
+        self.__texts   : list = []
+        self.__repeats : dict = {}      # id: repeated count, for coalescing
+
+        # id of the first record
+        self.__base   = 0
+        self.__nbytes = 0
+
+        # trimmed counters
+        self.__discarded_records = 0
+        self.__discarded_lines   = 0
+
+        # per-level index, {level: ids}
+        self.__level_index: dict = {}
+
+        # level filter
+        #   the index of visible levels is None if no level is hidden
+        self.__hidden_levels = set()
+        self.__visible       : Optional[list] = None
+
+        # search settings
+        #   the match view is None if the view is not limited to the matched records
+        self.__search_index  : Optional[LogSearchIndex] = LogSearchIndex() if indexed else None
+        self.__match_pattern : Optional[re.Pattern]     = None
+        self.__matches       = array('Q')
+        self.__match_view    : Optional[array] = None
+
+        # incremental verifying
+        #   candidate ids not verified yet, and ids matched while verifying (after the candidates)
+        self.__pending       : array | range | None = None
+        self.__pending_pos   = 0
+        self.__new_matches   = array('Q')
+
+    def __len__(self):
+        return len(self.__levels)
+
+    @property
+    def first_id(self) -> int:
+        """ int: id of the oldest record """
+        return self.__base
+
+    @property
+    def next_id(self) -> int:
+        """ int: id of the next appended record """
+        return self.__base + len(self.__levels)
+
+    @property
+    def discarded_records(self) -> int:
+        """ int: number of trimmed records """
+        return self.__discarded_records
+
+    @property
+    def discarded_lines(self) -> int:
+        """ int: number of trimmed lines """
+        return self.__discarded_lines
+
+    @property
+    def hidden_levels(self) -> set:
+        """ set: levels hidden by the filter """
+        return set(self.__hidden_levels)
+
+    def __contains__(self, record_id: int) -> bool:
+        return self.__base <= record_id < self.next_id
+
+    def append(self, levelno: int, text: str, created: float = 0.0) -> int:
+        """ append a record
+
+        Returns:
+            int: id of the record
+        """
+        record_id = self.next_id
+
+        self.__levels.append(levelno)
+        self.__created.append(created)
+        self.__texts.append(text)
+        self.__nbytes += len(text.encode('utf-8'))
+
+        index = self.__level_index.get(levelno)
+        if index is None:
+            index = self.__level_index[levelno] = array('Q')
+            self.__update_visible()
+        index.append(record_id)
+
+        if self.__search_index is not None:
+            self.__search_index.add(record_id, text)
+
+        # keep the matched ids up to date
+        #   while verifying, they are appended after the candidates are verified
+        if self.__match_pattern is not None and self.__match_pattern.search(text):
+            if self.__pending is not None:
+                self.__new_matches.append(record_id)
+            else:
+                self.__matches.append(record_id)
+                if self.__match_view is not None and levelno not in self.__hidden_levels:
+                    self.__match_view.append(record_id)
+
+        self.trim()
+
+        return record_id
+
+    def repeat_last(self) -> int:
+        """ count up the repeated count of the last record
+
+        Returns:
+            int: the repeated count
+        """
+        record_id = self.next_id - 1
+        self.__repeats[record_id] = self.__repeats.get(record_id, 0) + 1
+        return self.__repeats[record_id]
+
+    def level(self, record_id: int) -> int:
+        """ return the level of the record """
+        return self.__levels[record_id - self.__base]
+
+    def created(self, record_id: int) -> float:
+        """ return the created time of the record """
+        return self.__created[record_id - self.__base]
+
+    def text(self, record_id: int) -> str:
+        """ return the text of the record """
+        return self.__texts[record_id - self.__base]
+
+    def repeats(self, record_id: int) -> int:
+        """ return the repeated count of the record """
+        return self.__repeats.get(record_id, 0)
+
+    def __over_limit(self, records: int, nbytes: int, slack: float) -> bool:
+        """ check the records and the bytes exceed the limits multiplied by 'slack' """
+        return ((self.max_records is not None and records > self.max_records * slack)
+                or (self.max_bytes is not None and nbytes > self.max_bytes * slack))
+
+    def trim(self) -> int:
+        """ trim the oldest records in a chunk, if the limits are exceeded
+
+        Returns:
+            int: number of trimmed records
+        """
+        records = len(self.__texts)
+        if not self.__over_limit(records, self.__nbytes, slack=1.0):
+            return 0
+
+        # trim until 90% of the limits
+        n      = 0
+        nbytes = self.__nbytes
+        lines  = 0
+        while n < records and self.__over_limit(records - n, nbytes, slack=0.9):
+            text    = self.__texts[n]
+            nbytes -= len(text.encode('utf-8'))
+            lines  += text.count('\n') + 1
+            n      += 1
+
+        del self.__levels[:n]
+        del self.__created[:n]
+        del self.__texts[:n]
+
+        self.__base   += n
+        self.__nbytes  = nbytes
+        self.__discarded_records += n
+        self.__discarded_lines   += lines
+
+        # drop trimmed ids
+        for index in self.__level_index.values():
+            del index[:bisect_left(index, self.__base)]
+        if self.__repeats:
+            self.__repeats = {k: v for k, v in self.__repeats.items() if k >= self.__base}
+
+        if self.__search_index is not None:
+            self.__search_index.prune(self.__base)
+        del self.__matches[:bisect_left(self.__matches, self.__base)]
+        del self.__new_matches[:bisect_left(self.__new_matches, self.__base)]
+        if self.__match_view is not None:
+            del self.__match_view[:bisect_left(self.__match_view, self.__base)]
+
+        return n
+
+    def level_ids(self, levelno: int) -> array:
+        """ return ids of the level """
+        return self.__level_index.get(levelno, array('Q'))
+
+    @property
+    def levels_pending(self) -> bool:
+        """ bool: the level index is still built, always False, it's built while appending """
+        return False
+
+    def index_levels(self, max_records: Optional[int] = None, deadline: Optional[float] = None) -> bool:
+        """ build the level index, nothing to do
+
+        Returns:
+            bool: False, no records are left
+        """
+        return False
+
+    def set_hidden_levels(self, levels: Iterable[int]) -> None:
+        """ set levels hidden by the filter """
+        self.__hidden_levels = set(levels)
+        self.__update_visible()
+
+        if self.__match_view is not None:
+            self.__update_match_view()
+
+    @property
+    def matches(self) -> array:
+        """ array: ids matched by the pattern of 'set_match', partial while verifying """
+        return self.__matches
+
+    @property
+    def pending(self) -> bool:
+        """ bool: candidates of 'set_match' are still verified """
+        return self.__pending is not None
+
+    def __candidates(self, pattern: re.Pattern) -> array | range:
+        """ return sorted candidate ids of the pattern
+
+        If the store is indexed, the candidates are narrowed down by the index,
+        else all records are the candidates.
+        """
+        base       = self.__base
+        candidates = (self.__search_index.candidates(pattern)
+                      if self.__search_index is not None
+                      else None)
+
+        if candidates is None:
+            return range(base, self.next_id)
+        return candidates[bisect_left(candidates, base):]
+
+    def search(self, pattern: re.Pattern) -> array:
+        """ search records
+
+        Returns:
+            array: matched ids
+        """
+        base  = self.__base
+        texts = self.__texts
+        return array('Q', (i for i in self.__candidates(pattern) if pattern.search(texts[i - base])))
+
+    def set_match(self, pattern: Optional[re.Pattern], match_only=False, incremental=False) -> array:
+        """ search records, and keep the matched ids up to date while appending
+
+        Args:
+            pattern    : pattern, if None, the match is cleared
+            match_only : limit the view to the matched records
+            incremental: if True, the candidates are verified by 'verify' later,
+                           else they are verified at once
+
+        Returns:
+            array: matched ids, partial if 'incremental'
+        """
+        self.__match_pattern = pattern
+        self.__matches       = array('Q')
+        self.__new_matches   = array('Q')
+        self.__pending       = self.__candidates(pattern) if pattern is not None else None
+        self.__pending_pos   = 0
+        self.set_match_only(match_only)
+
+        if not incremental:
+            self.verify(max_records=None)
+
+        return self.__matches
+
+    def verify(self, max_records: Optional[int] = 4096, deadline: Optional[float] = None) -> bool:
+        """ verify candidates of 'set_match' within the budget
+
+        Args:
+            max_records: max candidates verified, if None, all of them
+            deadline   : deadline ('time.perf_counter'), if None, no deadline
+
+        Returns:
+            bool: True if candidates are still left
+        """
+        pending = self.__pending
+        if pending is None:
+            return False
+
+        pattern = self.__match_pattern
+        matches = self.__matches
+        view    = self.__match_view
+        hidden  = self.__hidden_levels
+        levels  = self.__levels
+        texts   = self.__texts
+        base    = self.__base
+
+        pos  = self.__pending_pos
+        stop = len(pending) if max_records is None else min(len(pending), pos + max_records)
+
+        while pos < stop:
+            end = min(stop, pos + 256)
+            for i in pending[pos:end]:
+                # trimmed while verifying
+                if i < base:
+                    continue
+                if pattern.search(texts[i - base]):
+                    matches.append(i)
+                    if view is not None and levels[i - base] not in hidden:
+                        view.append(i)
+            pos = end
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        self.__pending_pos = pos
+
+        # all candidates are verified, append records matched while verifying
+        if pos >= len(pending):
+            matches.extend(self.__new_matches)
+            if view is not None:
+                view.extend(i for i in self.__new_matches if levels[i - base] not in hidden)
+            self.__new_matches = array('Q')
+            self.__pending     = None
+
+        return self.__pending is not None
+
+    def set_match_only(self, flag: bool) -> None:
+        """ limit the view to the matched records, or not
+
+        It's ignored if no pattern is set.
+        """
+        if flag and self.__match_pattern is not None:
+            self.__update_match_view()
+        else:
+            self.__match_view = None
+
+    def __update_match_view(self) -> None:
+        """ update the view of the matched records """
+        hidden = self.__hidden_levels
+        levels = self.__levels
+        base   = self.__base
+        self.__match_view = array('Q', (i for i in self.__matches if levels[i - base] not in hidden))
+
+    def __update_visible(self) -> None:
+        """ update the index of visible levels """
+        visible = [index
+                   for level, index in self.__level_index.items()
+                   if level not in self.__hidden_levels]
+        self.__visible = None if len(visible) == len(self.__level_index) else visible
+
+    def view_len(self) -> int:
+        """ return number of records in the view """
+        if self.__match_view is not None:
+            return len(self.__match_view)
+        if self.__visible is None:
+            return len(self.__levels)
+        return sum(len(index) for index in self.__visible)
+
+    def view_index(self, record_id: int) -> int:
+        """ return the position of the record (or the next one) in the view """
+        if self.__match_view is not None:
+            return bisect_left(self.__match_view, record_id)
+        if self.__visible is None:
+            return max(0, min(record_id - self.__base, len(self.__levels)))
+        return sum(bisect_left(index, record_id) for index in self.__visible)
+
+    def view_ids(self, start: int, stop: int) -> array:
+        """ return ids in the view[start:stop] """
+        if self.__match_view is not None:
+            return self.__match_view[max(0, start):max(0, stop)]
+        if self.__visible is None:
+            start, stop, _ = slice(start, stop).indices(len(self.__levels))
+            return array('Q', range(self.__base + start, self.__base + max(start, stop)))
+
+        n = stop - start
+        if start < 0 or n <= 0 or start >= self.view_len():
+            return array('Q')
+
+        # binary search the first id, whose position is 'start'
+        lo, hi = self.__base, self.next_id
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.view_index(mid + 1) > start:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        # take 'n' ids from each level, and merge them
+        parts = []
+        for index in self.__visible:
+            i = bisect_left(index, lo)
+            parts.append(index[i:i + n])
+
+        return array('Q', sorted(chain.from_iterable(parts))[:n])
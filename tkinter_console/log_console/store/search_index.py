@@ -0,0 +1,253 @@
+# -*- coding:utf-8 -*-
+import re
+from array import array
+from bisect import bisect_left
+from itertools import chain
+from typing import Optional
+
+try:
+    from re import _parser as sre_parse
+except ImportError:     # Python < 3.11
+    import sre_parse
+
+__all__ = ['LogSearchIndex']
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# token match modes
+EXACT    = 'exact'      # the token is delimited on both sides
+PREFIX   = 'prefix'     # the token may continue to the right
+SUFFIX   = 'suffix'     # the token may continue to the left
+CONTAINS = 'contains'   # the token may continue to both sides
+
+# length of the character n-grams of tokens,
+#   tokens shorter than this are not used for non-exact modes
+GRAM = 3
+
+# stop narrowing down if candidates are fewer than this,
+#   verifying them is cheaper than intersecting postings
+MIN_CANDIDATES = 64
+
+# stop narrowing down if the next postings are larger than the candidates times this
+MAX_NARROWING_RATIO = 8
+
+# give up narrowing down if the candidates are more than this ratio of the records
+MAX_CANDIDATES_RATIO = 0.5
+
+
+def _intersect(a: array, b: array) -> array:
+    """ intersect sorted arrays, the smaller one is walked and the larger one is bisected """
+    if len(a) > len(b):
+        a, b = b, a
+
+    result = array('Q')
+    lo     = 0
+    n      = len(b)
+    for i in a:
+        lo = bisect_left(b, i, lo)
+        if lo == n:
+            break
+        if b[lo] == i:
+            result.append(i)
+
+    return result
+
+
+def _union(arrays: list) -> array:
+    """ union sorted arrays into a new sorted array """
+    if len(arrays) == 1:
+        return array('Q', arrays[0])
+    return array('Q', sorted(set(chain.from_iterable(arrays))))
+
+
+class LogSearchIndex:
+    """ Incremental token index for searching log records
+
+    Each record is split into lower-cased word tokens,
+    and the record id is appended to the postings of the tokens.
+    Tokens are also indexed by their character n-grams,
+    so partial tokens of a query are looked up without scanning the vocabulary.
+
+    A query is narrowed down to candidate ids by the tokens
+    which must be included in the matched records,
+    and the candidates are verified by the actual pattern.
+    """
+
+    def __init__(self):
+        self.__postings: dict = {}  # {token: ids}
+        self.__grams   : dict = {}  # {n-gram: tokens}
+
+        # range of indexed ids
+        self.__first_id = 0
+        self.__next_id  = 0
+
+    def __len__(self):
+        return len(self.__postings)
+
+    def add(self, record_id: int, text: str) -> None:
+        """ index a record """
+        postings = self.__postings
+        for token in set(TOKEN_PATTERN.findall(text.lower())):
+            ids = postings.get(token)
+            if ids is None:
+                ids = postings[token] = array('Q')
+                self.__add_grams(token)
+            ids.append(record_id)
+
+        self.__next_id = record_id + 1
+
+    def prune(self, first_id: int) -> None:
+        """ drop ids before 'first_id', they are trimmed from the store """
+        empty = []
+        for token, ids in self.__postings.items():
+            del ids[:bisect_left(ids, first_id)]
+            if not ids:
+                empty.append(token)
+
+        for token in empty:
+            del self.__postings[token]
+            self.__remove_grams(token)
+
+        self.__first_id = first_id
+
+    @staticmethod
+    def __split_grams(token: str) -> set:
+        """ return n-grams of the token """
+        return {token[i:i + GRAM] for i in range(len(token) - GRAM + 1)}
+
+    def __add_grams(self, token: str) -> None:
+        """ index a new token by its n-grams """
+        grams = self.__grams
+        for gram in self.__split_grams(token):
+            tokens = grams.get(gram)
+            if tokens is None:
+                tokens = grams[gram] = set()
+            tokens.add(token)
+
+    def __remove_grams(self, token: str) -> None:
+        """ remove a pruned token from the n-gram index """
+        grams = self.__grams
+        for gram in self.__split_grams(token):
+            tokens = grams.get(gram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del grams[gram]
+
+    def __keys(self, token: str, mode: str) -> list:
+        """ return tokens in the vocabulary matched by the token and the mode """
+        if mode == EXACT:
+            return [token] if token in self.__postings else []
+
+        # tokens including all n-grams of the token
+        tokens = [self.__grams.get(gram) for gram in self.__split_grams(token)]
+        if not all(tokens):
+            return []
+        tokens.sort(key=len)
+        keys = tokens[0].intersection(*tokens[1:])
+
+        if mode == PREFIX:
+            return [key for key in keys if key.startswith(token)]
+        if mode == SUFFIX:
+            return [key for key in keys if key.endswith(token)]
+        return [key for key in keys if token in key]
+
+    def candidates(self, pattern: re.Pattern) -> Optional[array]:
+        """ return candidate ids of the pattern
+
+        Postings of the required tokens are intersected from the smallest,
+        and the narrowing stops when the next postings are much larger than the candidates.
+
+        Returns:
+            array | None: sorted candidate ids, None if the pattern can't be narrowed down
+        """
+        postings = self.__postings
+
+        # (total size, postings) of each required token
+        groups = []
+        for token, mode in self.__required_tokens(pattern):
+            keys = self.__keys(token, mode)
+            if not keys:
+                return array('Q')
+
+            arrays = [postings[key] for key in keys]
+            groups.append((sum(map(len, arrays)), arrays))
+
+        if not groups:
+            return None
+
+        groups.sort(key=lambda group: group[0])
+
+        # hardly narrowed down, verifying all records is cheaper
+        size, arrays = groups[0]
+        if size > (self.__next_id - self.__first_id) * MAX_CANDIDATES_RATIO:
+            return None
+
+        result = _union(arrays)
+        for size, arrays in groups[1:]:
+            if len(result) < MIN_CANDIDATES or size > len(result) * MAX_NARROWING_RATIO:
+                break
+
+            result = _intersect(result, arrays[0] if len(arrays) == 1 else _union(arrays))
+            if not result:
+                break
+
+        return result
+
+    @classmethod
+    def __required_tokens(cls, pattern: re.Pattern) -> list:
+        """ return (token, mode) which must be included in the matched records """
+        tokens = []
+        for literal in cls.__required_literals(pattern):
+            literal = literal.lower()
+            for m in TOKEN_PATTERN.finditer(literal):
+                open_left  = m.start() == 0
+                open_right = m.end() == len(literal)
+
+                if open_left and open_right:
+                    mode = CONTAINS
+                elif open_left:
+                    mode = SUFFIX
+                elif open_right:
+                    mode = PREFIX
+                else:
+                    mode = EXACT
+
+                if mode == EXACT or len(m.group()) >= GRAM:
+                    tokens.append((m.group(), mode))
+
+        return tokens
+
+    @staticmethod
+    def __required_literals(pattern: re.Pattern) -> list:
+        """ return literal strings which must be included in the matched text
+
+        Only the top-level sequence (and groups in it) of the pattern is checked,
+        branches and repeats are not used for narrowing down.
+        """
+        try:
+            parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+        except Exception:
+            return []
+
+        literals = []
+        run      = []
+
+        # inner function
+        def _walk(items):
+            for op, av in items:
+                if op is sre_parse.LITERAL:
+                    run.append(chr(av))
+                elif op is sre_parse.SUBPATTERN:
+                    _walk(av[-1])
+                else:
+                    if run:
+                        literals.append(''.join(run))
+                        run.clear()
+
+        _walk(parsed)
+        if run:
+            literals.append(''.join(run))
+
+        return literals
+
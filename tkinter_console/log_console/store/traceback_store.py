@@ -0,0 +1,78 @@
+# -*- coding:utf-8 -*-
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+__all__ = ['TracebackStore']
+
+
+class TracebackStore:
+    """ Side store of formatted tracebacks, deduplicated by fingerprint
+
+    During failure storms, the same traceback is logged many times,
+    so each distinct traceback is kept once and referred by its fingerprint.
+    The least recently added tracebacks are evicted over 'max_entries'.
+    """
+
+    # number of hex digits of a fingerprint
+    FINGERPRINT_SIZE = 12
+
+    def __init__(self, max_entries: Optional[int] = 1000):
+        """ initializer
+
+        Args:
+            max_entries: max tracebacks kept in the store (None: unlimited)
+        """
+        self.max_entries = max_entries
+
+        self.__tracebacks: OrderedDict = OrderedDict()     # {fingerprint: [text, count]}
+
+    def __len__(self):
+        return len(self.__tracebacks)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self.__tracebacks
+
+    @classmethod
+    def fingerprint(cls, exc_text: str) -> str:
+        """ return the fingerprint of a traceback """
+        digest = hashlib.blake2b(exc_text.encode('utf-8'), digest_size=cls.FINGERPRINT_SIZE // 2)
+        return digest.hexdigest()
+
+    @staticmethod
+    def summary(exc_text: str) -> str:
+        """ return the one-line summary of a traceback, the exception line """
+        for line in reversed(exc_text.splitlines()):
+            if line.strip():
+                return line.strip()
+        return ''
+
+    def add(self, exc_text: str) -> str:
+        """ add a traceback
+
+        Returns:
+            str: fingerprint
+        """
+        fingerprint = self.fingerprint(exc_text)
+
+        item = self.__tracebacks.get(fingerprint)
+        if item is None:
+            self.__tracebacks[fingerprint] = [exc_text, 1]
+        else:
+            item[1] += 1
+            self.__tracebacks.move_to_end(fingerprint)
+
+        if self.max_entries is not None and len(self.__tracebacks) > self.max_entries:
+            self.__tracebacks.popitem(last=False)
+
+        return fingerprint
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        """ return the traceback, None if it's evicted """
+        item = self.__tracebacks.get(fingerprint)
+        return item[0] if item is not None else None
+
+    def count(self, fingerprint: str) -> int:
+        """ return how many times the traceback is added """
+        item = self.__tracebacks.get(fingerprint)
+        return item[1] if item is not None else 0
@@ -2,6 +2,8 @@
 from tkinter_console.utils.checkbuttonex import *
 from tkinter_console.utils.scrolledtext import *
 from tkinter_console.utils.history import *
+from tkinter_console.utils.lexer import *
 from tkinter_console.utils.highlight import *
+from tkinter_console.utils.stream_buffer import *
 from tkinter_console.utils.decorator import *
 
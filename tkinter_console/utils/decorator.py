@@ -5,6 +5,9 @@ import sys
 import traceback
 from typing import Optional, Callable
 
+# my modules and packages
+from tkinter_console.utils.stream_buffer import StreamBuffer
+
 __all__ = ['std_forker']
 
 class std_forker:
@@ -15,12 +18,16 @@ class std_forker:
     stderr    = sys.__stderr__.name
     traceback = traceback.__name__
 
-    def __init__(self, callback: Callable or None):
+    def __init__(self, callback: Callable or None, stream: Optional[StreamBuffer] = None):
         """ initialization method
 
         Notes:
             The 'callback' function is given 'result' at the first argument.
 
+            If 'stream' is given, stdout, stderr and the traceback are written into it
+            while the function is running, in written order,
+            and they are empty in 'result'.
+
         Examples:
             >> @std_forker(None)
             >> def something():
@@ -37,8 +44,17 @@ class std_forker:
             >>
             >> something()
 
+            >> stream = StreamBuffer()
+            >> @std_forker(None, stream=stream)
+            >> def something():
+            >>   print(help())
+            >>
+            >> something()
+            >> stream.pop()
+
         Args:
             callback: callback func
+            stream  : buffer for streaming outputs, or None
 
         """
 
@@ -47,6 +63,9 @@ class std_forker:
                           if callback
                           else lambda result: None)
 
+        # streaming outputs
+        self._stream = stream
+
         # for restoring
         self._org_stdin  = sys.stdin
         self._org_stdout = sys.stdout
@@ -85,7 +104,10 @@ class std_forker:
 
             except Exception:
                 # set traceback
-                self._result[self.traceback] = traceback.format_exc()
+                if self._stream is not None:
+                    self._stream.write(self.traceback, traceback.format_exc())
+                else:
+                    self._result[self.traceback] = traceback.format_exc()
 
             finally:
                 # set output
@@ -112,10 +134,15 @@ class std_forker:
         return wrapper
 
 
-    @staticmethod
-    def __override_std():
+    def __override_std(self):
         """ override std """
         sys.stdin  = io.TextIOWrapper(io.BytesIO(), sys.stdin.encoding)
+
+        if self._stream is not None:
+            sys.stdout = self._stream.writer(self.stdout, sys.stdout.encoding)
+            sys.stderr = self._stream.writer(self.stderr, sys.stderr.encoding)
+            return
+
         sys.stdout = io.TextIOWrapper(io.BytesIO(), sys.stdout.encoding)
         sys.stderr = io.TextIOWrapper(io.BytesIO(), sys.stderr.encoding)
 
@@ -127,7 +154,8 @@ class std_forker:
 
     def __set_output(self, name, std):
         """ set output for callback function """
-        std.seek(0)
-        self._result[name] = std.read()
+        if std.seekable():
+            std.seek(0)
+            self._result[name] = std.read()
         std.close()
 
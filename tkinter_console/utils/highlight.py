@@ -1,8 +1,12 @@
 # -*- coding:utf-8 -*-
 import copy
+import re
 import tkinter as tk
 from typing import Optional
 
+# my modules and packages
+from tkinter_console.utils.lexer import PythonLexer
+
 __all__ = ['PATTERN', 'Highlight']
 
 PATTERN = 'pattern'
@@ -10,6 +14,8 @@ PATTERN = 'pattern'
 
 class Highlight:
 
+    KINDS = ('normal', 'regex', 'lexer')
+
     def __init__(self):
         # exclude keys is used in '__register_tags_by_configure' method
         self.__exclude_keys = (PATTERN,)
@@ -20,6 +26,30 @@ class Highlight:
 
         self._normal_tags = {}
         self._regex_tags  = {}
+        self._lexer_tags  = {}
+
+        # single-pass lexer, tokens are mapped to the lexer tags
+        self._lexer: Optional[PythonLexer] = None
+
+        # per-line cache of the lexer highlighting
+        #   [(line, state at the head, tokens, state at the end), ...] from the start index
+        #   only edited lines are tokenized again, and nothing is done if the text is not modified
+        self.__lexed_start: Optional[str] = None
+        self.__lexed_lines: list = []
+
+        # lines of the last normal and regex highlighting
+        #   {kind: (start index, [line, ...])}, only edited lines are matched again
+        self.__matched_lines: dict = {}
+
+        # kinds of highlighting which should check the text
+        #   the text is compared with the caches on every call,
+        #   unless the modifications are notified by 'mark_dirty'
+        self.__dirty  = set(self.KINDS)
+        self.__hinted = False
+
+        # compiled python patterns, [(tag, pattern), ...]
+        #   it's cleared when a tag is registered
+        self.__compiled: Optional[list] = None
 
         self.wait = False
 
@@ -40,8 +70,22 @@ class Highlight:
         self.start_index = start_index
         self.end_index   = end_index
 
+        self.__matched_lines = {}
+        self.__lexed_lines   = []
+        self.__dirty.update(self.KINDS)
+
         return self
 
+    def mark_dirty(self) -> None:
+        """ let the highlighter know the text is modified, it's an optional hint
+
+        Without it, the text is got and compared with the caches on every highlighting.
+        Once it's called (e.g. by '<<Modified>>' of the text),
+        highlighting does nothing until the next call, without getting the text.
+        """
+        self.__hinted = True
+        self.__dirty.update(self.KINDS)
+
     def __register_tags_by_configure(self, tags: dict):
         """ configure tags """
         for tag, kwargs in copy.deepcopy(tags).items():
@@ -51,7 +95,15 @@ class Highlight:
             self._master.tag_configure(tag, **kwargs)
 
     def __set_and_register_tag(self, self_tags: dict, tag, **kwargs):
-        self_tags[tag] = {str(k): str(v).lower() for k, v in kwargs.items()}
+        # the pattern is case-sensitive
+        self_tags[tag] = {str(k): str(v) if str(k) == PATTERN else str(v).lower()
+                          for k, v in kwargs.items()}
+        self.__compiled = None
+
+        # the whole text is highlighted again with the new tags
+        self.__matched_lines = {}
+        self.__lexed_lines   = []
+        self.__dirty.update(self.KINDS)
         self.__register_tags_by_configure(self_tags)
 
     def __set_and_register_tags(self, self_tags: dict, tags: dict):
@@ -66,6 +118,10 @@ class Highlight:
         """ register regex tag """
         self.__set_and_register_tag(self._regex_tags, tag, **kwargs)
 
+    def register_lexer_tag(self, tag, **kwargs) -> None:
+        """ register lexer tag, e.g. 'keyword', 'string' or a tag of 'word_tags' of the lexer """
+        self.__set_and_register_tag(self._lexer_tags, tag, **kwargs)
+
     def register_normal_tags(self, tags: dict) -> None:
         """ register normal tags """
         self.__set_and_register_tags(self._normal_tags, tags)
@@ -74,6 +130,88 @@ class Highlight:
         """ register regex tags """
         self.__set_and_register_tags(self._regex_tags, tags)
 
+    def register_lexer_tags(self, tags: dict) -> None:
+        """ register lexer tags """
+        self.__set_and_register_tags(self._lexer_tags, tags)
+
+    @property
+    def lexer(self) -> PythonLexer | None:
+        """ PythonLexer: lexer instance """
+        return self._lexer
+
+    def attach_lexer(self, lexer: PythonLexer):
+        """ attach lexer instance
+
+        Returns:
+            Highlight: instance
+        """
+        self._lexer = lexer
+        self.__lexed_lines = []
+        self.__dirty.add('lexer')
+        return self
+
+    @property
+    def tags(self) -> list:
+        """ list: registered tags, normal tags at first """
+        return list(self._normal_tags) + list(self._regex_tags) + list(self._lexer_tags)
+
+    def compiled_patterns(self) -> list:
+        """ return python patterns of the tags, they are compiled once and cached
+
+        Normal tags are matched as whole words, like '\\m' and '\\M' of Tcl.
+
+        Returns:
+            list: [(tag, compiled pattern), ...]
+        """
+        if self.__compiled is None:
+            self.__compiled = ([(tag, re.compile(r'\b{}\b'.format(re.escape(tag))))
+                                for tag in self._normal_tags]
+                               + [(tag, re.compile(kwargs[PATTERN.lower()]))
+                                  for tag, kwargs in self._regex_tags.items()])
+        return self.__compiled
+
+    def find_spans(self, text: str) -> list:
+        """ find matches of the tags in the text
+
+        Returns:
+            list: [(start, end, tag), ...] sorted by the start
+        """
+        if self.wait:
+            return []
+
+        spans = [(m.start(), m.end(), tag)
+                 for tag, pattern in self.compiled_patterns()
+                 for m in pattern.finditer(text)
+                 if m.end() > m.start()]
+        spans.sort()
+        return spans
+
+    def split(self, text: str) -> list:
+        """ split the text into segments by the tags, e.g. for 'tk.Text.insert'
+
+        Overlapped matches get all tags of them.
+
+        Returns:
+            list: [(segment, tags), ...], 'tags' is a tuple, empty for unmatched segments
+        """
+        spans = self.find_spans(text)
+        if not spans:
+            return [(text, ())]
+
+        points = sorted({0, len(text)}.union(*((start, end) for start, end, _ in spans)))
+
+        segments = []
+        for start, end in zip(points, points[1:]):
+            tags = tuple(tag for s, e, tag in spans if s <= start and end <= e)
+
+            # merge segments of the same tags
+            if segments and segments[-1][1] == tags:
+                segments[-1] = (segments[-1][0] + text[start:end], tags)
+            else:
+                segments.append((text[start:end], tags))
+
+        return segments
+
     def delete_tags(self):
         """ delete tags """
         for tag, kwargs in self._normal_tags.items():
@@ -83,55 +221,139 @@ class Highlight:
         """ restore tags """
         self.__register_tags_by_configure(self._normal_tags)
         self.__register_tags_by_configure(self._regex_tags)
+        self.__register_tags_by_configure(self._lexer_tags)
 
 
-    def do_normal_highlighting(self) -> None:
-        """ normal highlighting """
+    @staticmethod
+    def __edited_lines(old: list, new: list) -> tuple:
+        """ return the numbers of the common head lines and the common tail lines """
+        n_old, n_new = len(old), len(new)
+        head = 0
+        while head < min(n_old, n_new) and old[head] == new[head]:
+            head += 1
+        tail = 0
+        while tail < min(n_old, n_new) - head and old[n_old - 1 - tail] == new[n_new - 1 - tail]:
+            tail += 1
+        return head, tail
 
-        if self.wait:
+    def __apply_patterns(self, kind: str, patterns: list) -> None:
+        """ highlight matches of the compiled patterns
+
+        The text is got once and compared with the lines of the last call,
+        only the edited lines are matched in python and re-tagged,
+        and the ranges of each tag are added by one 'tag_add' call.
+        Nothing is done if the text is not modified since the last call.
+
+        Args:
+            kind    : 'normal' or 'regex'
+            patterns: [(tag, compiled pattern), ...]
+        """
+        if self.wait or not patterns:
             return
 
-        for key, kwargs in self._normal_tags.items():
-            # remove tag at first
-            self._master.tag_remove(key, self.start_index, self.end_index)
+        start = self._master.index(self.start_index)
+        last_start, old = self.__matched_lines.get(kind, (None, []))
+        if start != last_start:
+            # the region is moved, e.g. by a new prompt
+            old = []
+            self.__dirty.add(kind)
 
-            # set index
-            index = self.start_index
+        if self.__hinted and kind not in self.__dirty:
+            return
+        self.__dirty.discard(kind)
 
-            while True:
-                pattern = r'\m{}\M'.format(key)
+        lines = self._master.get(start, self.end_index).split('\n')
+        self.__matched_lines[kind] = (start, lines)
 
-                # search
-                index = self._master.search(pattern
-                                            , index, regexp=True, stopindex=self.end_index)
+        head, tail = self.__edited_lines(old, lines)
+        end        = len(lines) - tail
+        if head >= end:
+            # not modified, or only lines are deleted (their tags are deleted with them)
+            return
+
+        # matches are searched in the edited lines
+        row, col = map(int, start.split('.'))
+        first    = '{}.{}'.format(row + head, col if head == 0 else 0)
+        last     = '{}.end'.format(row + end - 1)
+        text     = '\n'.join(lines[head:end])
 
-                if not index:
-                    break
+        for tag, pattern in patterns:
+            indexes = []
+            for m in pattern.finditer(text):
+                if m.end() > m.start():
+                    indexes.extend(('{}+{}c'.format(first, m.start()), '{}+{}c'.format(first, m.end())))
 
-                last_index = '%s+%sc' % (index, len(key))
-                # add tag
-                self._master.tag_add(key, index, last_index)
-                # set last index
-                index = last_index
+            # remove tag at first
+            self._master.tag_remove(tag, first, last)
+            if indexes:
+                self._master.tag_add(tag, *indexes)
 
+    def do_normal_highlighting(self) -> None:
+        """ normal highlighting, keys are matched as whole words """
+        self.__apply_patterns('normal', self.compiled_patterns()[:len(self._normal_tags)])
 
     def do_regex_highlighting(self):
-        """ regex highlighting """
-        if self.wait:
-            return
+        """ regex highlighting, patterns are matched by python 're' """
+        self.__apply_patterns('regex', self.compiled_patterns()[len(self._normal_tags):])
 
-        count = tk.IntVar()
+    def do_lexer_highlighting(self) -> None:
+        """ lexer highlighting
 
-        for tag, kwargs in self._regex_tags.items():
-            pattern = kwargs[PATTERN.lower()]
+        The text is got once and compared with the per-line cache,
+        only edited lines (and following lines whose state is changed, e.g. by a multi-line string)
+        are tokenized again, and the ranges of each tag are added by one 'tag_add' call.
+        Nothing is done if the text is not modified since the last call.
+        """
+        if self.wait or self._lexer is None or not self._lexer_tags:
+            return
 
-            self._master.mark_set('start', self.start_index)
-            self._master.mark_set('end', self.end_index)
+        start = self._master.index(self.start_index)
+        if start != self.__lexed_start:
+            # the region is moved, e.g. by a new prompt
+            self.__lexed_start = start
+            self.__lexed_lines = []
+            self.__dirty.add('lexer')
 
-            while True:
-                index = self._master.search(pattern, 'start', 'end', count=count, regexp=True)
-                if index == '':
-                    break
-                self._master.tag_add(tag, index, '%s+%sc' % (index, count.get()))
-                self._master.mark_set('start', '%s+%sc' % (index, count.get()))
+        if self.__hinted and 'lexer' not in self.__dirty:
+            return
+        self.__dirty.discard('lexer')
+
+        lines = self._master.get(start, self.end_index).split('\n')
+        old   = self.__lexed_lines
+
+        # the edited lines are between the common head and the common tail
+        n_old, n_new = len(old), len(lines)
+        head, tail   = self.__edited_lines([entry[0] for entry in old], lines)
+
+        # tokenize the edited lines, and following lines until the state is same as the cache
+        state   = old[head - 1][3] if head else None
+        entries = []
+        i       = head
+        while i < n_new:
+            if i >= n_new - tail and old[i - n_new + n_old][1] == state:
+                break
+            tokens, end_state = self._lexer.tokens_line(lines[i], state)
+            entries.append((lines[i], state, tokens, end_state))
+            state = end_state
+            i += 1
+
+        self.__lexed_lines = old[:head] + entries + old[n_old - (n_new - i):]
+        if not entries:
+            return
 
+        # re-tag the lines
+        row, col = map(int, start.split('.'))
+        ranges   = {tag: [] for tag in self._lexer_tags}
+        for k, (_, _, tokens, _) in enumerate(entries, start=head):
+            offset = col if k == 0 else 0
+            for s, e, tag in tokens:
+                if tag in ranges:
+                    ranges[tag].extend(('{}.{}'.format(row + k, s + offset)
+                                        , '{}.{}'.format(row + k, e + offset)))
+
+        first = '{}.{}'.format(row + head, col if head == 0 else 0)
+        last  = '{}.end'.format(row + i - 1)
+        for tag, indexes in ranges.items():
+            self._master.tag_remove(tag, first, last)
+            if indexes:
+                self._master.tag_add(tag, *indexes)
@@ -0,0 +1,128 @@
+# -*- coding:utf-8 -*-
+import builtins
+import keyword
+import re
+
+__all__ = ['PythonLexer', 'KEYWORD', 'BUILTIN', 'STRING', 'COMMENT', 'DEFINITION']
+
+# token class tags
+KEYWORD    = 'keyword'
+BUILTIN    = 'builtin'
+STRING     = 'string'
+COMMENT    = 'comment'
+DEFINITION = 'definition'
+
+
+class PythonLexer:
+    """ Single-pass lexer of python source for highlighting
+
+    The text is scanned once by one precompiled alternation regex,
+    and tokens are mapped to a handful of token class tags,
+    so the cost is O(length of the text), not O(keywords * length of the text).
+
+    Names in 'word_tags' are mapped to their own tags instead of the class tags,
+    e.g. {'def': 'def'} to highlight 'def' differently from other keywords.
+
+    Lines can be tokenized one by one with 'tokens_line',
+    the state (an open triple-quoted string) is carried to the next line.
+    """
+
+    PATTERN = re.compile(r"""
+        (?P<comment>\#[^\n]*)
+        | (?P<string>(?<!\w)[rRbBuUfF]{0,2}
+            (?: '''[\s\S]*?(?:'''|\Z)
+              | \"\"\"[\s\S]*?(?:\"\"\"|\Z)
+              | '(?:\\.|[^'\\\n])*(?:'|$)
+              | "(?:\\.|[^"\\\n])*(?:"|$)))
+        | (?P<name>[^\W\d]\w*)
+    """, re.VERBOSE | re.MULTILINE)
+
+    # keywords followed by a definition name
+    DEFINERS = frozenset(('def', 'class'))
+
+    # prefixes of strings
+    PREFIXES = 'rRbBuUfF'
+
+    def __init__(self, word_tags: dict = None):
+        """ initializer
+
+        Args:
+            word_tags: {name: tag}, names mapped to their own tags
+        """
+        self.word_tags = dict(word_tags or {})
+        self.keywords  = frozenset(keyword.kwlist)
+        self.builtins  = frozenset(dir(builtins)) - self.keywords
+
+    def tokens(self, text: str, pos=0) -> list:
+        """ tokenize the text
+
+        Args:
+            text: text
+            pos : position where the tokenizing starts
+
+        Returns:
+            list: [(start, end, tag), ...] in order of the text
+        """
+        word_tags = self.word_tags
+        keywords  = self.keywords
+        names     = self.builtins
+        result    = []
+        definer   = False       # the previous name is 'def' or 'class'
+
+        for match in self.PATTERN.finditer(text, pos):
+            kind = match.lastgroup
+            if kind != 'name':
+                result.append((match.start(), match.end(), kind))
+                definer = False
+                continue
+
+            name = match.group()
+            if definer:
+                tag = DEFINITION
+            elif name in word_tags:
+                tag = word_tags[name]
+            elif name in keywords:
+                tag = KEYWORD
+            elif name in names:
+                tag = BUILTIN
+            else:
+                tag = None
+
+            definer = name in self.DEFINERS
+            if tag is not None:
+                result.append((match.start(), match.end(), tag))
+
+        return result
+
+    def tokens_line(self, line: str, state: str | None = None) -> tuple:
+        """ tokenize a line
+
+        Args:
+            line : line without the newline
+            state: delimiter of the triple-quoted string open at the head of the line, or None
+
+        Returns:
+            tuple: ([(start, end, tag), ...], state at the end of the line)
+        """
+        result = []
+        pos    = 0
+
+        # the rest of the triple-quoted string
+        if state:
+            i = line.find(state)
+            if i < 0:
+                return ([(0, len(line), STRING)] if line else []), state
+            pos = i + len(state)
+            result.append((0, pos, STRING))
+
+        result.extend(self.tokens(line, pos))
+
+        # the last string may be an open triple-quoted string
+        if result and result[-1][2] == STRING and result[-1][0] >= pos:
+            start, end, _ = result[-1]
+            token = line[start:end].lstrip(self.PREFIXES)
+            delimiter = token[:3]
+            if delimiter in ("'''", '"""') and not (len(token) >= 6 and token.endswith(delimiter)):
+                return result, delimiter
+
+        return result, None
@@ -0,0 +1,108 @@
+# -*- coding:utf-8 -*-
+import io
+import threading
+from collections import deque
+
+__all__ = ['StreamBuffer']
+
+
+class _StreamWriter(io.TextIOBase):
+    """ file-like object, which writes into the buffer with the name """
+
+    def __init__(self, buffer, name: str, encoding='utf-8'):
+        super(_StreamWriter, self).__init__()
+        self.__buffer   = buffer
+        self.__name     = name
+        self.__encoding = encoding
+
+    @property
+    def encoding(self):
+        return self.__encoding
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return False
+
+    def write(self, s: str) -> int:
+        if self.closed:
+            raise ValueError("[!!] I/O operation on closed stream")
+        if s:
+            self.__buffer.write(self.__name, s)
+        return len(s)
+
+
+class StreamBuffer:
+    """ Thread-safe buffer of texts written into std streams
+
+    Texts of all streams are kept in written order, with the stream name,
+    so the interleaving of stdout, stderr and tracebacks is preserved.
+    The writing thread puts texts by 'write' or by writers from 'writer',
+    and the Tk thread drains them by 'pop' in batches.
+    """
+
+    def __init__(self):
+        self.__chunks = deque()     # [(name, text), ...]
+        self.__lock   = threading.Lock()
+        self.__closed = True
+
+    def __len__(self):
+        return len(self.__chunks)
+
+    @property
+    def closed(self) -> bool:
+        """ bool: the writing is finished """
+        return self.__closed
+
+    def writer(self, name: str, encoding='utf-8') -> io.TextIOBase:
+        """ return a file-like object, e.g. for 'sys.stdout' """
+        return _StreamWriter(self, name, encoding)
+
+    def write(self, name: str, text: str) -> None:
+        """ put a text of the stream, it's discarded after the writing is finished """
+        with self.__lock:
+            if not self.__closed:
+                self.__chunks.append((name, text))
+
+    def pop(self, max_chars=1 << 16) -> list:
+        """ pop texts in written order
+
+        Consecutive texts of the same stream are merged.
+
+        Args:
+            max_chars: max characters popped at once (at least one text is popped)
+
+        Returns:
+            list: [(name, text), ...]
+        """
+        result = []
+        size   = 0
+        with self.__lock:
+            chunks = self.__chunks
+            while chunks and (size < max_chars or not result):
+                name, text = chunks.popleft()
+                size += len(text)
+                if result and result[-1][0] == name:
+                    result[-1] = (name, result[-1][1] + text)
+                else:
+                    result.append((name, text))
+
+        return result
+
+    def open(self) -> None:
+        """ start writing, buffered texts are discarded """
+        with self.__lock:
+            self.__chunks.clear()
+            self.__closed = False
+
+    def close(self) -> None:
+        """ finish writing, buffered texts are still popped """
+        with self.__lock:
+            self.__closed = True
+
+    def clear(self) -> None:
+        """ discard buffered texts, and finish writing """
+        with self.__lock:
+            self.__chunks.clear()
+            self.__closed = True